@@ -0,0 +1,122 @@
+"""
+Shared harness for the headless benchmark suites.
+
+Results are written as JSON; a stored baseline with the same layout can be
+compared against to flag regressions.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Keep sessions, journals and metrics of benchmark runs out of the user's data dir
+os.environ.setdefault("PARVIZ_IDE_HOME", tempfile.mkdtemp(prefix="parviz_bench_"))
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TOLERANCE = 0.25
+
+
+def measure(func, repeat=5, setup=None):
+    """Runs func `repeat` times (calling setup before each run, untimed); returns timing stats in seconds"""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "runs": len(samples),
+    }
+
+
+class BenchmarkSuite:
+    def __init__(self, name):
+        self.name = name
+        self.results = {}
+
+    def add(self, name, stats, **extra):
+        self.results[name] = dict(stats, **extra)
+        line = f"  {name:<44} median {stats['median'] * 1000:10.2f} ms   min {stats['min'] * 1000:10.2f} ms"
+        for key, value in extra.items():
+            line += f"   {key} {value:,.0f}" if isinstance(value, (int, float)) else f"   {key} {value}"
+        print(line)
+
+    def to_dict(self):
+        return {
+            "suite": self.name,
+            "created": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": self.results,
+        }
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def compare(self, baseline_path, tolerance=DEFAULT_TOLERANCE):
+        """Returns a list of (name, baseline_median, current_median) that got slower than the tolerance allows"""
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get("results", {})
+
+        regressions = []
+        for name, result in self.results.items():
+            if name not in baseline:
+                continue
+            previous = baseline[name]["median"]
+            if previous > 0 and result["median"] > previous * (1 + tolerance):
+                regressions.append((name, previous, result["median"]))
+        return regressions
+
+
+def parse_arguments(description, baseline_name):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--output', '-o', default=os.path.join(BENCHMARKS_DIR, "results", f"{baseline_name}.json"),
+                        help='Where to write the JSON results')
+    parser.add_argument('--baseline', default=os.path.join(BENCHMARKS_DIR, "baselines", f"{baseline_name}.json"),
+                        help='Baseline to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed slowdown of the median before a result counts as a regression (0.25 = 25%%)')
+    parser.add_argument('--quick', action='store_true', help='Smaller inputs and fewer repetitions')
+    return parser
+
+
+def finish(suite, args):
+    """Writes results, compares against the baseline; returns the process exit code"""
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    suite.write(args.output)
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        suite.write(args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.isfile(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    regressions = suite.compare(args.baseline, args.tolerance)
+    if not regressions:
+        print(f"No regressions against {args.baseline}")
+        return 0
+
+    print(f"{len(regressions)} regression(s) against {args.baseline}:")
+    for name, previous, current in regressions:
+        print(f"  {name}: {previous * 1000:.2f} ms -> {current * 1000:.2f} ms ({current / previous - 1:+.0%})")
+    return 1
@@ -0,0 +1,232 @@
+"""
+Headless benchmarks for the editor hot paths.
+
+    python benchmarks/editor_benchmarks.py [--quick] [--save-baseline]
+
+Runs under Qt's offscreen platform, writes JSON results to
+benchmarks/results/editor.json and compares them with
+benchmarks/baselines/editor.json. Exits with 1 when a median got slower
+than the tolerance allows.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from common import BenchmarkSuite, measure, parse_arguments, finish
+
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtGui import QTextDocument
+from PyQt6.QtWidgets import QApplication
+
+SAMPLE_SOURCE = '''import os
+from collections import defaultdict
+
+
+class Inventory:
+    """Keeps track of items and their counts"""
+
+    def __init__(self, name, capacity=100):
+        self.name = name
+        self.capacity = capacity
+        self.items = defaultdict(int)  # item -> count
+
+    def add(self, item, count=1):
+        if len(self.items) >= self.capacity and item not in self.items:
+            raise ValueError(f"Inventory '{self.name}' is full")
+        self.items[item] += count
+        return self.items[item]
+
+    def remove(self, item, count=1):
+        for _ in range(count):
+            if self.items.get(item, 0) <= 0:
+                return False
+            self.items[item] -= 1
+        return True
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line and not line.startswith("#")]
+
+'''
+
+
+def python_source(lines):
+    sample = SAMPLE_SOURCE.splitlines(keepends=True)
+    repeats = lines // len(sample) + 1
+    return "".join((sample * repeats)[:lines])
+
+
+def python_source_of_size(size_bytes):
+    repeats = size_bytes // len(SAMPLE_SOURCE) + 1
+    return (SAMPLE_SOURCE * repeats)[:size_bytes]
+
+
+def large_response(code_blocks, block_lines):
+    parts = ["Here is an improved version of your code, with explanations for every change.\n\n"]
+    for index in range(code_blocks):
+        parts.append(f"Step {index + 1}: the loop below avoids repeated lookups and keeps the API unchanged.\n\n")
+        parts.append("```python\n" + python_source(block_lines) + "```\n\n")
+    parts.append("These changes keep the behaviour identical while reducing work in the hot path.\n")
+    return "".join(parts)
+
+
+def bench_highlighter(suite, quick):
+    from src.ui.syntax_highlighter import PythonHighlighter
+
+    for lines in ((1000, 10000) if quick else (1000, 10000, 50000)):
+        document = QTextDocument()
+        document.setPlainText(python_source(lines))
+        highlighter = PythonHighlighter(document)
+        stats = measure(highlighter.rehighlight, repeat=3 if quick else 5)
+        suite.add(f"highlightBlock/{lines}_lines", stats, lines_per_second=lines / stats["median"])
+
+
+def bench_update_line_numbers(suite, ide, quick):
+    for lines in ((1000, 10000) if quick else (1000, 10000, 100000)):
+        ide.editor.blockSignals(True)
+        ide.editor.setPlainText(python_source(lines))
+        ide.editor.blockSignals(False)
+        stats = measure(ide.update_line_numbers, repeat=3 if quick else 5)
+        suite.add(f"update_line_numbers/{lines}_lines", stats)
+    ide.editor.clear()
+
+
+def bench_open_file(suite, ide, quick, work_dir):
+    for megabytes in ((1, 10) if quick else (1, 10, 100)):
+        path = os.path.join(work_dir, f"open_{megabytes}mb.py")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(python_source_of_size(megabytes * 1024 * 1024))
+
+        def open_once():
+            ide.open_file(path)
+            QApplication.processEvents()
+
+        def close_opened():
+            state = ide.documents.for_path(path)
+            if state is not None:
+                ide.close_tab(ide.editor_tabs.indexOf(state.tab))
+
+        stats = measure(open_once, repeat=1 if megabytes >= 100 else 3, setup=close_opened)
+        close_opened()
+        suite.add(f"open_file/{megabytes}mb", stats, megabytes_per_second=megabytes / stats["median"])
+
+
+def bench_replace_all(suite, ide, quick):
+    lines = 10000 if quick else 50000
+    source = python_source(lines)
+    expected = source.count("self.items")
+
+    def reset():
+        ide.editor.setPlainText(source)
+
+    stats = measure(lambda: ide.replace_all("self.items", "self.entries"), repeat=3, setup=reset)
+    suite.add(f"replace_all/{lines}_lines", stats, replacements=expected)
+    ide.editor.clear()
+
+
+def bench_handle_stdout(suite, ide, quick):
+    lines = 20000 if quick else 200000
+    sentinel = "__benchmark_done__"
+    ide.create_interactive_terminal()
+    if not ide.process.waitForStarted(5000):
+        print("  handle_stdout: could not start the terminal process, skipped")
+        return
+
+    def flood():
+        ide.terminal_output.clear()
+        script = f"import sys\nfor i in range({lines}): sys.stdout.write('output line %d of the flood\\n' % i)\nprint('{sentinel}')"
+        script_path = os.path.join(tempfile.gettempdir(), "parviz_bench_flood.py")
+        with open(script_path, 'w', encoding='utf-8') as f:
+            f.write(script)
+        ide.process.write(f"\"{sys.executable}\" \"{script_path}\"\n".encode())
+
+        loop = QEventLoop()
+        poll = QTimer()
+        poll.timeout.connect(lambda: sentinel in ide.terminal_output.document().lastBlock().text() and loop.quit())
+        poll.start(20)
+        QTimer.singleShot(300000, loop.quit)
+        loop.exec()
+        poll.stop()
+
+    stats = measure(flood, repeat=1 if not quick else 2)
+    suite.add(f"handle_stdout/{lines}_lines", stats, lines_per_second=lines / stats["median"])
+    ide.process.terminate()
+    ide.process.waitForFinished(5000)
+
+
+def bench_process_response(suite, quick):
+    from src.services.llm_service import AIModelWorker
+
+    worker = AIModelWorker("benchmark", "")
+    for blocks, block_lines in ((5, 200), (20, 2000)) if not quick else ((5, 200),):
+        response = large_response(blocks, block_lines)
+        stats = measure(lambda: worker.process_response(response), repeat=3 if quick else 5)
+        suite.add(f"process_response/{len(response) // 1024}kb", stats)
+
+
+def synthetic_paths(count):
+    words = ["src", "lib", "core", "utils", "tests", "models", "views", "api", "server", "client", "parser",
+             "config", "widgets", "ui", "data", "http", "cache", "index", "tree", "graph", "runner", "worker"]
+    extensions = [".py", ".js", ".md", ".json"]
+    generator = random.Random(1)
+    paths = []
+    for index in range(count):
+        folder = "/".join(generator.choice(words) for _ in range(generator.randint(1, 6)))
+        name = f"{generator.choice(words)}_{generator.choice(words)}{index % 97}{generator.choice(extensions)}"
+        paths.append(f"{folder}/{name}")
+    return paths
+
+
+def bench_path_search(suite, quick):
+    from src.services.path_index import PathSnapshot
+
+    count = 50000 if quick else 200000
+    snapshot = PathSnapshot(synthetic_paths(count))
+    for word in ("parser", "idewin", "ui/tree", "xqz"):
+        def type_word():
+            for length in range(1, len(word) + 1):
+                snapshot.search(word[:length])
+
+        stats = measure(type_word, repeat=3 if quick else 5)
+        suite.add(f"path_search/{count}_files/{word}", stats,
+                  us_per_keystroke=stats["median"] * 1e6 / len(word))
+
+
+def main():
+    args = parse_arguments("Headless editor benchmarks", "editor").parse_args()
+    app = QApplication(sys.argv)
+
+    from src.ui.ide_window import SimpleIDE
+
+    suite = BenchmarkSuite("editor")
+    start = time.perf_counter()
+    ide = SimpleIDE()
+    elapsed = time.perf_counter() - start
+    suite.add("startup/SimpleIDE", {"min": elapsed, "median": elapsed, "mean": elapsed, "runs": 1})
+
+    # Let the deferred panels and the provider preload finish so they don't skew the timings
+    ide.ensure_startup_complete()
+    QApplication.processEvents()
+    for preloader in ide.provider_preloaders.values():
+        preloader.wait()
+
+    with tempfile.TemporaryDirectory(prefix="parviz_bench_files_") as work_dir:
+        bench_highlighter(suite, args.quick)
+        bench_update_line_numbers(suite, ide, args.quick)
+        bench_open_file(suite, ide, args.quick, work_dir)
+        bench_replace_all(suite, ide, args.quick)
+        bench_handle_stdout(suite, ide, args.quick)
+        bench_process_response(suite, args.quick)
+        bench_path_search(suite, args.quick)
+
+    ide.session_timer.stop()
+    ide.hide()
+    return finish(suite, args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
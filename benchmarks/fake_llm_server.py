@@ -0,0 +1,313 @@
+"""
+Local stand-in for the LLM HTTP APIs used by the IDE.
+
+Speaks the Groq/OpenAI chat-completions protocol (/openai/v1/chat/completions
+and /v1/chat/completions, streaming or not) and the Ollama API (/api/chat,
+/api/generate, /api/ps, /api/tags). Token rate, time to first token, errors
+and mid-stream disconnects are configurable, so the assistant path can be
+profiled without a network:
+
+    python benchmarks/fake_llm_server.py --port 8765 --tokens-per-second 150 --ttft 0.3
+
+then set the Groq base URL to http://127.0.0.1:8765 (any API key of 10+
+characters) or the Ollama URL to the same address in AI Model Settings.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_RESPONSE = '''Here is a cleaner version of your function. It avoids the repeated lookups and keeps the same behaviour.
+
+```python
+def count_words(lines):
+    counts = {}
+    for line in lines:
+        for word in line.split():
+            counts[word] = counts.get(word, 0) + 1
+    return counts
+```
+
+The dictionary is only touched once per word, which makes the loop noticeably faster on large inputs.
+'''
+
+TOKEN_PATTERN = re.compile(r'\s*\S+|\s+')
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text)
+
+
+class FakeLLMConfig:
+    def __init__(self, tokens_per_second=100.0, ttft=0.2, error_rate=0.0, error_status=500,
+                 disconnect_rate=0.0, response=DEFAULT_RESPONSE, seed=None):
+        self.tokens_per_second = tokens_per_second
+        self.ttft = ttft
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.disconnect_rate = disconnect_rate
+        self.response = response
+        self.random = random.Random(seed)
+
+    def generation_time(self, text=None):
+        """Server-side time for one streamed response, excluding transport"""
+        tokens = len(tokenize(self.response if text is None else text))
+        rate = tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        return self.ttft + rate
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    server_version = "FakeLLM/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length).decode('utf-8'))
+        except ValueError:
+            return {}
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_stream(self, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+
+    def _write(self, data):
+        self.wfile.write(data)
+        self.wfile.flush()
+
+    def _inject_error(self, record):
+        config = self.server.config
+        if config.error_rate and config.random.random() < config.error_rate:
+            record['status'] = config.error_status
+            self._send_json(config.error_status, {
+                "error": {"message": "Injected failure from the fake LLM server", "type": "server_error"}
+            })
+            self.server.record(record)
+            return True
+        return False
+
+    def _tokens(self):
+        """Yields the response tokens at the configured rate; None marks an injected disconnect"""
+        config = self.server.config
+        tokens = tokenize(config.response)
+        disconnect_at = None
+        if config.disconnect_rate and config.random.random() < config.disconnect_rate:
+            disconnect_at = len(tokens) // 2
+        delay = 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+
+        time.sleep(config.ttft)
+        for index, token in enumerate(tokens):
+            if index == disconnect_at:
+                yield None
+                return
+            if index and delay:
+                time.sleep(delay)
+            yield token
+
+    def do_GET(self):
+        if self.path == '/api/ps':
+            self._send_json(200, {"models": [{"name": name, "model": name} for name in sorted(self.server.loaded_models)]})
+        elif self.path == '/api/tags':
+            self._send_json(200, {"models": [{"name": name, "model": name} for name in sorted(self.server.loaded_models)]})
+        elif self.path == '/api/version':
+            self._send_json(200, {"version": "0.0.0-fake"})
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        request = self._read_json()
+        if self.path in ('/openai/v1/chat/completions', '/v1/chat/completions'):
+            self._chat_completions(request)
+        elif self.path == '/api/chat':
+            self._ollama_chat(request)
+        elif self.path == '/api/generate':
+            self.server.loaded_models.add(request.get("model", ""))
+            self._send_json(200, {"model": request.get("model", ""), "response": "", "done": True})
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def _prompt_tokens(self, request):
+        return sum(len(str(message.get("content", "")).split()) for message in request.get("messages", []))
+
+    def _chat_completions(self, request):
+        model = request.get("model", "fake-model")
+        record = {'protocol': 'openai', 'model': model, 'received': time.perf_counter(), 'status': 200}
+        if self._inject_error(record):
+            return
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        prompt_tokens = self._prompt_tokens(request)
+
+        if not request.get("stream"):
+            text = "".join(token for token in self._tokens() if token is not None)
+            completion_tokens = len(tokenize(text))
+            self._send_json(200, {
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens},
+            })
+            self.server.record(dict(record, tokens=completion_tokens))
+            return
+
+        def chunk(delta, finish_reason=None, **extra):
+            payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                       "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+            payload.update(extra)
+            return f"data: {json.dumps(payload)}\n\n".encode('utf-8')
+
+        self._start_stream('text/event-stream')
+        completion_tokens = 0
+        for token in self._tokens():
+            if token is None:
+                self.server.record(dict(record, tokens=completion_tokens, status='disconnected'))
+                return
+            if completion_tokens == 0:
+                record['first_token'] = time.perf_counter()
+                self._write(chunk({"role": "assistant", "content": token}))
+            else:
+                self._write(chunk({"content": token}))
+            completion_tokens += 1
+
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+        self._write(chunk({}, "stop", x_groq={"id": completion_id, "usage": usage}))
+        self._write(b"data: [DONE]\n\n")
+        self.server.record(dict(record, tokens=completion_tokens))
+
+    def _ollama_chat(self, request):
+        model = request.get("model", "fake-model")
+        self.server.loaded_models.add(model)
+        record = {'protocol': 'ollama', 'model': model, 'received': time.perf_counter(), 'status': 200}
+        if self._inject_error(record):
+            return
+
+        started = time.perf_counter()
+        prompt_tokens = self._prompt_tokens(request)
+
+        def message(content, done, **extra):
+            payload = {"model": model, "created_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                       "message": {"role": "assistant", "content": content}, "done": done}
+            payload.update(extra)
+            return payload
+
+        def final_fields(completion_tokens):
+            elapsed = int((time.perf_counter() - started) * 1e9)
+            return {"done_reason": "stop", "total_duration": elapsed, "load_duration": 0,
+                    "prompt_eval_count": prompt_tokens, "eval_count": completion_tokens, "eval_duration": elapsed}
+
+        if request.get("stream") is False:
+            text = "".join(token for token in self._tokens() if token is not None)
+            completion_tokens = len(tokenize(text))
+            self._send_json(200, message(text, True, **final_fields(completion_tokens)))
+            self.server.record(dict(record, tokens=completion_tokens))
+            return
+
+        self._start_stream('application/x-ndjson')
+        completion_tokens = 0
+        for token in self._tokens():
+            if token is None:
+                self.server.record(dict(record, tokens=completion_tokens, status='disconnected'))
+                return
+            if completion_tokens == 0:
+                record['first_token'] = time.perf_counter()
+            self._write((json.dumps(message(token, False)) + "\n").encode('utf-8'))
+            completion_tokens += 1
+
+        self._write((json.dumps(message("", True, **final_fields(completion_tokens))) + "\n").encode('utf-8'))
+        self.server.record(dict(record, tokens=completion_tokens))
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, config=None, verbose=False):
+        super().__init__((host, port), FakeLLMHandler)
+        self.config = config or FakeLLMConfig()
+        self.verbose = verbose
+        self.loaded_models = set()
+        self.requests = []
+        self.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record(self, entry):
+        entry['finished'] = time.perf_counter()
+        with self.lock:
+            self.requests.append(entry)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake Groq/OpenAI and Ollama server for offline testing')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--tokens-per-second', type=float, default=100.0, help='0 streams as fast as possible')
+    parser.add_argument('--ttft', type=float, default=0.2, help='Seconds before the first token')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with an HTTP error')
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--disconnect-rate', type=float, default=0.0,
+                        help='Fraction of streams cut off halfway through')
+    parser.add_argument('--response-file', help='Text to answer every request with')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    response = DEFAULT_RESPONSE
+    if args.response_file:
+        with open(args.response_file, 'r', encoding='utf-8') as f:
+            response = f.read()
+
+    config = FakeLLMConfig(args.tokens_per_second, args.ttft, args.error_rate, args.error_status,
+                           args.disconnect_rate, response)
+    server = FakeLLMServer(args.host, args.port, config, verbose=args.verbose)
+    print(f"Fake LLM server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+End-to-end assistant benchmarks against the local fake LLM server.
+
+    python benchmarks/llm_benchmarks.py [--quick] [--save-baseline]
+
+Drives AIModelWorker through the real LangChain Groq and Ollama clients
+against benchmarks/fake_llm_server.py and measures the time until the
+result reaches the GUI thread. "overhead" is what remains after removing
+the server's own generation time (time to first token plus token rate):
+prompt building, client setup, stream parsing and signal delivery.
+"""
+
+import sys
+import time
+
+from common import BenchmarkSuite, measure, parse_arguments, finish
+from fake_llm_server import FakeLLMServer, FakeLLMConfig, DEFAULT_RESPONSE
+
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+
+FAKE_API_KEY = "fake-key-for-benchmarks"
+TIMEOUT_MS = 120000
+
+
+def model_settings(provider, server_url):
+    return {
+        "use_groq": provider == "groq",
+        "groq_model": "fake-groq-model",
+        "groq_api_key": FAKE_API_KEY,
+        "groq_base_url": server_url,
+        "use_local": provider == "ollama",
+        "local_model": "fake-ollama-model",
+        "keep_alive": "5m",
+        "ollama_base_url": server_url,
+        "hedge_requests": False,
+        "hedge_model": "",
+    }
+
+
+def large_code_context(lines):
+    return "".join(f"def function_{i}(value):\n    return value * {i}\n\n" for i in range(lines // 3))
+
+
+def run_worker(settings, query, code_context):
+    """Runs one AIModelWorker to completion; returns (kind of result, seconds to first block or None)"""
+    from src.services.llm_service import AIModelWorker
+
+    worker = AIModelWorker(query, code_context, settings)
+    loop = QEventLoop()
+    outcome = {'kind': None, 'first_block': None}
+    start = time.perf_counter()
+
+    def done(kind):
+        outcome['kind'] = outcome['kind'] or kind
+        loop.quit()
+
+    def block_ready(*args):
+        if outcome['first_block'] is None:
+            outcome['first_block'] = time.perf_counter() - start
+
+    worker.response_ready.connect(lambda *args: done('response'))
+    worker.code_suggestion.connect(lambda *args: done('code'))
+    worker.file_changes.connect(lambda *args: done('files'))
+    worker.block_ready.connect(block_ready)
+    QTimer.singleShot(TIMEOUT_MS, lambda: done('timeout'))
+
+    worker.start()
+    loop.exec()
+    worker.wait()
+    return outcome['kind'], outcome['first_block']
+
+
+def bench_provider(suite, provider, server, quick):
+    from src.services.provider_loader import load_provider, GROQ, OLLAMA
+
+    try:
+        load_provider(GROQ if provider == "groq" else OLLAMA)
+    except ImportError as e:
+        print(f"  {provider}: provider libraries not installed ({str(e)}), skipped")
+        return
+
+    settings = model_settings(provider, server.url)
+    generation = server.config.generation_time()
+    repeat = 3 if quick else 10
+
+    for label, code_lines in (("small_prompt", 30), ("large_prompt", 3000 if quick else 20000)):
+        code_context = large_code_context(code_lines)
+        first_blocks = []
+        kinds = set()
+
+        def request():
+            kind, first_block = run_worker(settings, "Make this faster", code_context)
+            kinds.add(kind)
+            if first_block is not None:
+                first_blocks.append(first_block)
+
+        run_worker(settings, "warm up", "")
+        stats = measure(request, repeat=repeat)
+        extra = {"overhead_ms": (stats["median"] - generation) * 1000, "result": "/".join(sorted(kinds))}
+        if first_blocks:
+            extra["first_block_ms"] = sorted(first_blocks)[len(first_blocks) // 2] * 1000
+        suite.add(f"{provider}/{label}", stats, **extra)
+
+
+def bench_errors(suite, server, quick):
+    """Time until an HTTP error reaches the GUI, including the client's own retries"""
+    settings = model_settings("groq", server.url)
+    previous_rate = server.config.error_rate
+    server.config.error_rate = 1.0
+    try:
+        stats = measure(lambda: run_worker(settings, "This request fails", ""), repeat=3 if quick else 5)
+        suite.add("groq/injected_error", stats)
+    finally:
+        server.config.error_rate = previous_rate
+
+
+def main():
+    parser = parse_arguments("End-to-end assistant benchmarks against a fake LLM server", "llm")
+    parser.add_argument('--tokens-per-second', type=float, default=0.0,
+                        help='Fake server token rate (0 = as fast as possible, isolating client overhead)')
+    parser.add_argument('--ttft', type=float, default=0.05, help='Fake server time to first token in seconds')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    suite = BenchmarkSuite("llm")
+    config = FakeLLMConfig(tokens_per_second=args.tokens_per_second, ttft=args.ttft, response=DEFAULT_RESPONSE * 4)
+
+    with FakeLLMServer(config=config) as server:
+        print(f"Fake LLM server on {server.url}")
+        bench_provider(suite, "groq", server, args.quick)
+        bench_provider(suite, "ollama", server, args.quick)
+        if any(name.startswith("groq/") for name in suite.results):
+            bench_errors(suite, server, args.quick)
+
+    return finish(suite, args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
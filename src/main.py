@@ -9,36 +9,19 @@ import traceback
 import argparse
 import logging
 from pathlib import Path
-from datetime import datetime
 
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
+from src.utils.startup_profile import startup_profiler
+from src.utils.logging_setup import setup_logging as start_logging
+
+log_listener = None
+
 def setup_logging(log_level="INFO"):
     """Set up logging configuration"""
-    logs_dir = os.path.join(project_root, "logs")
-    os.makedirs(logs_dir, exist_ok=True)
-    
-    log_file = os.path.join(logs_dir, f"parviz_ide_{datetime.now().strftime('%Y%m%d')}.log")
-    
-    log_levels = {
-        "DEBUG": logging.DEBUG,
-        "INFO": logging.INFO,
-        "WARNING": logging.WARNING,
-        "ERROR": logging.ERROR,
-        "CRITICAL": logging.CRITICAL
-    }
-    
-    level = log_levels.get(log_level.upper(), logging.INFO)
-    
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
-    )
+    global log_listener
+    log_listener = start_logging(log_level, os.path.join(project_root, "logs"))
     return logging.getLogger("ParvizIDE")
 
 def global_exception_handler(exc_type, exc_value, exc_traceback):
@@ -67,14 +50,18 @@ def parse_arguments():
     parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
                         default='INFO', help='Set logging level')
     parser.add_argument('--version', '-v', action='store_true', help='Show version information')
+    parser.add_argument('--no-session', action='store_true', help='Do not restore the previous session')
+    parser.add_argument('--profile-startup', action='store_true', help='Print a per-phase startup timing breakdown')
     return parser.parse_args()
 
 def main():
     """Main entry point for the application"""
     args = parse_arguments()
+    startup_profiler.enabled = args.profile_startup
     
     global logger
     logger = setup_logging(args.log_level)
+    startup_profiler.mark("arguments and logging")
     
     sys.excepthook = global_exception_handler
     
@@ -91,7 +78,9 @@ def main():
     
     try:
         from PyQt6.QtWidgets import QApplication
+        startup_profiler.mark("import PyQt6")
         from src.ui.ide_window import SimpleIDE
+        startup_profiler.mark("import ide_window")
         
         app = QApplication(sys.argv)
         app.setApplicationName("Parviz Mind IDE")
@@ -102,9 +91,18 @@ def main():
         except ImportError:
             app.setApplicationVersion("dev")
         
+        startup_profiler.mark("QApplication")
+        
         logger.info("Starting Parviz Mind IDE")
         ide = SimpleIDE()
         
+        if not args.no_session:
+            try:
+                if ide.restore_session():
+                    logger.info("Restored previous session")
+            except Exception as e:
+                logger.warning(f"Could not restore session: {str(e)}")
+        
         if args.file:
             file_path = os.path.abspath(args.file)
             if os.path.isfile(file_path):
@@ -113,12 +111,16 @@ def main():
             else:
                 logger.warning(f"File not found: {file_path}")
         
+        startup_profiler.mark("session and files")
         ide.show()
         return app.exec()
         
     except Exception as e:
         logger.critical(f"Fatal error: {str(e)}", exc_info=True)
         raise
+    finally:
+        if log_listener is not None:
+            log_listener.stop()
 
 if __name__ == '__main__':
     logger = None
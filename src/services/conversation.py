@@ -0,0 +1,112 @@
+"""
+Multi-turn conversation state for the AI assistant
+"""
+
+import difflib
+import threading
+
+from .prompts import (CONTEXT_FILES_HEADER, CONTEXT_FILE_LABEL, CONTEXT_FILE_TEMPLATE, MAIN_CODE_LABEL,
+                      MAIN_CODE_TEMPLATE, QUESTION_TEMPLATE, UNCHANGED_FILE_TEMPLATE, CHANGED_FILE_TEMPLATE)
+
+UNTITLED_KEY = "<untitled>"
+
+
+class Conversation:
+    """
+    Keeps the message history of a chat and the last version of every file
+    the model has seen, so follow-up turns can send unified diffs instead of
+    full file contents.
+
+    Prompts are built and turns recorded on the worker thread while the GUI
+    may reset the conversation, so the state is only touched under a lock,
+    and turns started before a reset are dropped.
+    """
+
+    def __init__(self, max_turns=20, max_diff_ratio=0.6):
+        self.max_turns = max_turns
+        self.max_diff_ratio = max_diff_ratio
+        self.turns = []
+        self.seen_files = {}
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self.turns = []
+            self.seen_files = {}
+            self.generation += 1
+
+    def is_empty(self):
+        with self._lock:
+            return not self.turns
+
+    def _render_file(self, key, label, full_text, content):
+        previous = self.seen_files.get(key)
+        if previous is None:
+            return full_text
+        if previous == content:
+            return UNCHANGED_FILE_TEMPLATE.format(label=label)
+
+        diff = "\n".join(difflib.unified_diff(
+            previous.splitlines(), content.splitlines(),
+            fromfile=f"a/{key}", tofile=f"b/{key}", lineterm=''
+        ))
+        if len(diff) > len(content) * self.max_diff_ratio:
+            return full_text
+        return CHANGED_FILE_TEMPLATE.format(label=label, diff=diff)
+
+    def build_prompt(self, query, code_context="", additional_files=None, code_path=None):
+        """
+        Returns (prompt, snapshot, generation); pass them to add_turn once the
+        model has answered. code_path names the editor's file, so the editor
+        is only diffed against an earlier version of the same file.
+        """
+        parts = []
+        snapshot = {}
+
+        with self._lock:
+            if additional_files:
+                parts.append(CONTEXT_FILES_HEADER)
+                for file_path in sorted(additional_files):
+                    content = additional_files[file_path]
+                    parts.append(self._render_file(
+                        file_path, CONTEXT_FILE_LABEL.format(path=file_path),
+                        CONTEXT_FILE_TEMPLATE.format(path=file_path, content=content), content
+                    ))
+                    snapshot[file_path] = content
+
+            if code_context:
+                key = code_path or UNTITLED_KEY
+                label = f"{MAIN_CODE_LABEL} ({code_path})" if code_path else MAIN_CODE_LABEL
+                parts.append(self._render_file(key, label, MAIN_CODE_TEMPLATE.format(code=code_context), code_context))
+                snapshot[key] = code_context
+
+            generation = self.generation
+
+        parts.append(QUESTION_TEMPLATE.format(query=query))
+
+        return "".join(parts), snapshot, generation
+
+    def build_messages(self, system_message, prompt, human_message_class, system_message_class, ai_message_class):
+        with self._lock:
+            turns = list(self.turns)
+        messages = [system_message_class(content=system_message)]
+        for user_prompt, response in turns:
+            messages.append(human_message_class(content=user_prompt))
+            messages.append(ai_message_class(content=response))
+        messages.append(human_message_class(content=prompt))
+        return messages
+
+    def add_turn(self, prompt, response, snapshot, generation):
+        with self._lock:
+            if generation != self.generation:
+                # The conversation was reset while this turn was in flight
+                return
+            self.turns.append((prompt, response))
+            self.seen_files.update(snapshot)
+
+            if len(self.turns) > self.max_turns:
+                # Dropped turns may hold the only full copy a later diff refers
+                # to, so the next turn starts again from full file contents.
+                self.turns = self.turns[-self.max_turns:]
+                self.seen_files = {}
@@ -0,0 +1,200 @@
+"""
+Request hedging across interchangeable LLM models
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class LatencyTracker:
+    """Keeps a rolling window of time-to-first-token samples per model"""
+
+    def __init__(self, window=50, min_samples=5, default_delay=3.0):
+        self.window = window
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def record(self, model_name, seconds):
+        with self.lock:
+            if model_name not in self.samples:
+                self.samples[model_name] = deque(maxlen=self.window)
+            self.samples[model_name].append(seconds)
+
+    def percentile(self, model_name, pct):
+        with self.lock:
+            values = sorted(self.samples.get(model_name, ()))
+        if not values:
+            return None
+        rank = min(len(values) - 1, max(0, int(round(pct / 100.0 * (len(values) - 1)))))
+        return values[rank]
+
+    def hedge_delay(self, model_name):
+        """Delay before hedging: the model's p90 TTFT once enough samples exist"""
+        with self.lock:
+            count = len(self.samples.get(model_name, ()))
+        if count < self.min_samples:
+            return self.default_delay
+        return self.percentile(model_name, 90)
+
+
+class HedgeStats:
+    def __init__(self):
+        self.total = 0
+        self.hedged = 0
+        self.secondary_wins = 0
+        self.saved_seconds = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, hedged, secondary_won, saved_seconds):
+        with self.lock:
+            self.total += 1
+            if hedged:
+                self.hedged += 1
+            if secondary_won:
+                self.secondary_wins += 1
+                self.saved_seconds += saved_seconds
+
+    def hedge_rate(self):
+        with self.lock:
+            return self.hedged / self.total if self.total else 0.0
+
+    def summary(self):
+        with self.lock:
+            rate = (self.hedged / self.total * 100) if self.total else 0.0
+            return (f"Hedging: {self.hedged}/{self.total} requests hedged ({rate:.1f}%), "
+                    f"secondary won {self.secondary_wins}, saved ~{self.saved_seconds:.1f}s")
+
+
+latency_tracker = LatencyTracker()
+hedge_stats = HedgeStats()
+
+
+class _Attempt:
+    def __init__(self, model_name):
+        self.model_name = model_name
+        self.cancel = threading.Event()
+        self.chunks = []
+        self.error = None
+        self.done = False
+        self.launched_at = None
+        self.first_chunk_at = None
+        self.first_token_at = None
+        self.thread = None
+
+
+class HedgedRequest:
+    """
+    Sends a prompt to the primary model and, if no first token arrives within
+    `delay` seconds, to the secondary model as well. The first model to produce
+    a token wins and the other attempt is cancelled. Empty chunks, such as a
+    role-only first delta, do not count as a token.
+
+    `stream_factory(model_name)` must return an iterator of text chunks.
+    `on_chunk(text)`, if given, is called with each chunk of the winning
+    stream as it arrives, on that stream's thread.
+    """
+
+    def __init__(self, stream_factory, primary, secondary, delay=None,
+                 tracker=latency_tracker, stats=hedge_stats, on_chunk=None):
+        self.stream_factory = stream_factory
+        self.on_chunk = on_chunk
+        self.primary = primary
+        self.secondary = secondary
+        self.tracker = tracker
+        self.stats = stats
+        self.delay = delay if delay is not None else tracker.hedge_delay(primary)
+        self.attempts = {}
+        self.winner = None
+        self.cond = threading.Condition()
+
+    def _launch(self, model_name):
+        attempt = _Attempt(model_name)
+        attempt.launched_at = time.perf_counter()
+        attempt.thread = threading.Thread(target=self._run_attempt, args=(attempt,), daemon=True)
+        self.attempts[model_name] = attempt
+        attempt.thread.start()
+
+    def _run_attempt(self, attempt):
+        stream = None
+        try:
+            stream = iter(self.stream_factory(attempt.model_name))
+            for chunk in stream:
+                if attempt.cancel.is_set():
+                    break
+                if attempt.first_chunk_at is None:
+                    attempt.first_chunk_at = time.perf_counter()
+                if attempt.first_token_at is None:
+                    if not chunk:
+                        continue
+                    attempt.first_token_at = time.perf_counter()
+                    self.tracker.record(attempt.model_name, attempt.first_token_at - attempt.launched_at)
+                    with self.cond:
+                        if self.winner is None:
+                            self.winner = attempt.model_name
+                        self.cond.notify_all()
+                    if self.winner != attempt.model_name:
+                        break
+                attempt.chunks.append(chunk)
+                if self.on_chunk is not None:
+                    self.on_chunk(chunk)
+        except Exception as e:
+            attempt.error = e
+        finally:
+            if stream is not None and hasattr(stream, 'close'):
+                try:
+                    stream.close()
+                except Exception:
+                    pass
+            with self.cond:
+                attempt.done = True
+                self.cond.notify_all()
+
+    def run(self):
+        """
+        Returns (winning_model_name, response_text); raises if every attempt
+        failed. The winning attempt stays in self.attempts[winner].
+        """
+        started_at = time.perf_counter()
+        hedge_at = started_at + self.delay
+
+        with self.cond:
+            self._launch(self.primary)
+            while self.winner is None:
+                pending = [a for a in self.attempts.values() if not a.done]
+                secondary_launched = self.secondary in self.attempts
+                if not secondary_launched and (time.perf_counter() >= hedge_at or not pending):
+                    self._launch(self.secondary)
+                    continue
+                if secondary_launched and not pending:
+                    break
+                timeout = None if secondary_launched else max(0.0, hedge_at - time.perf_counter())
+                self.cond.wait(timeout)
+            winner = self.winner
+
+        for name, attempt in self.attempts.items():
+            if name != winner:
+                attempt.cancel.set()
+
+        if winner is None:
+            errors = [a.error for a in self.attempts.values() if a.error]
+            raise errors[0] if errors else RuntimeError("No model produced a response")
+
+        winning = self.attempts[winner]
+        winning.thread.join()
+        if winning.error:
+            raise winning.error
+
+        hedged = self.secondary in self.attempts
+        secondary_won = winner == self.secondary
+        saved = 0.0
+        if secondary_won:
+            expected = self.tracker.percentile(self.primary, 50)
+            actual = winning.first_token_at - started_at
+            if expected is not None:
+                saved = max(0.0, expected - actual)
+        self.stats.record(hedged, secondary_won, saved)
+
+        return winner, "".join(winning.chunks)
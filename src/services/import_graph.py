@@ -0,0 +1,144 @@
+"""
+Import graph of the Python files under a folder, used to find which tests
+can be affected by a set of changed files.
+"""
+
+import ast
+import logging
+import os
+from collections import deque
+
+from ..utils.ignore_rules import ignore_rules_cache
+
+logger = logging.getLogger(__name__)
+
+
+def iter_python_files(root):
+    """Python files under root, leaving out everything the project's ignore rules exclude"""
+    for folder, dirs, files in ignore_rules_cache.rules_for(root).walk(root):
+        for name in files:
+            if name.endswith('.py'):
+                yield os.path.join(folder, name)
+
+
+def source_snapshot(root):
+    """{path: mtime} of every Python file under root"""
+    snapshot = {}
+    for path in iter_python_files(root):
+        try:
+            snapshot[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            pass
+    return snapshot
+
+
+def changed_files(old, new):
+    """Files added, removed or modified between two snapshots"""
+    changed = {path for path, mtime in new.items() if old.get(path) != mtime}
+    changed.update(path for path in old if path not in new)
+    return changed
+
+
+def module_name(path):
+    """
+    Dotted name path is imported under: its folder chain up to the first
+    folder without an __init__.py, which is where sys.path would point.
+    """
+    folder, name = os.path.split(os.path.abspath(path))
+    parts = [] if name == '__init__.py' else [name[:-3]]
+    while os.path.isfile(os.path.join(folder, '__init__.py')):
+        folder, package = os.path.split(folder)
+        parts.insert(0, package)
+        if not package:
+            break
+    return ".".join(parts)
+
+
+def _imported_names(tree, module, is_package):
+    """Absolute dotted names a module's import statements can load"""
+    package = module if is_package else module.rpartition('.')[0]
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base_parts = package.split('.') if package else []
+                if node.level - 1 > len(base_parts):
+                    continue
+                base_parts = base_parts[:len(base_parts) - (node.level - 1)]
+                if node.module:
+                    base_parts.append(node.module)
+                base = ".".join(base_parts)
+            else:
+                base = node.module or ""
+            if not base:
+                continue
+            names.add(base)
+            # "from package import module" loads a submodule
+            names.update(f"{base}.{alias.name}" for alias in node.names if alias.name != '*')
+    return names
+
+
+class ImportGraph:
+    """
+    Files and the project files they import. Parsed imports are cached by
+    mtime, so rebuilding after a few edits only re-parses those files.
+    """
+
+    def __init__(self):
+        self.modules = {}
+        self.imports = {}
+        self.importers = {}
+        self._parsed = {}
+
+    def build(self, snapshot):
+        modules = {}
+        for path in snapshot:
+            modules.setdefault(module_name(path), path)
+
+        imports = {}
+        for path, mtime in snapshot.items():
+            cached = self._parsed.get(path)
+            if cached is None or cached[0] != mtime:
+                cached = (mtime, self._parse(path))
+                self._parsed[path] = cached
+            targets = set()
+            for name in cached[1]:
+                # Importing a.b.c runs a/__init__.py and a/b/__init__.py too
+                parts = name.split('.')
+                for length in range(1, len(parts) + 1):
+                    target = modules.get(".".join(parts[:length]))
+                    if target is not None and target != path:
+                        targets.add(target)
+            imports[path] = targets
+
+        for path in list(self._parsed):
+            if path not in snapshot:
+                del self._parsed[path]
+
+        importers = {}
+        for path, targets in imports.items():
+            for target in targets:
+                importers.setdefault(target, set()).add(path)
+        self.modules, self.imports, self.importers = modules, imports, importers
+
+    def _parse(self, path):
+        try:
+            with open(path, 'rb') as f:
+                tree = ast.parse(f.read(), filename=path)
+        except (OSError, SyntaxError, ValueError) as e:
+            logger.debug(f"Could not parse imports of {path}: {str(e)}")
+            return set()
+        return _imported_names(tree, module_name(path), os.path.basename(path) == '__init__.py')
+
+    def dependents(self, paths):
+        """paths and every file that imports one of them, directly or indirectly"""
+        found = set(paths)
+        queue = deque(found)
+        while queue:
+            for importer in self.importers.get(queue.popleft(), ()):
+                if importer not in found:
+                    found.add(importer)
+                    queue.append(importer)
+        return found
@@ -1,192 +1,273 @@
 from PyQt6.QtCore import QThread, pyqtSignal
-import re
-import os
+import logging
+import time
+from .hedging import HedgedRequest, hedge_stats, latency_tracker
+from .ollama_warmup import parse_keep_alive, DEFAULT_KEEP_ALIVE, DEFAULT_OLLAMA_URL
+from .response_parser import ResponseParser, FILE, CODE
+from .provider_loader import load_provider, GROQ, OLLAMA
+from .telemetry import RequestMetrics, metrics_store
+from .prompts import SYSTEM_MESSAGE, build_prompt
+
+logger = logging.getLogger(__name__)
+
 
 class AIModelWorker(QThread):
-    response_ready = pyqtSignal(str)
+    response_ready = pyqtSignal(str, object)
     code_suggestion = pyqtSignal(str, str)
     file_changes = pyqtSignal(dict, str)
+    status_update = pyqtSignal(str)
+    block_ready = pyqtSignal(str, str)
     
-    def __init__(self, query, code_context="", model_settings=None, additional_files=None):
+    def __init__(self, query, code_context="", model_settings=None, additional_files=None, conversation=None,
+                 code_path=None):
         super().__init__()
         self.query = query
         self.code_context = code_context
+        self.code_path = code_path
         self.additional_files = additional_files or {}
+        self.conversation = conversation
+        self.pending_turn = None
+        self.metrics = RequestMetrics()
         self.model_settings = model_settings or {
             "use_groq": True,
             "groq_model": "deepseek-r1-distill-llama-70b",
             "groq_api_key": "",
+            "groq_base_url": "",
             "use_local": False,
-            "local_model": "deepseek-r1:8b"
+            "local_model": "deepseek-r1:8b",
+            "keep_alive": DEFAULT_KEEP_ALIVE,
+            "ollama_base_url": DEFAULT_OLLAMA_URL,
+            "hedge_requests": False,
+            "hedge_model": "llama-3.3-70b-versatile"
         }
         
     def run(self):
         try:
             if self.model_settings["use_groq"]:
+                self.metrics.start(GROQ, self.model_settings["groq_model"])
                 self.use_groq_model()
             else:
+                self.metrics.start(OLLAMA, self.model_settings["local_model"])
                 self.use_local_model()
                 
         except Exception as e:
-            print(f"Error in AIModelWorker: {str(e)}")
-            self.response_ready.emit(f"Error: {str(e)}")
+            logger.error(f"Error in AIModelWorker: {str(e)}")
+            self.response_ready.emit(f"Error: {str(e)}", None)
+        finally:
+            self.metrics.finished = time.perf_counter()
+            metrics_store.append(self.metrics.to_record())
             
     def use_groq_model(self):
         try:
-            from langchain_groq import ChatGroq
-            from langchain.schema.messages import HumanMessage, SystemMessage
+            stack = load_provider(GROQ)
             
             api_key = self.model_settings["groq_api_key"]
                 
             if not api_key or len(api_key) < 10:
-                self.response_ready.emit("Error: Invalid API key")
+                self.response_ready.emit("Error: Invalid API key", None)
                 return
             
             model_name = self.model_settings["groq_model"]
                 
             try:
-                model = ChatGroq(
+                model = stack.chat_model(
                     api_key=api_key, 
-                    model_name=model_name
+                    model_name=model_name,
+                    **self._groq_options()
                 )
+                self.metrics.client_ready = time.perf_counter()
             except Exception as e:
-                self.response_ready.emit(f"Error initializing model: {str(e)}")
+                self.response_ready.emit(f"Error initializing model: {str(e)}", None)
                 return
             
-            messages = []
-            system_message = """You are a helpful AI programming assistant. When asked to improve or modify code:
-                            1. Always provide a clear explanation of the changes
-                            2. Present the complete modified code in a Python code block (```python)
-                            3. Explain the benefits of the changes
-                            4. If multiple files are involved, use filename code blocks like ```filename.py```followed by the content to specify changes to different files
-                            """
-            messages.append(SystemMessage(content=system_message))
+            messages = self._build_messages(stack.human_message, stack.system_message, stack.ai_message)
             
-            prompt = self._build_prompt()
-            messages.append(HumanMessage(content=prompt))
+            hedge_model = self.model_settings.get("hedge_model")
+            use_hedging = (self.model_settings.get("hedge_requests", False)
+                           and hedge_model and hedge_model != model_name)
             
             try:
-                print(f"Sending query to Groq model: {model_name}")
-                response = model.invoke(messages)
-                result = response.content if hasattr(response, 'content') else str(response)
+                if use_hedging:
+                    result, events = self._invoke_hedged(api_key, messages, model_name, hedge_model)
+                else:
+                    logger.info(f"Sending query to Groq model: {model_name}")
+                    result, events = self._stream_response(model, messages)
                 
-                self.process_response(result)
+                self._record_turn(result)
+                self.process_response(result, events)
                 
             except Exception as e:
-                print(f"Error processing model response: {str(e)}")
-                self.response_ready.emit(f"Error getting response from model: {str(e)}")
+                logger.error(f"Error processing model response: {str(e)}")
+                self.response_ready.emit(f"Error getting response from model: {str(e)}", None)
         except Exception as e:
-            print(f"Error in use_groq_model: {str(e)}")
-            self.response_ready.emit(f"Error: {str(e)}")
+            logger.error(f"Error in use_groq_model: {str(e)}")
+            self.response_ready.emit(f"Error: {str(e)}", None)
+    
+    def _invoke_hedged(self, api_key, messages, primary, secondary):
+        ChatGroq = load_provider(GROQ).chat_model
+        options = self._groq_options()
+        
+        usage = {}
+        
+        def stream_factory(model_name):
+            model = ChatGroq(api_key=api_key, model_name=model_name, **options)
+            for chunk in model.stream(messages):
+                if getattr(chunk, 'usage_metadata', None):
+                    usage[model_name] = chunk.usage_metadata
+                yield chunk.content if hasattr(chunk, 'content') else str(chunk)
+        
+        # Only the winning stream reaches on_chunk, so metrics and blocks come from it alone
+        parser = ResponseParser()
+        
+        def on_chunk(text):
+            self.metrics.chunk_received(text)
+            for event in parser.feed(text):
+                self._emit_block_ready(event)
+        
+        request = HedgedRequest(stream_factory, primary, secondary, on_chunk=on_chunk)
+        logger.info(f"Sending hedged query to Groq models: {primary} (hedge {secondary} after {request.delay:.2f}s)")
+        self.metrics.hedged = True
+        self.metrics.stream_started = time.perf_counter()
+        winner, result = request.run()
+        for event in parser.close():
+            self._emit_block_ready(event)
+        winning = request.attempts[winner]
+        self.metrics.model = winner
+        self.metrics.first_chunk = winning.first_chunk_at
+        self.metrics.first_token = winning.first_token_at
+        if usage.get(winner):
+            self.metrics.chunk_received("", usage[winner])
+        self.metrics.stream_finished = time.perf_counter()
+        logger.info(f"Hedged query answered by: {winner}")
+        
+        self.status_update.emit(f"Answered by {winner}. {hedge_stats.summary()}")
+        return result, parser.events
+    
+    def _groq_options(self):
+        base_url = self.model_settings.get("groq_base_url")
+        return {"base_url": base_url} if base_url else {}
     
     def use_local_model(self):
         try:
-            from langchain_ollama import ChatOllama
-            from langchain.schema.messages import HumanMessage, SystemMessage
+            stack = load_provider(OLLAMA)
             
             model_name = self.model_settings["local_model"]
                 
             try:
-                model = ChatOllama(model=model_name)
+                keep_alive = parse_keep_alive(self.model_settings.get("keep_alive", DEFAULT_KEEP_ALIVE))
+                base_url = self.model_settings.get("ollama_base_url") or DEFAULT_OLLAMA_URL
+                model = stack.chat_model(model=model_name, keep_alive=keep_alive, base_url=base_url)
+                self.metrics.client_ready = time.perf_counter()
             except Exception as e:
-                self.response_ready.emit(f"Error initializing local model: {str(e)}")
+                self.response_ready.emit(f"Error initializing local model: {str(e)}", None)
                 return
             
-            messages = []
-            system_message = """You are a helpful AI programming assistant. When asked to improve or modify code:
-                            1. Always provide a clear explanation of the changes
-                            2. Present the complete modified code in a Python code block (```python)
-                            3. Explain the benefits of the changes
-                            4. If multiple files are involved, use filename code blocks like ```filename.py```followed by the content to specify changes to different files
-                            """
-            messages.append(SystemMessage(content=system_message))
-            
-            prompt = self._build_prompt()                
-            messages.append(HumanMessage(content=prompt))
+            messages = self._build_messages(stack.human_message, stack.system_message, stack.ai_message)
             
             try:
-                print(f"Sending query to local Ollama model: {model_name}")
-                response = model.invoke(messages)
-                result = response.content if hasattr(response, 'content') else str(response)
+                logger.info(f"Sending query to local Ollama model: {model_name}")
+                result, events = self._stream_response(model, messages)
                 
-                self.process_response(result)
+                self._record_turn(result)
+                self.process_response(result, events)
                     
             except Exception as e:
-                print(f"Error processing local model response: {str(e)}")
-                self.response_ready.emit(f"Error getting response from local model: {str(e)}")
+                logger.error(f"Error processing local model response: {str(e)}")
+                self.response_ready.emit(f"Error getting response from local model: {str(e)}", None)
         except Exception as e:
-            print(f"Error in use_local_model: {str(e)}")
-            self.response_ready.emit(f"Error: {str(e)}")
+            logger.error(f"Error in use_local_model: {str(e)}")
+            self.response_ready.emit(f"Error: {str(e)}", None)
     
-    def _build_prompt(self):
-        prompt = ""
-        
-        if self.code_context:
-            prompt += f"Here's my main code:\n```python\n{self.code_context}\n```\n\n"
-        
-        if self.additional_files:
-            prompt += "Here are additional files in the project:\n\n"
-            for file_path, content in self.additional_files.items():
-                file_name = os.path.basename(file_path)
-                prompt += f"File: {file_path}\n```python\n{content}\n```\n\n"
+    def _build_messages(self, human_message_class, system_message_class, ai_message_class):
+        if self.conversation is not None:
+            prompt, snapshot, generation = self.conversation.build_prompt(
+                self.query, self.code_context, self.additional_files, self.code_path
+            )
+            self.pending_turn = (prompt, snapshot, generation)
+            messages = self.conversation.build_messages(
+                SYSTEM_MESSAGE, prompt, human_message_class, system_message_class, ai_message_class
+            )
+            self.metrics.prompt_chars = sum(len(message.content) for message in messages)
+            return messages
         
-        prompt += f"My question: {self.query}"
-        
-        return prompt
+        prompt = self._build_prompt()
+        self.metrics.prompt_chars = len(SYSTEM_MESSAGE) + len(prompt)
+        return [
+            system_message_class(content=SYSTEM_MESSAGE),
+            human_message_class(content=prompt)
+        ]
     
-    def process_response(self, result):
-        file_blocks_standard = re.findall(r'```([^\s]+\.py)\s*\n(.*?)```', result, re.DOTALL)
-        file_blocks_with_python = re.findall(r'```python\s+([^\s]+\.py)\s*\n(.*?)```', result, re.DOTALL)
-        
-        file_blocks_markdown = re.findall(r'#+\s*src\/([^\s]+\.py).*?```(?:python)?\s*\n(.*?)```', result, re.DOTALL)
-        file_blocks_txt = re.findall(r'#+\s*([^\s]+\.txt).*?```(?:text)?\s*\n(.*?)```', result, re.DOTALL)
+    def _record_turn(self, result):
+        if self.conversation is not None and self.pending_turn:
+            prompt, snapshot, generation = self.pending_turn
+            self.conversation.add_turn(prompt, result, snapshot, generation)
+            self.pending_turn = None
+    
+    def _build_prompt(self):
+        return build_prompt(self.query, self.code_context, self.additional_files)
+    
+    def _stream_response(self, model, messages):
+        parser = ResponseParser()
+        chunks = []
+        self.metrics.stream_started = time.perf_counter()
+        for chunk in model.stream(messages):
+            text = chunk.content if hasattr(chunk, 'content') else str(chunk)
+            self.metrics.chunk_received(text, getattr(chunk, 'usage_metadata', None))
+            if not text:
+                continue
+            chunks.append(text)
+            for event in parser.feed(text):
+                self._emit_block_ready(event)
+        for event in parser.close():
+            self._emit_block_ready(event)
+        self.metrics.stream_finished = time.perf_counter()
+        if self.metrics.first_token is not None:
+            latency_tracker.record(self.metrics.model, self.metrics.first_token - self.metrics.stream_started)
+        return "".join(chunks), parser.events
+    
+    def _emit_block_ready(self, event):
+        if event.kind == FILE:
+            self.block_ready.emit(FILE, event.filename)
+        elif event.kind == CODE:
+            self.block_ready.emit(CODE, event.language or "")
+    
+    def process_response(self, result, events=None):
+        started = time.perf_counter()
+        try:
+            self._process_response(result, events)
+        finally:
+            self.metrics.parse_seconds = time.perf_counter() - started
+    
+    def _process_response(self, result, events=None):
+        if events is None:
+            events = ResponseParser.parse(result)
         
-        all_file_blocks = file_blocks_standard + file_blocks_with_python
+        file_changes = {}
+        code_blocks = []
+        prose = []
+        for event in events:
+            if event.kind == FILE:
+                file_changes[event.filename] = event.content
+            elif event.kind == CODE:
+                code_blocks.append(event)
+            else:
+                prose.append(event.content)
         
-        for file_path, content in file_blocks_markdown:
-            all_file_blocks.append((file_path, content))
+        if file_changes:
+            first_fence = result.find('```')
+            explanation = result[:first_fence].strip() if first_fence >= 0 else result.strip()
             
-        for file_path, content in file_blocks_txt:
-            all_file_blocks.append((file_path, content))
+            logger.info(f"Found changes for {len(file_changes)} files")
+            self.file_changes.emit(file_changes, explanation)
+            return
         
-        if all_file_blocks and len(all_file_blocks) >= 1:
-            file_changes = {}
-            for file_name, content in all_file_blocks:
-                file_name = file_name.strip()
-                if file_name.startswith('"') and file_name.endswith('"'):
-                    file_name = file_name[1:-1]
-                if file_name.startswith("'") and file_name.endswith("'"):
-                    file_name = file_name[1:-1]
-                
-                file_name = file_name.replace('\n', '').replace('\r', '')
-                
-                print(f"Processing file: {file_name}")
-                
-                if not file_name:
-                    continue
-                    
-                file_changes[file_name] = content
+        python_blocks = [block for block in code_blocks if block.language == 'python']
+        if python_blocks:
+            code = python_blocks[0].content
+            explanation = "\n\n".join(prose)
             
-            parts = result.split('```', 1)
-            explanation = parts[0].strip()
-            
-            print(f"Found changes for {len(file_changes)} files")
-            self.file_changes.emit(file_changes, explanation)
+            logger.debug(f"Found code block, length: {len(code)}")
+            self.code_suggestion.emit(code, explanation)
         else:
-            code_blocks = re.findall(r'```python\n(.*?)```', result, re.DOTALL)
-            
-            if code_blocks:
-                code = code_blocks[0]
-                parts = result.split('```python', 1)
-                explanation = parts[0].strip()
-                
-                if len(parts) > 1:
-                    after_code = parts[1].split('```', 1)
-                    if len(after_code) > 1:
-                        explanation += "\n\n" + after_code[1].strip()
-                
-                print(f"Found code block, length: {len(code)}")
-                self.code_suggestion.emit(code, explanation)
-            else:
-                print("No code blocks found in response")
-                self.response_ready.emit(result)
\ No newline at end of file
+            logger.debug("No code blocks found in response")
+            self.response_ready.emit(result, events)
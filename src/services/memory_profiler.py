@@ -0,0 +1,211 @@
+"""
+Memory profiling runs: the script runs under utils/memory_tracer.py in its
+own process, and the tracemalloc snapshots it dumps are summarized into top
+allocation sites and snapshot-to-snapshot diffs.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, namedtuple
+
+from PyQt6.QtCore import QObject, QProcess, QThread, QTimer, pyqtSignal
+
+from .profiler import default_interpreter, new_profile_base
+
+logger = logging.getLogger(__name__)
+
+MEMORY_TRACER_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    "utils", "memory_tracer.py")
+REQUEST_FILE = "request"
+SNAPSHOT_POLL_MS = 500
+TOP_SITES = 500
+CACHED_SNAPSHOTS = 4
+
+GROUP_BY_LINE = "lineno"
+GROUP_BY_FILE = "filename"
+
+SnapshotInfo = namedtuple('SnapshotInfo', 'path label time current peak')
+AllocationSite = namedtuple('AllocationSite', 'filename line size count size_diff count_diff')
+
+# The tracer's own allocations and import machinery are not interesting
+EXCLUDED_TRACES = [
+    tracemalloc.Filter(False, "*memory_tracer.py"),
+    tracemalloc.Filter(False, "*tracemalloc.py"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def memory_command(script, snapshot_dir, interpreter=None, interval=0, args=()):
+    interpreter = interpreter or default_interpreter()
+    return interpreter, [MEMORY_TRACER_SCRIPT, snapshot_dir, str(interval), script] + list(args)
+
+
+def list_snapshots(directory):
+    """Finished snapshots in directory, oldest first"""
+    snapshots = []
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return snapshots
+    for name in names:
+        if not name.endswith(".snapshot"):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            with open(path[:-len(".snapshot")] + ".json", 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        snapshots.append(SnapshotInfo(path, meta.get('label', name), meta.get('time', 0.0),
+                                      meta.get('current', 0), meta.get('peak', 0)))
+    return snapshots
+
+
+class SnapshotCache:
+    """Keeps the last few loaded (and filtered) snapshots, they are slow to unpickle"""
+
+    def __init__(self, size=CACHED_SNAPSHOTS):
+        self.size = size
+        self.snapshots = OrderedDict()
+        self.lock = threading.Lock()
+
+    def load(self, path):
+        with self.lock:
+            snapshot = self.snapshots.get(path)
+            if snapshot is not None:
+                self.snapshots.move_to_end(path)
+                return snapshot
+        snapshot = tracemalloc.Snapshot.load(path).filter_traces(EXCLUDED_TRACES)
+        with self.lock:
+            self.snapshots[path] = snapshot
+            while len(self.snapshots) > self.size:
+                self.snapshots.popitem(last=False)
+        return snapshot
+
+
+snapshot_cache = SnapshotCache()
+
+
+def _site(statistic, group_by):
+    frame = statistic.traceback[0]
+    return frame.filename, (frame.lineno if group_by == GROUP_BY_LINE else 0)
+
+
+def top_sites(path, group_by=GROUP_BY_LINE, base_path=None, limit=TOP_SITES):
+    """
+    Largest allocation sites of the snapshot at path, or the sites that grew
+    the most since the snapshot at base_path.
+    """
+    snapshot = snapshot_cache.load(path)
+    if base_path:
+        statistics = snapshot.compare_to(snapshot_cache.load(base_path), group_by)
+        return [AllocationSite(*_site(stat, group_by), stat.size, stat.count, stat.size_diff, stat.count_diff)
+                for stat in statistics[:limit]]
+    return [AllocationSite(*_site(stat, group_by), stat.size, stat.count, 0, 0)
+            for stat in snapshot.statistics(group_by)[:limit]]
+
+
+class SnapshotAnalyzer(QThread):
+    analyzed = pyqtSignal(object, object)
+
+    def __init__(self, key, path, group_by, base_path=None):
+        super().__init__()
+        self.key = key
+        self.path = path
+        self.group_by = group_by
+        self.base_path = base_path
+
+    def run(self):
+        try:
+            sites = top_sites(self.path, self.group_by, self.base_path)
+        except Exception as e:
+            logger.error(f"Error reading memory snapshot {self.path}: {str(e)}")
+            sites = None
+        self.analyzed.emit(self.key, sites)
+
+
+class MemoryRunner(QObject):
+    """Runs one script under tracemalloc in its own process and watches for its snapshots"""
+
+    output_received = pyqtSignal(str)
+    snapshots_changed = pyqtSignal(list)
+    run_finished = pyqtSignal(int, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.process = None
+        self.snapshot_dir = None
+        self.snapshots = []
+        self.started = None
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_snapshots)
+
+    def is_running(self):
+        return self.process is not None and self.process.state() != QProcess.ProcessState.NotRunning
+
+    def start(self, script, interpreter=None, interval=0, args=()):
+        if self.is_running():
+            return False
+
+        self.snapshot_dir = new_profile_base(script) + ".memory"
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        self.snapshots = []
+        self.snapshots_changed.emit([])
+
+        program, arguments = memory_command(script, self.snapshot_dir, interpreter, interval, args)
+        self.process = QProcess(self)
+        self.process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        self.process.setWorkingDirectory(os.path.dirname(script) or os.getcwd())
+        self.process.readyReadStandardOutput.connect(self._read_output)
+        self.process.finished.connect(self._process_finished)
+        self.process.errorOccurred.connect(self._process_error)
+
+        self.output_received.emit(f"$ {program} {' '.join(arguments)}\n")
+        self.started = time.perf_counter()
+        self.process.start(program, arguments)
+        self.poll_timer.start(SNAPSHOT_POLL_MS)
+        return True
+
+    def request_snapshot(self):
+        if not self.is_running():
+            return False
+        try:
+            with open(os.path.join(self.snapshot_dir, REQUEST_FILE), 'w'):
+                pass
+        except OSError as e:
+            logger.error(f"Error requesting memory snapshot: {str(e)}")
+            return False
+        return True
+
+    def stop(self):
+        if self.is_running():
+            self.process.kill()
+
+    def poll_snapshots(self):
+        if self.snapshot_dir is None:
+            return
+        snapshots = list_snapshots(self.snapshot_dir)
+        if len(snapshots) != len(self.snapshots):
+            self.snapshots = snapshots
+            self.snapshots_changed.emit(snapshots)
+
+    def _read_output(self):
+        data = self.process.readAllStandardOutput().data()
+        self.output_received.emit(data.decode('utf-8', errors='replace'))
+
+    def _process_error(self, error):
+        if error == QProcess.ProcessError.FailedToStart:
+            self.poll_timer.stop()
+            self.run_finished.emit(-1, f"Could not start {self.process.program()}")
+
+    def _process_finished(self, exit_code, exit_status):
+        self.poll_timer.stop()
+        self.poll_snapshots()
+        error = "" if self.snapshots else "The script did not produce any snapshots"
+        self.run_finished.emit(exit_code, error)
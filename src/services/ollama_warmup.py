@@ -0,0 +1,76 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OLLAMA_URL = "http://localhost:11434"
+DEFAULT_KEEP_ALIVE = "30m"
+
+
+def parse_keep_alive(value):
+    """Ollama takes keep_alive as seconds (number) or a duration string like '30m'"""
+    value = str(value).strip() if value is not None else ""
+    if not value:
+        return DEFAULT_KEEP_ALIVE
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def is_model_loaded(model_name, base_url=DEFAULT_OLLAMA_URL, timeout=2):
+    import requests
+
+    response = requests.get(f"{base_url}/api/ps", timeout=timeout)
+    response.raise_for_status()
+    for model in response.json().get("models", []):
+        if model.get("name") == model_name or model.get("model") == model_name:
+            return True
+    return False
+
+
+class OllamaWarmupWorker(QThread):
+    """Loads a local Ollama model into memory ahead of the first query"""
+    status_changed = pyqtSignal(str)
+    warmup_finished = pyqtSignal(bool)
+
+    def __init__(self, model_name, keep_alive=DEFAULT_KEEP_ALIVE, base_url=DEFAULT_OLLAMA_URL):
+        super().__init__()
+        self.model_name = model_name
+        self.keep_alive = parse_keep_alive(keep_alive)
+        self.base_url = base_url.rstrip('/')
+
+    def run(self):
+        try:
+            import requests
+
+            try:
+                if is_model_loaded(self.model_name, self.base_url):
+                    self.status_changed.emit(f"{self.model_name}: loaded")
+                    self._send_keep_alive(requests)
+                    self.warmup_finished.emit(True)
+                    return
+            except requests.exceptions.ConnectionError:
+                self.status_changed.emit("Ollama: not running")
+                self.warmup_finished.emit(False)
+                return
+
+            self.status_changed.emit(f"{self.model_name}: loading...")
+            self._send_keep_alive(requests)
+            self.status_changed.emit(f"{self.model_name}: loaded")
+            self.warmup_finished.emit(True)
+
+        except Exception as e:
+            logger.error(f"Error warming up Ollama model {self.model_name}: {str(e)}")
+            self.status_changed.emit(f"{self.model_name}: load failed")
+            self.warmup_finished.emit(False)
+
+    def _send_keep_alive(self, requests):
+        # A generate request without a prompt only loads the model and
+        # resets its unload timer to keep_alive.
+        response = requests.post(
+            f"{self.base_url}/api/generate",
+            json={"model": self.model_name, "keep_alive": self.keep_alive},
+            timeout=300
+        )
+        response.raise_for_status()
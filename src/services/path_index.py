@@ -0,0 +1,379 @@
+"""
+Index of the files under the root folder for Go to File.
+
+The scan runs in a background thread and skips whatever the project's
+shared ignore rules exclude (.gitignore files and the user's excludes).
+Later refreshes only re-list the folders whose modification time changed.
+Matching runs over a few large strings, so each keystroke costs C-level
+regex scans instead of a Python loop over every path:
+
+  1. file names starting with the query
+  2. file names containing it
+  3. file names containing its characters in order
+  4. paths containing it
+  5. paths containing its characters in order
+
+Paths are kept sorted shortest first, so the first matches of each tier
+are also its best. The search stops as soon as it has enough candidates.
+Only that handful is scored in Python.
+"""
+
+import logging
+import os
+import re
+import time
+from bisect import bisect_right
+from itertools import accumulate
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from ..utils.ignore_rules import ignore_rules_cache
+
+logger = logging.getLogger(__name__)
+
+MAX_RESULTS = 50
+CANDIDATE_LIMIT = 100
+WORD_SEPARATORS = "/\\_-. "
+
+
+class _Folder:
+    __slots__ = ('mtime', 'files', 'dirs')
+
+    def __init__(self, mtime, files, dirs):
+        self.mtime = mtime
+        self.files = files
+        self.dirs = dirs
+
+
+def _subsequence_pattern(query):
+    """Characters of query in order within one line; [^\\nX]*X never backtracks"""
+    parts = [re.escape(query[0])]
+    for char in query[1:]:
+        escaped = re.escape(char)
+        parts.append(f"[^\\n{escaped}]*{escaped}")
+    return "".join(parts)
+
+
+def match_score(query, text):
+    """
+    Quality of the best leftmost match of query's characters in text (both
+    lowercase): matches at word starts and consecutive runs count most,
+    gaps cost. None if text does not contain them in order.
+    """
+    position = -1
+    for char in query:
+        position = text.find(char, position + 1)
+        if position < 0:
+            return None
+    # Walk back from the end of the forward match to its tightest start
+    start = position + 1
+    for char in reversed(query):
+        start = text.rfind(char, 0, start)
+
+    score = 0
+    previous = start - 1
+    for char in query:
+        position = text.find(char, previous + 1)
+        if position == previous + 1:
+            score += 8
+        else:
+            score -= min(position - previous - 1, 10)
+        if position == 0 or text[position - 1] in WORD_SEPARATORS:
+            score += 6
+        previous = position
+    return score
+
+
+class _Literal:
+    """str.find-based stand-in for a regex without metacharacters; fast search beats the regex engine"""
+
+    def __init__(self, text):
+        self.text = text
+
+    def finditer(self, haystack):
+        text = self.text
+        position = haystack.find(text)
+        while position >= 0:
+            yield position + len(text) - 1
+            position = haystack.find(text, position + 1)
+
+    def search(self, line):
+        return ("\n" + line + "\n").find(self.text) >= 0
+
+
+class _Subsequence:
+    def __init__(self, query):
+        self.regex = re.compile(_subsequence_pattern(query))
+
+    def finditer(self, haystack):
+        return (match.end() - 1 for match in self.regex.finditer(haystack))
+
+    def search(self, line):
+        return self.regex.search(line) is not None
+
+
+class PathSnapshot:
+    """Immutable search structures over one listing of the index"""
+
+    def __init__(self, paths):
+        self.paths = sorted(paths, key=lambda path: (len(path), path))
+        self.lower_paths = [path.lower() for path in self.paths]
+        self.lower_names = [path[path.rfind('/') + 1:] for path in self.lower_paths]
+        # One line per path, with a newline before the first too so "\nquery" finds name prefixes
+        self.name_text = "\n" + "\n".join(self.lower_names) + "\n"
+        self.path_text = "\n" + "\n".join(self.lower_paths) + "\n"
+        self.name_starts = list(accumulate((len(name) + 1 for name in self.lower_names), initial=1))
+        self.path_starts = list(accumulate((len(path) + 1 for path in self.lower_paths), initial=1))
+        # Last exhaustive search: queries extending it can only match among its matches
+        self._last_query = None
+        self._last_matches = None
+
+    def __len__(self):
+        return len(self.paths)
+
+    def _tiers(self, query):
+        names = (self.name_text, self.name_starts, self.lower_names)
+        paths = (self.path_text, self.path_starts, self.lower_paths)
+        subsequence = _Subsequence(query)
+        tiers = []
+        if '/' not in query:
+            tiers += [(_Literal("\n" + query),) + names, (_Literal(query),) + names, (subsequence,) + names]
+        tiers += [(_Literal(query),) + paths, (subsequence,) + paths]
+        return tiers
+
+    def _scan(self, tiers, limit):
+        """Candidate indices per tier, stopping once limit are found; also whether every tier was scanned fully"""
+        seen = set()
+        found = []
+        for matcher, text, starts, _ in tiers:
+            tier = []
+            if len(seen) < limit:
+                # Each match yields the offset of a character inside its line
+                for offset in matcher.finditer(text):
+                    index = bisect_right(starts, offset) - 1
+                    if index not in seen:
+                        seen.add(index)
+                        tier.append(index)
+                        if len(seen) >= limit:
+                            break
+            found.append(tier)
+        return found, len(seen) < limit
+
+    def _filter(self, tiers, candidates):
+        found = [[] for _ in tiers]
+        for index in candidates:
+            for tier, (matcher, _, _, lines) in enumerate(tiers):
+                if matcher.search(lines[index]):
+                    found[tier].append(index)
+                    break
+        return found
+
+    def search(self, query, limit=MAX_RESULTS):
+        """Best matching paths for query, best first"""
+        query = query.strip().replace('\\', '/').replace(' ', '').lower()
+        if not query:
+            return self.paths[:limit]
+
+        tiers = self._tiers(query)
+        if self._last_query is not None and query.startswith(self._last_query):
+            found = self._filter(tiers, self._last_matches)
+            exhaustive = True
+        else:
+            found, exhaustive = self._scan(tiers, max(limit, CANDIDATE_LIMIT))
+        if exhaustive:
+            self._last_query = query
+            self._last_matches = sorted(index for tier in found for index in tier)
+        else:
+            self._last_query = self._last_matches = None
+
+        ranked = []
+        for tier, indices in enumerate(found):
+            lines = tiers[tier][3]
+            for index in indices:
+                score = match_score(query, lines[index])
+                ranked.append((tier, -(score or 0), index))
+        ranked.sort()
+        return [self.paths[index] for _, _, index in ranked[:limit]]
+
+
+class PathScanner:
+    """
+    Listing of a root folder, refreshed incrementally: folders are only
+    re-read when their modification time changed.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.rules = None
+        self.rules_version = None
+        # Where root sits inside the project the rules belong to ('' at its top)
+        self.prefix = ""
+        self.folders = {}
+
+    def _rule_path(self, relative):
+        if not self.prefix:
+            return relative
+        return f"{self.prefix}/{relative}" if relative else self.prefix
+
+    def _list(self, relative_dir):
+        directory = os.path.join(self.root, relative_dir) if relative_dir else self.root
+        files, dirs = [], []
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as entries:
+                entries = list(entries)
+        except OSError:
+            return None
+        self.rules.add_directory(self._rule_path(relative_dir), {entry.name for entry in entries})
+        for entry in entries:
+            relative = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+            try:
+                # Linked folders are left out; following them could loop
+                if entry.is_symlink() and not entry.is_file():
+                    continue
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if self.rules.matches(self._rule_path(relative), is_dir):
+                continue
+            (dirs if is_dir else files).append(entry.name)
+        return _Folder(mtime, files, dirs)
+
+    def _scan_tree(self, relative_dir):
+        pending = [relative_dir]
+        while pending:
+            current = pending.pop()
+            folder = self._list(current)
+            if folder is None:
+                continue
+            self.folders[current] = folder
+            pending.extend(f"{current}/{name}" if current else name for name in folder.dirs)
+
+    def _forget_tree(self, relative_dir):
+        prefix = relative_dir + "/"
+        for key in [key for key in self.folders if key == relative_dir or key.startswith(prefix)]:
+            del self.folders[key]
+
+    def refresh(self):
+        """Brings the listing up to date; returns whether anything changed"""
+        if self.rules is None or self.rules.sources_changed() or self.rules.version != self.rules_version:
+            self.rules = ignore_rules_cache.rules_for(self.root)
+            self.prefix = self.rules.relative(self.root) or ""
+            if self.prefix:
+                self.rules.add_parents(self.prefix + "/")
+            self.folders = {}
+            self._scan_tree("")
+            self.rules_version = self.rules.version
+            return True
+
+        changed = False
+        for relative_dir in list(self.folders):
+            folder = self.folders.get(relative_dir)
+            if folder is None:
+                continue
+            directory = os.path.join(self.root, relative_dir) if relative_dir else self.root
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                self._forget_tree(relative_dir)
+                changed = True
+                continue
+            if mtime == folder.mtime:
+                continue
+            changed = True
+            updated = self._list(relative_dir)
+            if updated is None:
+                self._forget_tree(relative_dir)
+                continue
+            self.folders[relative_dir] = updated
+            for name in set(folder.dirs) - set(updated.dirs):
+                self._forget_tree(f"{relative_dir}/{name}" if relative_dir else name)
+            for name in set(updated.dirs) - set(folder.dirs):
+                self._scan_tree(f"{relative_dir}/{name}" if relative_dir else name)
+        if self.rules.version != self.rules_version:
+            # A new .gitignore can hide folders listed before it existed
+            return self.refresh()
+        return changed
+
+    def paths(self):
+        return [f"{relative_dir}/{name}" if relative_dir else name
+                for relative_dir, folder in self.folders.items() for name in folder.files]
+
+
+class PathIndexer(QThread):
+    indexed = pyqtSignal(object, object)
+
+    def __init__(self, scanner):
+        super().__init__()
+        self.scanner = scanner
+
+    def run(self):
+        snapshot = None
+        try:
+            started = time.perf_counter()
+            if self.scanner.refresh():
+                snapshot = PathSnapshot(self.scanner.paths())
+                logger.debug(f"Indexed {len(snapshot)} files under {self.scanner.root} "
+                             f"in {time.perf_counter() - started:.2f}s")
+        except Exception as e:
+            logger.error(f"Error indexing {self.scanner.root}: {str(e)}")
+        self.indexed.emit(self.scanner, snapshot)
+
+
+class PathIndex(QObject):
+    """The project's file paths, rebuilt in the background whenever refresh() finds changes"""
+
+    updated = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.scanner = None
+        self.snapshot = PathSnapshot([])
+        self.indexer = None
+        self.refresh_pending = False
+
+    @property
+    def root(self):
+        return self.scanner.root if self.scanner is not None else None
+
+    def is_indexing(self):
+        return self.indexer is not None
+
+    def set_root(self, root):
+        root = os.path.abspath(root)
+        if root == self.root:
+            return
+        self.scanner = PathScanner(root)
+        self.snapshot = PathSnapshot([])
+        self.refresh()
+
+    def refresh(self):
+        if self.scanner is None:
+            return
+        if self.indexer is not None:
+            self.refresh_pending = True
+            return
+        self.refresh_pending = False
+        self.indexer = PathIndexer(self.scanner)
+        self.indexer.indexed.connect(self._indexed)
+        self.indexer.start()
+
+    def _indexed(self, scanner, snapshot):
+        self.indexer.wait()
+        self.indexer = None
+        if scanner is self.scanner and snapshot is not None:
+            self.snapshot = snapshot
+            self.updated.emit()
+        if self.refresh_pending:
+            self.refresh()
+
+    def search(self, query, limit=MAX_RESULTS):
+        """Relative paths ('/' separated) best matching query"""
+        return self.snapshot.search(query, limit)
+
+    def absolute_path(self, relative_path):
+        return os.path.normpath(os.path.join(self.root, relative_path))
+
+    def stop(self):
+        if self.indexer is not None:
+            self.indexer.wait()
@@ -0,0 +1,339 @@
+"""
+Profiled script runs: the script runs under cProfile in its own process
+(wrapped in py-spy when it is installed), and the resulting stats are turned
+into a hot-function list and a flame graph tree. Line timing runs use
+utils/line_timer.py instead and produce per-line hit counts and times.
+"""
+
+import json
+import logging
+import os
+import pstats
+import re
+import shutil
+import time
+from collections import namedtuple
+
+from PyQt6.QtCore import QObject, QProcess, QThread, pyqtSignal
+
+from ..utils.file_utils import get_app_data_dir
+
+logger = logging.getLogger(__name__)
+
+SAMPLING_PROFILER = "py-spy"
+SAMPLING_RATE = 200
+MAX_FLAME_DEPTH = 64
+MIN_FLAME_FRACTION = 0.001
+MAX_PROFILE_FILES = 60
+LINE_TIMER_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 "utils", "line_timer.py")
+
+FunctionStat = namedtuple(
+    'FunctionStat', 'filename line name calls primitive_calls own_time cumulative_time'
+)
+
+_FRAME_PATTERN = re.compile(r'^(.*) \((.*):(\d+)\)$')
+
+
+def default_interpreter():
+    """The interpreter the terminal's Run Code uses"""
+    return "python" if os.name == 'nt' else "python3"
+
+
+def sampling_profiler_path():
+    return shutil.which(SAMPLING_PROFILER)
+
+
+def profile_command(script, stats_path, interpreter=None, flame_path=None, args=()):
+    """
+    Program and arguments for a profiled run. With flame_path the run is
+    wrapped in py-spy, which writes collapsed stacks there.
+    """
+    interpreter = interpreter or default_interpreter()
+    command = [interpreter, "-m", "cProfile", "-o", stats_path, script] + list(args)
+    if flame_path:
+        command = [sampling_profiler_path(), "record", "--format", "raw", "--function",
+                   "--rate", str(SAMPLING_RATE), "-o", flame_path, "--"] + command
+    return command[0], command[1:]
+
+
+def line_timing_command(script, output_path, interpreter=None, args=()):
+    interpreter = interpreter or default_interpreter()
+    return interpreter, [LINE_TIMER_SCRIPT, output_path, script] + list(args)
+
+
+def _prune_profiles(directory):
+    entries = sorted(
+        (os.path.join(directory, name) for name in os.listdir(directory)),
+        key=os.path.getmtime,
+    )
+    for path in entries[:-MAX_PROFILE_FILES]:
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def new_profile_base(script):
+    """Fresh path (without extension) for a run's output files in the data directory's profiles folder"""
+    directory = get_app_data_dir("profiles")
+    _prune_profiles(directory)
+    stem = f"{os.path.splitext(os.path.basename(script))[0]}-{time.strftime('%Y%m%d-%H%M%S')}"
+    return os.path.join(directory, stem)
+
+
+def function_label(filename, name):
+    if filename == '~':
+        return name
+    return f"{name} ({os.path.basename(filename)})"
+
+
+class FlameNode:
+    """One frame in the flame graph; value is its inclusive time (or sample count)"""
+
+    __slots__ = ('name', 'filename', 'line', 'value', 'children')
+
+    def __init__(self, name, filename=None, line=0, value=0.0):
+        self.name = name
+        self.filename = filename
+        self.line = line
+        self.value = value
+        self.children = {}
+
+    def child(self, name, filename, line):
+        key = (filename, line, name)
+        node = self.children.get(key)
+        if node is None:
+            node = self.children[key] = FlameNode(name, filename, line)
+        return node
+
+    @property
+    def label(self):
+        if not self.filename:
+            return self.name
+        return function_label(self.filename, self.name)
+
+    def depth(self):
+        if not self.children:
+            return 1
+        return 1 + max(child.depth() for child in self.children.values())
+
+
+def load_functions(stats):
+    functions = []
+    for (filename, line, name), (cc, nc, tt, ct, _) in stats.stats.items():
+        functions.append(FunctionStat(filename, line, name, nc, cc, tt, ct))
+    functions.sort(key=lambda function: function.own_time, reverse=True)
+    return functions
+
+
+def flame_from_stats(stats, max_depth=MAX_FLAME_DEPTH, min_fraction=MIN_FLAME_FRACTION):
+    """
+    Approximates a flame graph from cProfile's caller/callee edges: each
+    callee gets the time spent in it from that caller, scaled by the share
+    of the caller's time the current path represents.
+    """
+    entries = stats.stats
+    callees = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, caller_stats in callers.items():
+            callees.setdefault(caller, []).append((func, caller_stats[3]))
+
+    roots = [func for func, entry in entries.items() if not entry[4]]
+    root = FlameNode("all", value=sum(entries[func][3] for func in roots))
+    threshold = root.value * min_fraction
+
+    def build(node, func, value, path, depth):
+        cumulative = entries[func][3]
+        if depth >= max_depth or cumulative <= 0:
+            return
+        scale = min(1.0, value / cumulative)
+        for callee, time_from_caller in callees.get(func, ()):
+            if callee in path:
+                continue
+            child_value = time_from_caller * scale
+            if child_value < threshold:
+                continue
+            child = node.child(callee[2], callee[0], callee[1])
+            child.value += child_value
+            path.add(callee)
+            build(child, callee, child_value, path, depth + 1)
+            path.discard(callee)
+
+    for func in roots:
+        value = entries[func][3]
+        if value < threshold:
+            continue
+        node = root.child(func[2], func[0], func[1])
+        node.value += value
+        build(node, func, value, {func}, 1)
+    return root
+
+
+def flame_from_collapsed(path, script=None):
+    """
+    Flame graph tree from py-spy's raw (collapsed) output. Frames above the
+    script's own module (cProfile and runpy) are dropped when script is given.
+    """
+    root = FlameNode("all")
+    script = os.path.normcase(os.path.abspath(script)) if script else None
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            stack, _, count = line.rstrip('\n').rpartition(' ')
+            try:
+                count = int(count)
+            except ValueError:
+                continue
+
+            frames = []
+            for frame in stack.split(';'):
+                match = _FRAME_PATTERN.match(frame)
+                if match:
+                    frames.append((match.group(1), match.group(2), int(match.group(3))))
+                else:
+                    frames.append((frame, None, 0))
+
+            if script:
+                for index, (_, filename, _) in enumerate(frames):
+                    if filename and os.path.normcase(os.path.abspath(filename)) == script:
+                        frames = frames[index:]
+                        break
+
+            root.value += count
+            node = root
+            for name, filename, lineno in frames:
+                node = node.child(name, filename, lineno)
+                node.value += count
+    return root
+
+
+def load_line_timings(path):
+    """(backend, {line: (hits, seconds)}) from a line_timer.py output file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    lines = {int(line): (hits, seconds) for line, (hits, seconds) in data.get('lines', {}).items()}
+    return data.get('backend'), lines
+
+
+class ProfileResult:
+    def __init__(self, script, stats_path, line_timing=False, exit_code=0):
+        self.script = script
+        self.stats_path = stats_path
+        self.line_timing = line_timing
+        self.exit_code = exit_code
+        self.wall_time = 0.0
+        self.total_time = 0.0
+        self.functions = []
+        self.flame = None
+        self.flame_unit = "s"
+        self.lines = {}
+        self.line_backend = None
+        self.error = None
+
+
+class ProfileLoader(QThread):
+    """Reads the stats and stacks files off the GUI thread"""
+
+    loaded = pyqtSignal(object)
+
+    def __init__(self, result, flame_path=None):
+        super().__init__()
+        self.result = result
+        self.flame_path = flame_path
+
+    def run(self):
+        result = self.result
+        try:
+            if result.line_timing:
+                result.line_backend, result.lines = load_line_timings(result.stats_path)
+                result.total_time = sum(seconds for _, seconds in result.lines.values())
+                self.loaded.emit(result)
+                return
+
+            stats = pstats.Stats(result.stats_path)
+            result.total_time = stats.total_tt
+            result.functions = load_functions(stats)
+
+            if self.flame_path and os.path.exists(self.flame_path) and os.path.getsize(self.flame_path):
+                result.flame = flame_from_collapsed(self.flame_path, result.script)
+                result.flame_unit = "samples"
+            else:
+                result.flame = flame_from_stats(stats)
+        except Exception as e:
+            logger.error(f"Error loading profile {result.stats_path}: {str(e)}")
+            result.error = str(e)
+        self.loaded.emit(result)
+
+
+class ProfileRunner(QObject):
+    """Runs one script under the profiler in its own process"""
+
+    output_received = pyqtSignal(str)
+    run_finished = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.process = None
+        self.loader = None
+        self.result = None
+        self.flame_path = None
+        self.started = None
+
+    def is_running(self):
+        return self.process is not None and self.process.state() != QProcess.ProcessState.NotRunning
+
+    def start(self, script, interpreter=None, use_sampling=True, args=(), line_timing=False):
+        if self.is_running():
+            return False
+
+        base = new_profile_base(script)
+        self.flame_path = None
+        if line_timing:
+            stats_path = base + ".lines.json"
+            program, arguments = line_timing_command(script, stats_path, interpreter, args)
+        else:
+            stats_path = base + ".prof"
+            if use_sampling and sampling_profiler_path():
+                self.flame_path = base + ".stacks"
+            program, arguments = profile_command(script, stats_path, interpreter, self.flame_path, args)
+        self.result = ProfileResult(script, stats_path, line_timing)
+
+        self.process = QProcess(self)
+        self.process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        self.process.setWorkingDirectory(os.path.dirname(script) or os.getcwd())
+        self.process.readyReadStandardOutput.connect(self._read_output)
+        self.process.finished.connect(self._process_finished)
+        self.process.errorOccurred.connect(self._process_error)
+
+        self.output_received.emit(f"$ {program} {' '.join(arguments)}\n")
+        self.started = time.perf_counter()
+        self.process.start(program, arguments)
+        return True
+
+    def stop(self):
+        if self.is_running():
+            self.process.kill()
+
+    def _read_output(self):
+        data = self.process.readAllStandardOutput().data()
+        self.output_received.emit(data.decode('utf-8', errors='replace'))
+
+    def _process_error(self, error):
+        if error == QProcess.ProcessError.FailedToStart:
+            self.result.error = f"Could not start {self.process.program()}"
+            self.run_finished.emit(self.result)
+
+    def _process_finished(self, exit_code, exit_status):
+        self.result.exit_code = exit_code
+        self.result.wall_time = time.perf_counter() - self.started
+        if not os.path.exists(self.result.stats_path):
+            self.result.error = "The script did not produce profile data"
+            self.run_finished.emit(self.result)
+            return
+
+        self.loader = ProfileLoader(self.result, self.flame_path)
+        self.loader.loaded.connect(self.run_finished)
+        self.loader.start()
@@ -0,0 +1,39 @@
+"""
+Prompt text shared by one-shot requests and conversation mode
+"""
+
+SYSTEM_MESSAGE = """You are a helpful AI programming assistant. When asked to improve or modify code:
+1. Always provide a clear explanation of the changes
+2. Present the complete modified code in a Python code block (```python)
+3. Explain the benefits of the changes
+4. If multiple files are involved, use filename code blocks like ```filename.py```followed by the content to specify changes to different files
+"""
+
+# Sections are ordered from most to least stable so that consecutive requests
+# share the longest possible prefix (provider prompt caching, Ollama KV reuse).
+CONTEXT_FILES_HEADER = "Here are additional files in the project:\n\n"
+CONTEXT_FILE_LABEL = "File: {path}"
+CONTEXT_FILE_TEMPLATE = CONTEXT_FILE_LABEL + "\n```python\n{content}\n```\n\n"
+MAIN_CODE_LABEL = "Here's my main code"
+MAIN_CODE_TEMPLATE = MAIN_CODE_LABEL + ":\n```python\n{code}\n```\n\n"
+QUESTION_TEMPLATE = "My question: {query}"
+
+# Conversation mode: files the model has already seen
+UNCHANGED_FILE_TEMPLATE = "{label} (unchanged since my last message)\n\n"
+CHANGED_FILE_TEMPLATE = "{label} (changed since my last message):\n```diff\n{diff}\n```\n\n"
+
+
+def build_prompt(query, code_context="", additional_files=None):
+    parts = []
+    
+    if additional_files:
+        parts.append(CONTEXT_FILES_HEADER)
+        for file_path in sorted(additional_files):
+            parts.append(CONTEXT_FILE_TEMPLATE.format(path=file_path, content=additional_files[file_path]))
+    
+    if code_context:
+        parts.append(MAIN_CODE_TEMPLATE.format(code=code_context))
+    
+    parts.append(QUESTION_TEMPLATE.format(query=query))
+    
+    return "".join(parts)
@@ -0,0 +1,86 @@
+"""
+Background loading of the LangChain provider stacks.
+
+Importing langchain_groq / langchain_ollama takes seconds, so the selected
+stack is imported once the window is idle and the loaded classes are shared
+with every AIModelWorker afterwards.
+"""
+
+import logging
+import threading
+from collections import namedtuple
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+GROQ = "groq"
+OLLAMA = "ollama"
+
+PROVIDER_NAMES = {GROQ: "Groq", OLLAMA: "Ollama"}
+
+ProviderStack = namedtuple("ProviderStack", ["chat_model", "human_message", "system_message", "ai_message"])
+
+_stacks = {}
+_lock = threading.Lock()
+
+
+def provider_for(model_settings):
+    return GROQ if model_settings.get("use_groq", True) else OLLAMA
+
+
+def is_loaded(provider):
+    return provider in _stacks
+
+
+def load_provider(provider):
+    """Returns the ProviderStack for `provider`, importing it on first use (thread-safe)"""
+    stack = _stacks.get(provider)
+    if stack is not None:
+        return stack
+
+    with _lock:
+        stack = _stacks.get(provider)
+        if stack is not None:
+            return stack
+
+        if provider == GROQ:
+            from langchain_groq import ChatGroq as chat_model
+        elif provider == OLLAMA:
+            from langchain_ollama import ChatOllama as chat_model
+        else:
+            raise ValueError(f"Unknown provider: {provider}")
+        from langchain.schema.messages import HumanMessage, SystemMessage, AIMessage
+
+        stack = ProviderStack(chat_model, HumanMessage, SystemMessage, AIMessage)
+        _stacks[provider] = stack
+        return stack
+
+
+class ProviderPreloader(QThread):
+    """Imports a provider stack off the GUI thread"""
+    status_changed = pyqtSignal(str)
+    preload_finished = pyqtSignal(str, bool)
+
+    def __init__(self, provider):
+        super().__init__()
+        self.provider = provider
+
+    def run(self):
+        name = PROVIDER_NAMES.get(self.provider, self.provider)
+        if is_loaded(self.provider):
+            self.status_changed.emit(f"{name}: ready")
+            self.preload_finished.emit(self.provider, True)
+            return
+
+        self.status_changed.emit(f"{name}: loading...")
+        try:
+            load_provider(self.provider)
+        except Exception as e:
+            logger.error(f"Error preloading {name} provider: {str(e)}")
+            self.status_changed.emit(f"{name}: unavailable")
+            self.preload_finished.emit(self.provider, False)
+            return
+
+        self.status_changed.emit(f"{name}: ready")
+        self.preload_finished.emit(self.provider, True)
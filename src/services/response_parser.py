@@ -0,0 +1,189 @@
+"""
+Incremental parser for fenced blocks in LLM responses
+"""
+
+import re
+
+PROSE = "prose"
+CODE = "code"
+FILE = "file"
+
+FILENAME_PATTERN = re.compile(r'^[\w./\\-]*\w\.[A-Za-z0-9]+$')
+# A line that is nothing but a file name, dressed up as a heading or label:
+# "### src/foo.py", "**foo.py**", "1. `foo.py`:", "File: foo.py"
+HEADING_FILENAME_PATTERN = re.compile(
+    r'^(?:#{1,6}\s+|\d+\.\s+|[-*]\s+)?(?:\*\*|__)?'
+    r'(?:(?:file(?:name)?|path)\s*:\s*)?(?:\*\*|__)?\s*`?'
+    r'(?P<name>[\w./\\-]+)'
+    r'`?(?:\*\*|__)?:?(?:\*\*|__)?$',
+    re.IGNORECASE
+)
+
+EXTENSION_LANGUAGES = {
+    'py': 'python',
+    'txt': 'text',
+    'md': 'markdown',
+    'json': 'json',
+    'js': 'javascript',
+    'ts': 'typescript',
+    'html': 'html',
+    'css': 'css',
+    'yml': 'yaml',
+    'yaml': 'yaml',
+    'toml': 'toml',
+    'sh': 'bash',
+}
+SOURCE_EXTENSIONS = set(EXTENSION_LANGUAGES) | {
+    'pyi', 'pyx', 'cfg', 'ini', 'jsx', 'tsx', 'c', 'h', 'cpp', 'hpp', 'java', 'go', 'rs', 'rb', 'sql', 'xml', 'csv',
+}
+
+
+class ParseEvent:
+    __slots__ = ('kind', 'content', 'language', 'filename')
+
+    def __init__(self, kind, content, language=None, filename=None):
+        self.kind = kind
+        self.content = content
+        self.language = language
+        self.filename = filename
+
+    def __repr__(self):
+        return f"ParseEvent({self.kind!r}, language={self.language!r}, filename={self.filename!r}, {len(self.content)} chars)"
+
+
+def _clean_filename(name):
+    name = name.strip().strip('`').strip('"').strip("'")
+    return name.replace('\n', '').replace('\r', '')
+
+
+def _looks_like_filename(token):
+    """File names need a known source extension, so "3.11" or "e.g." never count"""
+    if not FILENAME_PATTERN.match(token) or token.startswith('.'):
+        return False
+    return token.rsplit('.', 1)[-1].lower() in SOURCE_EXTENSIONS
+
+
+class ResponseParser:
+    """
+    Single-pass, line-based parser for markdown fenced blocks. Feed it the
+    response text as it streams in; each call returns the events completed
+    by that chunk. Work per chunk is proportional to the chunk size.
+
+    File blocks are recognised from the fence info string (```foo.py or
+    ```python foo.py) or from a heading line immediately above the fence
+    (### src/foo.py). Identical blocks are only reported once.
+    """
+
+    def __init__(self):
+        # Pieces of the line still being received, joined once its newline arrives
+        self.partial_line = []
+        self.in_fence = False
+        self.fence_language = None
+        self.fence_filename = None
+        self.fence_lines = []
+        self.prose_lines = []
+        self.seen_blocks = set()
+        self.events = []
+
+    def feed(self, chunk):
+        if not chunk:
+            return []
+        self.partial_line.append(chunk)
+        if '\n' not in chunk:
+            return []
+        lines = "".join(self.partial_line).split('\n')
+        self.partial_line = [lines.pop()]
+
+        new_events = []
+        for line in lines:
+            self._process_line(line, new_events)
+        self.events.extend(new_events)
+        return new_events
+
+    def close(self):
+        new_events = []
+        partial_line = "".join(self.partial_line)
+        self.partial_line = []
+        if partial_line:
+            self._process_line(partial_line, new_events)
+        if self.in_fence:
+            self._close_fence(new_events)
+        self._flush_prose(new_events)
+        self.events.extend(new_events)
+        return new_events
+
+    @classmethod
+    def parse(cls, text):
+        parser = cls()
+        parser.feed(text)
+        parser.close()
+        return parser.events
+
+    def _process_line(self, line, new_events):
+        stripped = line.strip()
+        if self.in_fence:
+            if stripped.startswith('```') and not stripped.strip('`'):
+                self._close_fence(new_events)
+            else:
+                self.fence_lines.append(line)
+            return
+
+        if stripped.startswith('```'):
+            self._open_fence(stripped[3:].strip().strip('`').strip(), new_events)
+        else:
+            self.prose_lines.append(line)
+
+    def _open_fence(self, info, new_events):
+        language = None
+        filename = None
+        for token in info.split():
+            token = _clean_filename(token)
+            if filename is None and _looks_like_filename(token):
+                filename = token
+            elif language is None:
+                language = token.lower()
+
+        if filename is None:
+            filename = self._heading_filename()
+
+        if language is None and filename:
+            extension = filename.rsplit('.', 1)[-1].lower()
+            language = EXTENSION_LANGUAGES.get(extension, extension)
+
+        self._flush_prose(new_events)
+        self.in_fence = True
+        self.fence_language = language
+        self.fence_filename = filename
+        self.fence_lines = []
+
+    def _heading_filename(self):
+        for line in reversed(self.prose_lines):
+            stripped = line.strip()
+            if not stripped:
+                continue
+            match = HEADING_FILENAME_PATTERN.match(stripped)
+            # A bare name on its own line is too likely to be prose
+            if match is None or match.group('name') == stripped:
+                return None
+            name = _clean_filename(match.group('name'))
+            return name if _looks_like_filename(name) else None
+        return None
+
+    def _close_fence(self, new_events):
+        content = "\n".join(self.fence_lines) + "\n" if self.fence_lines else ""
+        kind = FILE if self.fence_filename else CODE
+        key = (kind, self.fence_filename, content)
+        if key not in self.seen_blocks:
+            self.seen_blocks.add(key)
+            new_events.append(ParseEvent(kind, content, self.fence_language, self.fence_filename))
+
+        self.in_fence = False
+        self.fence_language = None
+        self.fence_filename = None
+        self.fence_lines = []
+
+    def _flush_prose(self, new_events):
+        text = "\n".join(self.prose_lines).strip()
+        self.prose_lines = []
+        if text:
+            new_events.append(ParseEvent(PROSE, text))
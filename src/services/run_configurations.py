@@ -0,0 +1,261 @@
+"""
+Named run configurations and a manager that runs them as separate
+processes, several at a time, each with its own output.
+"""
+
+import json
+import logging
+import os
+import shlex
+import tempfile
+import time
+
+from PyQt6.QtCore import QObject, QProcess, QProcessEnvironment, pyqtSignal
+
+from .profiler import default_interpreter
+from ..utils.file_utils import get_app_data_dir
+
+logger = logging.getLogger(__name__)
+
+RUN_LAUNCHER_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   "utils", "run_launcher.py")
+CONFIGURATIONS_FILE = "run_configurations.json"
+DEFAULT_MAX_PARALLEL = max(1, (os.cpu_count() or 2) // 2)
+
+QUEUED = "queued"
+RUNNING = "running"
+FINISHED = "finished"
+FAILED = "failed"
+STOPPED = "stopped"
+
+
+def parse_cpu_list(text):
+    """'0-3,6' -> [0, 1, 2, 3, 6]; raises ValueError on malformed input"""
+    cpus = set()
+    for part in text.replace(" ", "").split(","):
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            first, last = int(first), int(last)
+            if first > last:
+                raise ValueError(f"CPU range {part} is reversed")
+            cpus.update(range(first, last + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+def format_cpu_list(cpus):
+    return ",".join(str(cpu) for cpu in cpus)
+
+
+class RunConfiguration:
+    def __init__(self, name, script, args="", working_dir="", interpreter="", env=None, cpus=None):
+        self.name = name
+        self.script = script
+        self.args = args
+        self.working_dir = working_dir
+        self.interpreter = interpreter
+        self.env = dict(env or {})
+        self.cpus = list(cpus or [])
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'script': self.script,
+            'args': self.args,
+            'working_dir': self.working_dir,
+            'interpreter': self.interpreter,
+            'env': self.env,
+            'cpus': self.cpus,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('name', ''), data.get('script', ''), data.get('args', ''),
+                   data.get('working_dir', ''), data.get('interpreter', ''),
+                   data.get('env'), data.get('cpus'))
+
+
+class RunConfigurationStore:
+    """Configurations and the parallel-run limit, kept in the per-user data directory"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_app_data_dir(), CONFIGURATIONS_FILE)
+
+    def load(self):
+        """Returns (configurations, max_parallel)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return [], DEFAULT_MAX_PARALLEL
+        configurations = [RunConfiguration.from_dict(entry) for entry in data.get('configurations', [])]
+        return configurations, data.get('max_parallel', DEFAULT_MAX_PARALLEL)
+
+    def save(self, configurations, max_parallel):
+        data = json.dumps({
+            'configurations': [configuration.to_dict() for configuration in configurations],
+            'max_parallel': max_parallel,
+        }, indent=2)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=".runs.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"Error writing run configurations: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+
+class ConfiguredRun:
+    """One execution of a run configuration"""
+
+    def __init__(self, number, configuration):
+        self.number = number
+        self.configuration = configuration
+        self.state = QUEUED
+        self.process = None
+        self.pid = None
+        self.exit_code = None
+        self.error = None
+        self.started = None
+        self.ended = None
+        self.cpu_times = None
+        self.report_path = os.path.join(get_app_data_dir("runs"), f"run-{os.getpid()}-{number}.json")
+
+    @property
+    def title(self):
+        return f"{self.configuration.name} #{self.number}"
+
+    @property
+    def wall_time(self):
+        if self.started is None:
+            return None
+        return (self.ended or time.perf_counter()) - self.started
+
+    @property
+    def cpu_time(self):
+        """User + system seconds of the script and its waited-for children, once it has finished"""
+        if not self.cpu_times:
+            return None
+        return sum(self.cpu_times.get(key, 0.0) for key in ('user', 'system', 'children_user', 'children_system'))
+
+    def command(self):
+        configuration = self.configuration
+        cpus = format_cpu_list(configuration.cpus) if configuration.cpus else "-"
+        arguments = [RUN_LAUNCHER_SCRIPT, self.report_path, cpus, configuration.script]
+        arguments += shlex.split(configuration.args, posix=os.name != 'nt')
+        return configuration.interpreter or default_interpreter(), arguments
+
+
+class RunManager(QObject):
+    """
+    Starts configured runs in their own processes, at most max_parallel at a
+    time; the rest wait in a FIFO queue.
+    """
+
+    run_changed = pyqtSignal(object)
+    output_received = pyqtSignal(object, str)
+
+    def __init__(self, max_parallel=DEFAULT_MAX_PARALLEL, parent=None):
+        super().__init__(parent)
+        self.max_parallel = max_parallel
+        self.runs = []
+        self.queue = []
+        self.active = []
+        self.next_number = 1
+
+    def set_max_parallel(self, value):
+        self.max_parallel = max(1, value)
+        self._start_queued()
+
+    def submit(self, configuration):
+        run = ConfiguredRun(self.next_number, configuration)
+        self.next_number += 1
+        self.runs.append(run)
+        self.queue.append(run)
+        self.run_changed.emit(run)
+        self._start_queued()
+        return run
+
+    def stop(self, run):
+        if run in self.queue:
+            self.queue.remove(run)
+            run.state = STOPPED
+            self.run_changed.emit(run)
+        elif run.process is not None and run.state == RUNNING:
+            run.state = STOPPED
+            run.process.kill()
+
+    def stop_all(self):
+        for run in list(self.queue) + list(self.active):
+            self.stop(run)
+
+    def _start_queued(self):
+        while self.queue and len(self.active) < self.max_parallel:
+            self._start(self.queue.pop(0))
+
+    def _start(self, run):
+        configuration = run.configuration
+        program, arguments = run.command()
+
+        process = QProcess(self)
+        process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        process.setWorkingDirectory(configuration.working_dir or os.path.dirname(configuration.script) or os.getcwd())
+        if configuration.env:
+            environment = QProcessEnvironment.systemEnvironment()
+            for key, value in configuration.env.items():
+                environment.insert(key, value)
+            process.setProcessEnvironment(environment)
+
+        process.readyReadStandardOutput.connect(lambda: self._read_output(run))
+        process.started.connect(lambda: self._process_started(run))
+        process.finished.connect(lambda exit_code, exit_status: self._process_finished(run, exit_code))
+        process.errorOccurred.connect(lambda error: self._process_error(run, error))
+
+        run.process = process
+        run.state = RUNNING
+        run.started = time.perf_counter()
+        self.active.append(run)
+        self.output_received.emit(run, f"$ {program} {' '.join(arguments)}\n")
+        self.run_changed.emit(run)
+        process.start(program, arguments)
+
+    def _process_started(self, run):
+        run.pid = run.process.processId()
+        self.run_changed.emit(run)
+
+    def _read_output(self, run):
+        data = run.process.readAllStandardOutput().data()
+        self.output_received.emit(run, data.decode('utf-8', errors='replace'))
+
+    def _finish(self, run):
+        run.ended = time.perf_counter()
+        try:
+            with open(run.report_path, 'r', encoding='utf-8') as f:
+                run.cpu_times = json.load(f)
+            os.remove(run.report_path)
+        except (OSError, ValueError):
+            run.cpu_times = None
+        if run in self.active:
+            self.active.remove(run)
+        self.run_changed.emit(run)
+        self._start_queued()
+
+    def _process_error(self, run, error):
+        if error == QProcess.ProcessError.FailedToStart:
+            run.state = FAILED
+            run.error = f"Could not start {run.process.program()}"
+            self.output_received.emit(run, run.error + "\n")
+            self._finish(run)
+
+    def _process_finished(self, run, exit_code):
+        run.exit_code = exit_code
+        if run.state != STOPPED:
+            run.state = FINISHED if exit_code == 0 else FAILED
+        self._finish(run)
@@ -0,0 +1,88 @@
+"""
+Session snapshots: open tabs, positions, root folder and context files
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from ..utils.file_utils import get_app_data_dir
+
+logger = logging.getLogger(__name__)
+
+SESSION_VERSION = 1
+SECRET_SETTINGS = ("groq_api_key",)
+
+
+def strip_secrets(model_settings):
+    return {key: value for key, value in model_settings.items() if key not in SECRET_SETTINGS}
+
+
+class SessionStore:
+    """Reads and writes the session file; writes happen on a background thread"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_app_data_dir(), "session.json")
+        self.lock = threading.Lock()
+        self.pending = None
+        self.writer = None
+        self.last_written = None
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                session = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(session, dict) or session.get("version") != SESSION_VERSION:
+            return None
+        return session
+
+    def _write(self, data):
+        if data == self.last_written:
+            return
+        directory = os.path.dirname(self.path)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".session.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, self.path)
+            self.last_written = data
+        except OSError as e:
+            logger.error(f"Error writing session file: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def _drain(self):
+        while True:
+            with self.lock:
+                data = self.pending
+                self.pending = None
+                if data is None:
+                    self.writer = None
+                    return
+            self._write(data)
+
+    def save_async(self, session):
+        session = dict(session, version=SESSION_VERSION)
+        data = json.dumps(session, separators=(',', ':'))
+        with self.lock:
+            self.pending = data
+            if self.writer is not None:
+                return
+            self.writer = threading.Thread(target=self._drain, daemon=True)
+            self.writer.start()
+
+    def save(self, session):
+        session = dict(session, version=SESSION_VERSION)
+        data = json.dumps(session, separators=(',', ':'))
+        with self.lock:
+            self.pending = None
+            writer = self.writer
+        if writer is not None:
+            writer.join()
+        self._write(data)
@@ -0,0 +1,187 @@
+"""
+Per-request LLM telemetry, appended to a rolling JSON-lines metrics file
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from ..utils.file_utils import get_app_data_dir
+
+logger = logging.getLogger(__name__)
+
+METRICS_FILE = "llm_metrics.jsonl"
+MAX_METRICS_BYTES = 2 * 1024 * 1024
+METRICS_BACKUPS = 3
+CHARS_PER_TOKEN = 4
+
+
+def _ms(start, end):
+    if start is None or end is None:
+        return None
+    return round((end - start) * 1000, 1)
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return None
+    rank = min(len(values) - 1, max(0, int(round(pct / 100.0 * (len(values) - 1)))))
+    return values[rank]
+
+
+class RequestMetrics:
+    """Timestamps (perf_counter) and sizes of one AIModelWorker request"""
+
+    def __init__(self):
+        self.created = time.time()
+        self.queued = time.perf_counter()
+        self.provider = None
+        self.model = None
+        self.started = None
+        self.client_ready = None
+        self.stream_started = None
+        self.first_chunk = None
+        self.first_token = None
+        self.stream_finished = None
+        self.finished = None
+        self.parse_seconds = None
+        self.prompt_chars = 0
+        self.completion_chars = 0
+        self.prompt_tokens = None
+        self.completion_tokens = None
+        self.hedged = False
+
+    def start(self, provider, model):
+        self.provider = provider
+        self.model = model
+        self.started = time.perf_counter()
+
+    def chunk_received(self, text, usage=None):
+        now = time.perf_counter()
+        if self.first_chunk is None:
+            self.first_chunk = now
+        if text and self.first_token is None:
+            self.first_token = now
+        self.completion_chars += len(text)
+        if usage:
+            self.prompt_tokens = usage.get('input_tokens', self.prompt_tokens)
+            self.completion_tokens = usage.get('output_tokens', self.completion_tokens)
+
+    def to_record(self):
+        estimated = self.completion_tokens is None or self.prompt_tokens is None
+        prompt_tokens = self.prompt_tokens if self.prompt_tokens is not None else self.prompt_chars // CHARS_PER_TOKEN
+        completion_tokens = (self.completion_tokens if self.completion_tokens is not None
+                             else self.completion_chars // CHARS_PER_TOKEN)
+
+        generation = None
+        if self.first_token is not None and self.stream_finished is not None:
+            generation = self.stream_finished - self.first_token
+        tokens_per_second = round(completion_tokens / generation, 1) if generation else None
+
+        return {
+            'time': self.created,
+            'provider': self.provider,
+            'model': self.model,
+            'outcome': 'ok' if self.stream_finished is not None else 'error',
+            'hedged': self.hedged,
+            'queue_ms': _ms(self.queued, self.started),
+            'setup_ms': _ms(self.started, self.client_ready),
+            'connect_ms': _ms(self.stream_started, self.first_chunk),
+            'ttft_ms': _ms(self.stream_started, self.first_token),
+            'total_ms': _ms(self.started, self.finished),
+            'tokens_per_second': tokens_per_second,
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'tokens_estimated': estimated,
+            'parse_ms': round(self.parse_seconds * 1000, 1) if self.parse_seconds is not None else None,
+        }
+
+
+class MetricsStore:
+    """Appends request records to a size-capped JSON-lines file, rotating into numbered backups"""
+
+    def __init__(self, path=None, max_bytes=MAX_METRICS_BYTES, backups=METRICS_BACKUPS):
+        self._path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.lock = threading.Lock()
+
+    @property
+    def path(self):
+        if self._path is None:
+            self._path = os.path.join(get_app_data_dir(), METRICS_FILE)
+        return self._path
+
+    def _rotate(self):
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def append(self, record):
+        line = json.dumps(record, separators=(',', ':')) + "\n"
+        with self.lock:
+            try:
+                if os.path.exists(self.path) and os.path.getsize(self.path) + len(line) > self.max_bytes:
+                    self._rotate()
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+            except OSError as e:
+                logger.error(f"Error writing LLM metrics: {str(e)}")
+
+    def load(self):
+        """All stored records, oldest first"""
+        paths = [f"{self.path}.{index}" for index in range(self.backups, 0, -1)] + [self.path]
+        records = []
+        with self.lock:
+            for path in paths:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        for line in f:
+                            try:
+                                records.append(json.loads(line))
+                            except ValueError:
+                                continue
+                except OSError:
+                    continue
+        return records
+
+
+def summarize(records):
+    """Per-model summary: {model: {...}} with counts, latency percentiles and average token counts"""
+    by_model = {}
+    for record in records:
+        by_model.setdefault((record.get('provider'), record.get('model')), []).append(record)
+
+    summary = {}
+    for (provider, model), entries in by_model.items():
+        ok = [entry for entry in entries if entry.get('outcome') == 'ok']
+
+        def values(key):
+            return [entry[key] for entry in ok if entry.get(key) is not None]
+
+        ttft = values('ttft_ms')
+        total = values('total_ms')
+        rate = values('tokens_per_second')
+        summary[f"{model} ({provider})"] = {
+            'requests': len(entries),
+            'errors': len(entries) - len(ok),
+            'ttft_p50': _percentile(ttft, 50),
+            'ttft_p90': _percentile(ttft, 90),
+            'ttft_p99': _percentile(ttft, 99),
+            'total_p50': _percentile(total, 50),
+            'total_p90': _percentile(total, 90),
+            'tokens_per_second_p50': _percentile(rate, 50),
+            'queue_p50': _percentile(values('queue_ms'), 50),
+            'parse_p50': _percentile(values('parse_ms'), 50),
+            'prompt_tokens_avg': sum(values('prompt_tokens')) / len(ok) if ok else None,
+            'completion_tokens_avg': sum(values('completion_tokens')) / len(ok) if ok else None,
+        }
+    return summary
+
+
+metrics_store = MetricsStore()
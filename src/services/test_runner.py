@@ -0,0 +1,336 @@
+"""
+Test discovery and sharded test runs. utils/test_worker.py collects and runs
+the tests in the project's interpreter; runs are split across several worker
+processes, balanced by the durations recorded on earlier runs.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+
+from PyQt6.QtCore import QObject, QProcess, QThread, pyqtSignal
+
+from .import_graph import ImportGraph, source_snapshot, changed_files
+from .profiler import default_interpreter
+from ..utils.file_utils import get_app_data_dir
+
+logger = logging.getLogger(__name__)
+
+TEST_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  "utils", "test_worker.py")
+MARKER = "@@parviz-test "
+DURATIONS_FILE = "test_durations.json"
+DEFAULT_DURATION = 0.1
+DEFAULT_WORKERS = max(1, min(8, (os.cpu_count() or 2) // 2))
+
+PASSED = "passed"
+FAILED = "failed"
+ERROR = "error"
+SKIPPED = "skipped"
+
+
+class TestItem:
+    def __init__(self, test_id, path, line):
+        self.id = test_id
+        self.path = path
+        self.line = line
+        self.outcome = None
+        self.duration = None
+        self.message = ""
+
+
+class DurationStore:
+    """Per-test durations of the last run, per root folder"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_app_data_dir(), DURATIONS_FILE)
+        self.data = None
+
+    def _load(self):
+        if self.data is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError):
+                self.data = {}
+        return self.data
+
+    def for_root(self, root):
+        return self._load().setdefault(os.path.abspath(root), {})
+
+    def save(self):
+        if self.data is None:
+            return
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=".durations.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"Error writing test durations: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+
+def shard_tests(test_ids, durations, workers):
+    """
+    Splits test_ids into at most workers lists of similar total duration:
+    longest tests first, each onto the currently lightest shard. Tests
+    without a recorded duration count as the median of the known ones.
+    """
+    known = sorted(durations[test_id] for test_id in test_ids if test_id in durations)
+    fallback = known[len(known) // 2] if known else DEFAULT_DURATION
+    ordered = sorted(test_ids, key=lambda test_id: durations.get(test_id, fallback), reverse=True)
+
+    shards = [[] for _ in range(max(1, min(workers, len(ordered))))]
+    loads = [0.0] * len(shards)
+    for test_id in ordered:
+        lightest = loads.index(min(loads))
+        shards[lightest].append(test_id)
+        loads[lightest] += durations.get(test_id, fallback)
+    return [shard for shard in shards if shard]
+
+
+class _WorkerProcess:
+    def __init__(self, process, ids_path=None):
+        self.process = process
+        self.ids_path = ids_path
+        self.buffer = ""
+
+
+class SourceScanner(QThread):
+    """
+    Takes an mtime snapshot of the root's Python files and, given the
+    snapshot of the previous run, the files whose tests may be affected
+    since: the changed files plus everything importing them.
+    """
+
+    scanned = pyqtSignal(object, object)
+
+    def __init__(self, root, graph, previous=None):
+        super().__init__()
+        self.root = root
+        self.graph = graph
+        self.previous = previous
+
+    def run(self):
+        affected = None
+        try:
+            snapshot = source_snapshot(self.root)
+            if self.previous is not None:
+                changed = changed_files(self.previous, snapshot)
+                self.graph.build(snapshot)
+                affected = self.graph.dependents(changed)
+                # conftest.py changes reach every test below its folder
+                for path in changed:
+                    if os.path.basename(path) == 'conftest.py':
+                        folder = os.path.dirname(path) + os.sep
+                        affected.update(other for other in snapshot if other.startswith(folder))
+        except Exception as e:
+            logger.error(f"Error scanning {self.root} for changes: {str(e)}")
+            snapshot = {}
+        self.scanned.emit(snapshot, affected)
+
+
+class TestRunner(QObject):
+    discovered = pyqtSignal(object, str)
+    result_received = pyqtSignal(object)
+    output_received = pyqtSignal(str)
+    run_finished = pyqtSignal(object)
+    affected_found = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = None
+        self.interpreter = None
+        self.framework = None
+        self.tests = {}
+        self.workers = []
+        self.discovering = False
+        self.durations = DurationStore()
+        self.graph = ImportGraph()
+        self.snapshot = None
+        self.scanners = []
+        self.run_started = None
+        self.run_ids = []
+        self.counts = {}
+        self.stopped = False
+
+    def is_running(self):
+        return bool(self.workers)
+
+    def set_root(self, root, interpreter=None):
+        root = os.path.abspath(root)
+        if root != self.root:
+            self.root = root
+            self.tests = {}
+            self.framework = None
+            self.snapshot = None
+            self.graph = ImportGraph()
+        self.interpreter = interpreter or default_interpreter()
+
+    def failed_ids(self):
+        return [test.id for test in self.tests.values() if test.outcome in (FAILED, ERROR)]
+
+    def _start_worker(self, arguments, ids_path=None):
+        process = QProcess(self)
+        process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        process.setWorkingDirectory(self.root)
+        worker = _WorkerProcess(process, ids_path)
+        process.readyReadStandardOutput.connect(lambda: self._read_output(worker))
+        process.finished.connect(lambda exit_code, exit_status: self._worker_finished(worker, exit_code))
+        process.errorOccurred.connect(lambda error: self._worker_error(worker, error))
+        self.workers.append(worker)
+        process.start(self.interpreter, [TEST_WORKER_SCRIPT] + arguments)
+        return worker
+
+    def discover(self):
+        if self.is_running():
+            return False
+        self.discovering = True
+        self.stopped = False
+        self.tests = {}
+        self.framework = None
+        self.output_received.emit(f"$ {self.interpreter} {TEST_WORKER_SCRIPT} collect {self.root}\n")
+        self._start_worker(["collect", self.root])
+        return True
+
+    def run(self, test_ids=None, workers=DEFAULT_WORKERS):
+        """Runs test_ids (all discovered tests by default) across workers processes"""
+        if self.is_running() or self.framework is None:
+            return False
+        test_ids = list(self.tests) if test_ids is None else [test_id for test_id in test_ids if test_id in self.tests]
+        if not test_ids:
+            return False
+
+        self.discovering = False
+        self.stopped = False
+        self.run_ids = test_ids
+        self.counts = {}
+        self.run_started = time.perf_counter()
+        for test_id in test_ids:
+            test = self.tests[test_id]
+            test.outcome, test.duration, test.message = None, None, ""
+        # Record the sources as they are when the run starts; later edits count as changes
+        self._scan(None)
+
+        ids_dir = get_app_data_dir("tests")
+        shards = shard_tests(test_ids, self.durations.for_root(self.root), workers)
+        self.output_received.emit(f"Running {len(test_ids)} tests in {len(shards)} worker processes\n")
+        for index, shard in enumerate(shards):
+            ids_path = os.path.join(ids_dir, f"ids-{os.getpid()}-{index}.txt")
+            with open(ids_path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(shard))
+            self._start_worker(["run", self.root, self.framework, ids_path], ids_path)
+        return True
+
+    def find_affected(self):
+        """Emits affected_found with the ids of tests affected by changes since the last run (None if unknown)"""
+        if self.snapshot is None:
+            self.affected_found.emit(None)
+            return
+        self._scan(self.snapshot)
+
+    def _scan(self, previous):
+        scanner = SourceScanner(self.root, self.graph, previous)
+        scanner.scanned.connect(lambda snapshot, affected: self._scanned(scanner, previous, snapshot, affected))
+        self.scanners.append(scanner)
+        scanner.start()
+
+    def _scanned(self, scanner, previous, snapshot, affected):
+        scanner.wait()
+        self.scanners.remove(scanner)
+        if previous is None:
+            self.snapshot = snapshot
+            return
+        ids = [test.id for test in self.tests.values() if test.path in affected]
+        self.affected_found.emit(ids)
+
+    def stop(self):
+        self.stopped = True
+        for worker in list(self.workers):
+            worker.process.kill()
+        for scanner in self.scanners:
+            scanner.wait()
+
+    def _read_output(self, worker):
+        data = worker.process.readAllStandardOutput().data().decode('utf-8', errors='replace')
+        lines = (worker.buffer + data).split("\n")
+        worker.buffer = lines.pop()
+        self._handle_lines(lines)
+
+    def _handle_lines(self, lines):
+        output = []
+        for line in lines:
+            if line.startswith(MARKER):
+                try:
+                    self._handle_message(json.loads(line[len(MARKER):]))
+                except ValueError:
+                    output.append(line)
+            elif line:
+                output.append(line)
+        if output:
+            self.output_received.emit("\n".join(output) + "\n")
+
+    def _handle_message(self, message):
+        event = message.get('event')
+        if event == 'framework':
+            self.framework = message.get('name')
+        elif event == 'test':
+            test_id = message.get('id', '')
+            path = message.get('file') or ""
+            self.tests[test_id] = TestItem(test_id, os.path.normpath(path) if path else "", message.get('line', 0))
+        elif event == 'result':
+            test = self.tests.get(message.get('id'))
+            if test is None:
+                return
+            test.outcome = message.get('outcome')
+            test.duration = message.get('duration', 0.0)
+            test.message = message.get('message', "")
+            self.counts[test.outcome] = self.counts.get(test.outcome, 0) + 1
+            self.durations.for_root(self.root)[test.id] = test.duration
+            self.result_received.emit(test)
+
+    def _worker_error(self, worker, error):
+        if error == QProcess.ProcessError.FailedToStart:
+            self.output_received.emit(f"Could not start {self.interpreter}\n")
+            self._worker_finished(worker, -1)
+
+    def _worker_finished(self, worker, exit_code):
+        if worker not in self.workers:
+            return
+        self.workers.remove(worker)
+        if worker.buffer:
+            self._handle_lines([worker.buffer])
+            worker.buffer = ""
+        if worker.ids_path:
+            try:
+                os.remove(worker.ids_path)
+            except OSError:
+                pass
+        if self.workers:
+            return
+
+        if self.discovering:
+            self.discovering = False
+            error = ""
+            if self.stopped:
+                error = "Discovery stopped"
+            elif exit_code != 0 or self.framework is None:
+                error = f"Test discovery failed (exit code {exit_code}), see the output"
+            self.discovered.emit(list(self.tests.values()), error)
+            return
+
+        self.durations.save()
+        # Tests a crashed or stopped worker never reported
+        not_run = [test_id for test_id in self.run_ids if self.tests[test_id].outcome is None]
+        self.run_finished.emit({
+            'counts': dict(self.counts),
+            'not_run': len(not_run),
+            'wall_time': time.perf_counter() - self.run_started,
+            'stopped': self.stopped,
+        })
@@ -1,6 +1,9 @@
-from PyQt6.QtWidgets import QTextEdit
-from PyQt6.QtGui import QFont
-from PyQt6.QtCore import Qt 
+from PyQt6.QtWidgets import QTextEdit, QToolTip
+from PyQt6.QtGui import QFont, QTextCursor, QColor, QTextFormat
+from PyQt6.QtCore import Qt, QPoint, QEvent
+
+MAX_HEAT_LINES = 500
+MIN_HEAT_FRACTION = 0.01
 
 class CodeEditor(QTextEdit):
     def __init__(self, parent=None):
@@ -51,7 +54,111 @@ class CodeEditor(QTextEdit):
             super().keyPressEvent(event)
         else:
             super().keyPressEvent(event)
+
+    def apply_hunks(self, hunks):
+        """
+        Applies line hunks (see utils.patching) to the document as a single
+        undoable edit, keeping the cursor and scroll position on the same text.
+        """
+        if not hunks:
+            return
+        
+        document = self.document()
+        old_cursor = self.textCursor()
+        cursor_line = old_cursor.blockNumber()
+        cursor_column = old_cursor.positionInBlock()
+        top_line = self.cursorForPosition(QPoint(0, 0)).blockNumber()
+        scroll_value = self.verticalScrollBar().value()
+        horizontal_value = self.horizontalScrollBar().value()
+        line_height = self.fontMetrics().lineSpacing()
+        
+        def line_start(line):
+            if line >= document.blockCount():
+                return document.characterCount() - 1
+            return document.findBlockByNumber(line).position()
         
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        for hunk in sorted(hunks, key=lambda h: h.start, reverse=True):
+            start = line_start(hunk.start)
+            end = line_start(hunk.end)
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+            cursor.insertText("".join(hunk.lines))
+        cursor.endEditBlock()
         
+        def shifted(line):
+            new_line = line
+            for hunk in hunks:
+                if hunk.end <= line:
+                    new_line += hunk.line_delta()
+                elif hunk.start <= line:
+                    return hunk.start + (new_line - line), True
+            return new_line, False
         
+        new_cursor_line, inside_hunk = shifted(cursor_line)
+        new_top_line, _ = shifted(top_line)
+        
+        block = document.findBlockByNumber(min(new_cursor_line, document.blockCount() - 1))
+        restored = QTextCursor(block)
+        if not inside_hunk:
+            restored.setPosition(block.position() + min(cursor_column, block.length() - 1))
+        self.setTextCursor(restored)
+        
+        self.verticalScrollBar().setValue(scroll_value + (new_top_line - top_line) * line_height)
+        self.horizontalScrollBar().setValue(horizontal_value)
+
+
+class LineNumberGutter(QTextEdit):
+    """Line number column that can shade lines by their share of a line-timing run"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.heat = {}
+        self.total_time = 0.0
+
+    def set_heat(self, heat):
+        """heat: {line: (hits, seconds)} or None to clear"""
+        if not heat and not self.heat:
+            return
+        self.heat = heat or {}
+        self.total_time = sum(seconds for _, seconds in self.heat.values())
+        self.apply_heat()
+
+    def apply_heat(self):
+        """Re-applies the shading; needed after the gutter text is replaced"""
+        if not self.heat:
+            self.setExtraSelections([])
+            return
         
+        hottest = sorted(self.heat.items(), key=lambda item: item[1][1], reverse=True)[:MAX_HEAT_LINES]
+        max_seconds = hottest[0][1][1] if hottest else 0.0
+        document = self.document()
+        selections = []
+        for line, (hits, seconds) in hottest:
+            fraction = seconds / max_seconds if max_seconds else 0.0
+            if fraction < MIN_HEAT_FRACTION:
+                break
+            block = document.findBlockByNumber(line - 1)
+            if not block.isValid():
+                continue
+            selection = QTextEdit.ExtraSelection()
+            selection.cursor = QTextCursor(block)
+            selection.format.setBackground(QColor(255, 96, 0, int(40 + 180 * fraction)))
+            selection.format.setProperty(QTextFormat.Property.FullWidthSelection, True)
+            selections.append(selection)
+        self.setExtraSelections(selections)
+
+    def viewportEvent(self, event):
+        if event.type() == QEvent.Type.ToolTip and self.heat:
+            line = self.cursorForPosition(event.pos()).blockNumber() + 1
+            timing = self.heat.get(line)
+            if timing:
+                hits, seconds = timing
+                share = seconds / self.total_time * 100 if self.total_time else 0.0
+                QToolTip.showText(event.globalPos(),
+                                  f"Line {line}: {hits} hits, {seconds * 1000:.2f} ms ({share:.1f}%)", self)
+            else:
+                QToolTip.hideText()
+            return True
+        return super().viewportEvent(event)
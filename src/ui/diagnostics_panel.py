@@ -0,0 +1,107 @@
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QAbstractItemView, QListWidget, QPlainTextEdit, QPushButton,
+                             QLabel, QSplitter)
+
+from ..utils.diagnostics import timing_registry
+
+TIMING_HEADERS = ["Handler", "Calls", "Mean (ms)", "p50 (ms)", "p95 (ms)", "Max (ms)"]
+
+
+class DiagnosticsDialog(QDialog):
+    """Handler timing histograms and captured event-loop stalls"""
+
+    def __init__(self, watchdog, parent=None):
+        super().__init__(parent)
+        self.watchdog = watchdog
+        self.setWindowTitle("Diagnostics")
+        self.resize(900, 650)
+
+        layout = QVBoxLayout(self)
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        layout.addWidget(splitter)
+
+        self.timing_table = QTableWidget(0, len(TIMING_HEADERS))
+        self.timing_table.setHorizontalHeaderLabels(TIMING_HEADERS)
+        self.timing_table.verticalHeader().hide()
+        self.timing_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.timing_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.timing_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        splitter.addWidget(self.timing_table)
+
+        stalls_widget = QSplitter(Qt.Orientation.Horizontal)
+        self.stall_list = QListWidget()
+        self.stall_list.currentRowChanged.connect(self.show_stall)
+        stalls_widget.addWidget(self.stall_list)
+
+        self.stack_view = QPlainTextEdit()
+        self.stack_view.setReadOnly(True)
+        self.stack_view.setFont(QFont('Consolas', 9))
+        self.stack_view.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        stalls_widget.addWidget(self.stack_view)
+        stalls_widget.setSizes([300, 600])
+        splitter.addWidget(stalls_widget)
+
+        button_layout = QHBoxLayout()
+        self.summary_label = QLabel("")
+        button_layout.addWidget(self.summary_label)
+        button_layout.addStretch()
+
+        reset_btn = QPushButton("Reset Timings")
+        reset_btn.clicked.connect(self.reset_timings)
+        button_layout.addWidget(reset_btn)
+
+        export_btn = QPushButton("Export to Log")
+        export_btn.clicked.connect(self.export_to_log)
+        button_layout.addWidget(export_btn)
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+        self.stalls = []
+        self.refresh()
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(1000)
+
+    def refresh(self):
+        rows = timing_registry.snapshot()
+        self.timing_table.setRowCount(len(rows))
+        for row, (name, count, mean, p50, p95, maximum) in enumerate(rows):
+            values = [name, str(count), f"{mean:.1f}", f"{p50:.1f}", f"{p95:.1f}", f"{maximum:.1f}"]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.timing_table.setItem(row, column, item)
+
+        stalls = self.watchdog.recent_stalls()
+        selected = self.stall_list.currentRow()
+        summaries = [stall.summary() for stall in reversed(stalls)]
+        if summaries != [self.stall_list.item(i).text() for i in range(self.stall_list.count())]:
+            self.stalls = list(reversed(stalls))
+            self.stall_list.clear()
+            self.stall_list.addItems(summaries)
+            if 0 <= selected < len(summaries):
+                self.stall_list.setCurrentRow(selected)
+
+        self.summary_label.setText(
+            f"{len(stalls)} stalls over {self.watchdog.threshold * 1000:.0f} ms since startup"
+        )
+
+    def show_stall(self, row):
+        if 0 <= row < len(self.stalls):
+            self.stack_view.setPlainText("".join(self.stalls[row].stack) or "No stack captured")
+        else:
+            self.stack_view.clear()
+
+    def reset_timings(self):
+        timing_registry.reset()
+        self.refresh()
+
+    def export_to_log(self):
+        self.watchdog.export_to_log()
+        self.summary_label.setText("Diagnostics written to the log")
@@ -0,0 +1,225 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant, QThread, pyqtSignal
+from PyQt6.QtGui import QColor, QFont
+from PyQt6.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+from bisect import bisect_right
+from collections import OrderedDict
+import logging
+
+from ..utils.line_diff import diff_opcodes
+from ..utils.patching import merge_hunks
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_LINES = 3
+DIFF_CACHE_ENTRIES = 16
+DIFF_CACHE_LINES = 1000000
+
+EQUAL_ROW = "equal"
+DELETE_ROW = "delete"
+INSERT_ROW = "insert"
+REPLACE_ROW = "replace"
+SKIP_ROW = "skip"
+
+ROW_COLORS = {
+    DELETE_ROW: (QColor("#4B1818"), QColor("#1E1E1E")),
+    INSERT_ROW: (QColor("#1E1E1E"), QColor("#1E3A1E")),
+    REPLACE_ROW: (QColor("#4B1818"), QColor("#1E3A1E")),
+    SKIP_ROW: (QColor("#252526"), QColor("#252526")),
+}
+
+
+class DiffResult:
+    """
+    Side-by-side diff rows, produced on demand. Only the row count per
+    segment is stored; the row text is looked up when the view asks for it.
+    """
+
+    def __init__(self, original_content, new_content, context=CONTEXT_LINES):
+        self.original_lines = original_content.splitlines()
+        self.new_lines = new_content.splitlines()
+        self.segments = []
+        self.row_starts = []
+        self.row_count = 0
+        self.changed_lines = 0
+        self._build_segments(diff_opcodes(self.original_lines, self.new_lines), context)
+
+    def _add_segment(self, kind, i1, i2, j1, j2, rows):
+        if rows <= 0:
+            return
+        self.row_starts.append(self.row_count)
+        self.segments.append((kind, i1, i2, j1, j2))
+        self.row_count += rows
+
+    def _build_segments(self, opcodes, context):
+        last = len(opcodes) - 1
+        for position, (tag, i1, i2, j1, j2) in enumerate(opcodes):
+            if tag != 'equal':
+                self.changed_lines += max(i2 - i1, j2 - j1)
+                self._add_segment(tag, i1, i2, j1, j2, max(i2 - i1, j2 - j1))
+                continue
+
+            keep_before = context if position > 0 else 0
+            keep_after = context if position < last else 0
+            length = i2 - i1
+            if length <= keep_before + keep_after + 1:
+                self._add_segment(EQUAL_ROW, i1, i2, j1, j2, length)
+                continue
+
+            self._add_segment(EQUAL_ROW, i1, i1 + keep_before, j1, j1 + keep_before, keep_before)
+            self._add_segment(SKIP_ROW, i1 + keep_before, i2 - keep_after, j1 + keep_before, j2 - keep_after, 1)
+            self._add_segment(EQUAL_ROW, i2 - keep_after, i2, j2 - keep_after, j2, keep_after)
+
+    def row(self, row):
+        """Returns (kind, old_number, old_text, new_number, new_text)"""
+        segment_index = bisect_right(self.row_starts, row) - 1
+        kind, i1, i2, j1, j2 = self.segments[segment_index]
+        offset = row - self.row_starts[segment_index]
+
+        if kind == SKIP_ROW:
+            return SKIP_ROW, None, f"⋯ {i2 - i1} unchanged lines", None, ""
+
+        old_number = old_text = new_number = new_text = None
+        if i1 + offset < i2:
+            old_number = i1 + offset + 1
+            old_text = self.original_lines[i1 + offset]
+        if j1 + offset < j2:
+            new_number = j1 + offset + 1
+            new_text = self.new_lines[j1 + offset]
+        return kind, old_number, old_text, new_number, new_text
+
+
+class DiffTableModel(QAbstractTableModel):
+    headers = ['', 'Original', '', 'Modified']
+
+    def __init__(self, diff_result, parent=None):
+        super().__init__(parent)
+        self.diff = diff_result
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.diff.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 4
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+
+        kind, old_number, old_text, new_number, new_text = self.diff.row(index.row())
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = (old_number, old_text, new_number, new_text)[column]
+            return "" if value is None else str(value)
+        if role == Qt.ItemDataRole.BackgroundRole and kind in ROW_COLORS:
+            return ROW_COLORS[kind][0 if column < 2 else 1]
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if column in (0, 2) or kind == SKIP_ROW:
+                return QColor("#6D6D6D")
+            return QColor("#D4D4D4")
+        if role == Qt.ItemDataRole.TextAlignmentRole and column in (0, 2):
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return QVariant()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.headers[section]
+        return QVariant()
+
+
+class DiffCache:
+    """Recently computed diffs, least recently used dropped first; bounded in entries and in lines held"""
+
+    def __init__(self, max_entries=DIFF_CACHE_ENTRIES, max_lines=DIFF_CACHE_LINES):
+        self.max_entries = max_entries
+        self.max_lines = max_lines
+        self.entries = OrderedDict()
+        self.lines = 0
+
+    @staticmethod
+    def _size(result):
+        return len(result.original_lines) + len(result.new_lines)
+
+    def get(self, key):
+        result = self.entries.get(key)
+        if result is not None:
+            self.entries.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.lines -= self._size(previous)
+        self.entries[key] = result
+        self.lines += self._size(result)
+        while len(self.entries) > 1 and (len(self.entries) > self.max_entries or self.lines > self.max_lines):
+            _, dropped = self.entries.popitem(last=False)
+            self.lines -= self._size(dropped)
+
+
+class DiffWorker(QThread):
+    diff_ready = pyqtSignal(str, object)
+
+    def __init__(self, filename, original_content, new_content):
+        super().__init__()
+        self.filename = filename
+        self.original_content = original_content
+        self.new_content = new_content
+
+    def run(self):
+        try:
+            result = DiffResult(self.original_content, self.new_content)
+        except Exception as e:
+            logger.error(f"Error computing diff for {self.filename}: {str(e)}")
+            result = None
+        self.diff_ready.emit(self.filename, result)
+
+
+class MergeWorker(QThread):
+    """Runs merge_hunks(base, current, suggested) for documents too large to merge on the GUI thread"""
+    merged = pyqtSignal(object, object)
+
+    def __init__(self, base, current, suggested):
+        super().__init__()
+        self.base = base
+        self.current = current
+        self.suggested = suggested
+
+    def run(self):
+        try:
+            hunks, conflicts = merge_hunks(self.base, self.current, self.suggested)
+        except Exception as e:
+            logger.error(f"Error merging changes: {str(e)}")
+            hunks, conflicts = None, None
+        self.merged.emit(hunks, conflicts)
+
+
+class DiffView(QTableView):
+    """Side-by-side diff view; rows have a fixed height so only visible rows are laid out"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFont(QFont('Consolas', 10))
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.verticalHeader().hide()
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(self.fontMetrics().lineSpacing() + 2)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.setStyleSheet("QTableView { background-color: #1E1E1E; border: none; }")
+
+    def setModel(self, model):
+        super().setModel(model)
+        if model is None:
+            return
+        header = self.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Fixed)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        self.setColumnWidth(0, 50)
+        self.setColumnWidth(2, 50)
@@ -0,0 +1,101 @@
+import os
+import time
+
+
+class DocumentState:
+    """Everything the IDE knows about one editor tab"""
+
+    def __init__(self, tab, path=None, encoding='utf-8'):
+        self.tab = tab
+        self.path = path
+        self.encoding = encoding
+        self.mtime = None
+        self.editor = None
+        self.line_numbers = None
+        self.highlighter = None
+        self.last_used = 0.0
+        # {line: (hits, seconds)} from the last line-timing run, valid while
+        # the text still hashes to heat_source
+        self.line_heat = None
+        self.heat_source = None
+        # Kept while the tab is a placeholder without editor widgets
+        self.cursor = 0
+        self.scroll = 0
+        self.buffer = None
+        # Set while a reload from disk is being merged in the background
+        self.reloading = False
+
+    @property
+    def materialized(self):
+        return self.editor is not None
+
+    @property
+    def dirty(self):
+        if self.editor is not None:
+            return self.editor.document().isModified()
+        return self.buffer is not None
+
+    @property
+    def title(self):
+        return os.path.basename(self.path) if self.path else "Untitled"
+
+    def touch(self):
+        self.last_used = time.monotonic()
+
+    def update_mtime(self):
+        try:
+            self.mtime = os.path.getmtime(self.path) if self.path else None
+        except OSError:
+            self.mtime = None
+
+    def release_widgets(self):
+        self.editor = None
+        self.line_numbers = None
+        self.highlighter = None
+
+
+def _path_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+class DocumentRegistry:
+    """O(1) lookup of document states by tab widget and by file path"""
+
+    def __init__(self):
+        self.by_tab = {}
+        self.by_path = {}
+
+    def __contains__(self, tab):
+        return tab in self.by_tab
+
+    def __iter__(self):
+        return iter(list(self.by_tab.values()))
+
+    def __len__(self):
+        return len(self.by_tab)
+
+    def add(self, state):
+        self.by_tab[state.tab] = state
+        if state.path:
+            self.by_path[_path_key(state.path)] = state
+        return state
+
+    def get(self, tab):
+        return self.by_tab.get(tab)
+
+    def for_path(self, path):
+        return self.by_path.get(_path_key(path)) if path else None
+
+    def set_path(self, state, path):
+        if state.path and self.by_path.get(_path_key(state.path)) is state:
+            del self.by_path[_path_key(state.path)]
+        state.path = path
+        if path:
+            self.by_path[_path_key(path)] = state
+        state.update_mtime()
+
+    def remove(self, tab):
+        state = self.by_tab.pop(tab, None)
+        if state and state.path and self.by_path.get(_path_key(state.path)) is state:
+            del self.by_path[_path_key(state.path)]
+        return state
@@ -1,6 +1,8 @@
-from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex, QVariant, QDir
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex, QVariant, QDir, QSortFilterProxyModel
 import os
 
+from ..utils.ignore_rules import ignore_rules_cache
+
 class SimpleFileSystemModel(QAbstractItemModel):
     def __init__(self, root_path=''):
         super().__init__()
@@ -11,10 +13,11 @@ class SimpleFileSystemModel(QAbstractItemModel):
         self.refresh()
         
     def refresh(self):
+        self.beginResetModel()
         self.root_dir.refresh()
         self.entries = [entry for entry in self.root_dir.entryList() 
                        if entry not in ['.', '..']]
-        self.layoutChanged.emit()
+        self.endResetModel()
         
     def index(self, row, column, parent=QModelIndex()):
         if not self.hasIndex(row, column, parent):
@@ -59,4 +62,48 @@ class SimpleFileSystemModel(QAbstractItemModel):
         row = index.row()
         if row < len(self.entries):
             return os.path.join(self.root_path, self.entries[row])
-        return "" 
\ No newline at end of file
+        return "" 
+
+
+class IgnoreFilterModel(QSortFilterProxyModel):
+    """
+    Hides what the project's ignore rules exclude. Ignored folders never
+    appear, so the view never expands them and the source model never lists
+    or watches their contents.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root_path = ""
+        self.rules = None
+
+    def set_root(self, folder):
+        self.root_path = os.path.abspath(folder) if folder else ""
+        self.refresh_rules()
+
+    def refresh_rules(self):
+        """Re-reads the ignore files if they changed and filters again"""
+        self.rules = ignore_rules_cache.rules_for(self.root_path) if self.root_path else None
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.rules is None:
+            return True
+        source = self.sourceModel()
+        index = source.index(source_row, 0, source_parent)
+        path = source.filePath(index)
+        if not path:
+            return True
+        path = os.path.abspath(path)
+        # The tree's root and the folders above it stay, even inside an ignored folder
+        if path == self.root_path or self.root_path.startswith(path.rstrip(os.sep) + os.sep):
+            return True
+        relative = self.rules.relative(path)
+        if not relative:
+            return True
+        is_dir = source.isDir(index) if hasattr(source, 'isDir') else os.path.isdir(path)
+        self.rules.add_parents(relative)
+        return not self.rules.matches(relative, is_dir)
+
+    def filePath(self, index):
+        return self.sourceModel().filePath(self.mapToSource(index))
\ No newline at end of file
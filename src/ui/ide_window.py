@@ -3,20 +3,38 @@ from PyQt6.QtWidgets import (QMainWindow, QTextEdit, QVBoxLayout,
                            QMessageBox, QTreeView, QSplitter, QTabWidget,
                            QLineEdit, QLabel, QComboBox, QDialog, QFormLayout,
                            QRadioButton, QGroupBox, QPlainTextEdit, QToolBar,
-                           QSizePolicy, QStatusBar, QMenu, QCheckBox)
+                           QSizePolicy, QStatusBar, QMenu, QCheckBox, QDockWidget)
 from PyQt6.QtGui import (QSyntaxHighlighter, QTextCharFormat, QColor, QFont, 
                        QTextCursor, QIcon, QPixmap, QAction, QTextDocument,
-                       QPainter, QPolygon, QPen, QBrush)
+                       QPainter, QPolygon, QPen, QBrush, QKeySequence)
 from PyQt6.QtCore import (Qt, QAbstractItemModel, QModelIndex, QVariant, QDir, 
                         QThread, pyqtSignal, QProcess, QIODevice, QByteArray, QSize,
-                        QPoint)
+                        QPoint, QTimer)
 from PyQt6.QtWidgets import QColorDialog
+import logging
 import os
 import re
-from .code_editor import CodeEditor
+import time
+import zlib
+from .code_editor import CodeEditor, LineNumberGutter
 from .syntax_highlighter import PythonHighlighter
-from .file_system_model import SimpleFileSystemModel
-from ..services.llm_service import AIModelWorker
+from .file_system_model import SimpleFileSystemModel, IgnoreFilterModel
+from .document_state import DocumentState, DocumentRegistry
+from ..services.ollama_warmup import DEFAULT_KEEP_ALIVE, DEFAULT_OLLAMA_URL
+from ..services.conversation import Conversation
+from ..services.response_parser import ResponseParser, PROSE, FILE
+from ..services.session import SessionStore, strip_secrets
+from ..services.path_index import PathIndex
+from ..utils.ignore_rules import is_ignore_file, user_excludes_path
+from ..utils.patching import compute_hunks, merge_hunks, BACKGROUND_MERGE_LINES
+from ..utils.startup_profile import startup_profiler
+from ..utils.diagnostics import StallWatchdog, timed
+
+logger = logging.getLogger(__name__)
+
+MAX_LIVE_TABS = 8
+IDLE_TAB_SECONDS = 300
+MEMORY_PRESSURE_PERCENT = 90
 
 def get_file_system_model():
     try:
@@ -34,7 +52,7 @@ def get_file_system_model():
                 except ImportError:
                     return None
     except Exception as e:
-        print(f"Error importing QFileSystemModel: {str(e)}")
+        logger.error(f"Error importing QFileSystemModel: {str(e)}")
         return None
 
 class SimpleIDE(QMainWindow):
@@ -45,11 +63,50 @@ class SimpleIDE(QMainWindow):
             "use_groq": True,
             "groq_model": "deepseek-r1-distill-llama-70b",
             "groq_api_key": "",
+            "groq_base_url": "",
             "use_local": False,
-            "local_model": "deepseek-r1:8b"
+            "local_model": "deepseek-r1:8b",
+            "keep_alive": DEFAULT_KEEP_ALIVE,
+            "ollama_base_url": DEFAULT_OLLAMA_URL,
+            "hedge_requests": False,
+            "hedge_model": "llama-3.3-70b-versatile",
+            "conversation_mode": False
         }
-        self.initUI()
+        self.conversation = Conversation()
+        self.diff_cache = None
+        self.diff_workers = set()
+        # Editor text when the last question was asked, per tab
+        self.suggestion_bases = {}
+        self.merge_workers = set()
+        self.documents = DocumentRegistry()
+        self.session_store = SessionStore()
+        self.context_files = []
         self.chat_history = []
+        # Built in idle-time slices after the editor is shown
+        self.file_tree = None
+        self.file_model = None
+        self.file_filter = None
+        self.using_qt_model = False
+        self.pending_root_folder = None
+        self.chat_display = None
+        self.file_list = None
+        self.session_timer = None
+        self.provider_preloaders = {}
+        self.warmup_worker = None
+        self.warmup_pending = False
+        self.profiler_dock = None
+        self.profiler_panel = None
+        self.memory_dock = None
+        self.memory_panel = None
+        self.runs_dock = None
+        self.run_panel = None
+        self.tests_dock = None
+        self.test_panel = None
+        self.path_index = PathIndex(self)
+        self.quick_open_dialog = None
+        self.watchdog = StallWatchdog(self)
+        self.initUI()
+        self.watchdog.start()
         
     def initUI(self):
         self.setWindowTitle('Parviz Mind IDE')
@@ -59,7 +116,7 @@ class SimpleIDE(QMainWindow):
             app_icon = QIcon("D:/deep_learning/chatbot/Editor/src/ui/icons/app.ico")
             self.setWindowIcon(app_icon)
         except Exception as e:
-            print(f"Error setting application icon: {str(e)}")
+            logger.error(f"Error setting application icon: {str(e)}")
 
         toolbar = QToolBar("Main Toolbar")
         toolbar.setMovable(False)
@@ -353,6 +410,15 @@ class SimpleIDE(QMainWindow):
         open_action.triggered.connect(self.open_file)
         file_menu.addAction(open_action)
         
+        go_to_file_action = QAction("Go to File...", self)
+        go_to_file_action.setShortcut(QKeySequence("Ctrl+P"))
+        go_to_file_action.triggered.connect(self.show_go_to_file)
+        file_menu.addAction(go_to_file_action)
+        
+        excluded_files_action = QAction("Excluded Files...", self)
+        excluded_files_action.triggered.connect(self.edit_excluded_files)
+        file_menu.addAction(excluded_files_action)
+        
         file_menu.addSeparator()
         
         save_action = QAction("Save", self)
@@ -379,6 +445,12 @@ class SimpleIDE(QMainWindow):
         
         edit_menu.addSeparator()
         
+        undo_change_set_action = QAction("Undo Last AI Change Set", self)
+        undo_change_set_action.triggered.connect(self.undo_last_change_set)
+        edit_menu.addAction(undo_change_set_action)
+        
+        edit_menu.addSeparator()
+        
         find_replace_action = QAction("Find/Replace", self)
         find_replace_action.triggered.connect(self.show_find_replace_dialog)
         edit_menu.addAction(find_replace_action)
@@ -415,6 +487,28 @@ class SimpleIDE(QMainWindow):
         run_code_action.triggered.connect(self.run_code)
         run_menu.addAction(run_code_action)
         
+        run_profiler_action = QAction("Run with Profiler", self)
+        run_profiler_action.triggered.connect(self.run_with_profiler)
+        run_menu.addAction(run_profiler_action)
+        
+        run_line_timing_action = QAction("Run with Line Timing", self)
+        run_line_timing_action.triggered.connect(self.run_with_line_timing)
+        run_menu.addAction(run_line_timing_action)
+        
+        run_memory_action = QAction("Run with Memory Profiler", self)
+        run_memory_action.triggered.connect(self.run_with_memory_profiler)
+        run_menu.addAction(run_memory_action)
+        
+        run_menu.addSeparator()
+        
+        run_configurations_action = QAction("Run Configurations", self)
+        run_configurations_action.triggered.connect(self.show_run_configurations)
+        run_menu.addAction(run_configurations_action)
+        
+        test_runner_action = QAction("Test Runner", self)
+        test_runner_action.triggered.connect(self.show_test_runner)
+        run_menu.addAction(test_runner_action)
+        
         terminal_menu = self.main_menu.addMenu("Terminal")
         
         new_terminal_action = QAction("New Terminal", self)
@@ -428,6 +522,10 @@ class SimpleIDE(QMainWindow):
         llm_settings_action.triggered.connect(self.show_settings_dialog)
         settings_menu.addAction(llm_settings_action)
         
+        llm_stats_action = QAction("AI Request Statistics", self)
+        llm_stats_action.triggered.connect(self.show_llm_stats)
+        settings_menu.addAction(llm_stats_action)
+        
         theme_settings_action = QAction("Theme Settings", self)
         theme_settings_action.triggered.connect(self.show_theme_settings)
         settings_menu.addAction(theme_settings_action)
@@ -440,6 +538,10 @@ class SimpleIDE(QMainWindow):
         
         help_menu = self.main_menu.addMenu("Help")
         
+        diagnostics_action = QAction("Diagnostics", self)
+        diagnostics_action.triggered.connect(self.show_diagnostics)
+        help_menu.addAction(diagnostics_action)
+        
         about_action = QAction("About", self)
         about_action.triggered.connect(self.show_help_dialog)
         help_menu.addAction(about_action)
@@ -450,6 +552,16 @@ class SimpleIDE(QMainWindow):
         self.position_status = QLabel("Ln 1, Col 1")
         status_bar.addPermanentWidget(self.position_status)
         
+        self.model_status = QLabel("")
+        self.model_status.setToolTip("Local model load state")
+        self.model_status.hide()
+        status_bar.addPermanentWidget(self.model_status)
+        
+        self.provider_status = QLabel("")
+        self.provider_status.setToolTip("AI provider libraries")
+        self.provider_status.hide()
+        status_bar.addPermanentWidget(self.provider_status)
+        
         spacer = QWidget()
         spacer.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
         status_bar.addPermanentWidget(spacer)
@@ -460,8 +572,8 @@ class SimpleIDE(QMainWindow):
         spaces_status = QLabel("Spaces: 4")
         status_bar.addPermanentWidget(spaces_status)
         
-        utf_status = QLabel("UTF-8")
-        status_bar.addPermanentWidget(utf_status)
+        self.encoding_status = QLabel("UTF-8")
+        status_bar.addPermanentWidget(self.encoding_status)
         
         lf_status = QLabel("LF")
         status_bar.addPermanentWidget(lf_status)
@@ -478,7 +590,115 @@ class SimpleIDE(QMainWindow):
         editor_splitter = QSplitter(Qt.Orientation.Horizontal)
         code_layout.addWidget(editor_splitter)
 
-        file_tree_widget = QWidget()
+        self.file_tree_widget = QWidget()
+        self.file_tree_widget.setMinimumWidth(250)
+        editor_splitter.addWidget(self.file_tree_widget)
+
+
+        self.editor_tabs = QTabWidget()
+        self.editor_tabs.setTabsClosable(True)
+        self.editor_tabs.setMovable(True)
+        self.editor_tabs.setDocumentMode(True)
+        self.editor_tabs.tabCloseRequested.connect(self.close_tab)
+        
+        self.editor = CodeEditor()
+        self.editor.setStyleSheet("""
+            QTextEdit {
+                background-color: #1E1E1E;
+                color: #D4D4D4;
+                border: none;
+                selection-background-color: #264F78;
+                selection-color: #FFFFFF;
+            }
+            QTextEdit[readOnly="true"] {
+                background-color: #252526;
+                color: #A0A0A0;
+            }
+        """)
+        
+        editor_tab = QWidget()
+        editor_tab_layout = QVBoxLayout(editor_tab)
+        editor_tab_layout.setContentsMargins(0, 0, 0, 0)
+        editor_tab_layout.setSpacing(0)
+        
+        editor_with_line_numbers = QWidget()
+        editor_with_line_numbers_layout = QHBoxLayout(editor_with_line_numbers)
+        editor_with_line_numbers_layout.setContentsMargins(0, 0, 0, 0)
+        editor_with_line_numbers_layout.setSpacing(0)
+        
+        self.line_numbers = LineNumberGutter()
+        self.line_numbers.setReadOnly(True)
+        self.line_numbers.setMaximumWidth(50)
+        self.line_numbers.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.line_numbers.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.line_numbers.setStyleSheet("""
+            background-color: #1E1E1E; 
+            color: #6D6D6D; 
+            border-right: 1px solid #383838; 
+            padding-right: 5px; 
+            text-align: right;
+            font-family: 'Consolas', monospace;
+            font-size: 10pt;
+        """)
+        editor_with_line_numbers_layout.addWidget(self.line_numbers)
+        
+        editor_with_line_numbers_layout.addWidget(self.editor)
+        editor_tab_layout.addWidget(editor_with_line_numbers)
+        
+        self.editor.textChanged.connect(self.update_line_numbers)
+        self.editor.cursorPositionChanged.connect(self.update_cursor_position)
+        self.editor.verticalScrollBar().valueChanged.connect(self.sync_line_numbers_scroll)
+        
+        self.highlighter = PythonHighlighter(self.editor.document())
+        
+        initial_document = self.documents.add(DocumentState(editor_tab))
+        initial_document.editor = self.editor
+        initial_document.line_numbers = self.line_numbers
+        initial_document.highlighter = self.highlighter
+        
+        self.editor_tabs.addTab(editor_tab, "Untitled")
+        self.editor_tabs.currentChanged.connect(self.on_tab_changed)
+        
+        editor_splitter.addWidget(self.editor_tabs)
+        
+        self.chat_widget = QWidget()
+        main_splitter.addWidget(self.chat_widget)
+        
+        main_splitter.setSizes([800, 400])  
+        editor_splitter.setSizes([250, 550]) 
+        
+        self.update_line_numbers()
+        self.show()
+        startup_profiler.mark("editor window")
+        
+        self.startup_phases = [
+            ("file tree", self._build_file_tree),
+            ("chat panel", self._build_chat_panel),
+            ("background services", self._start_background_services),
+        ]
+        QTimer.singleShot(0, self._run_next_startup_phase)
+    
+    def _run_next_startup_phase(self):
+        if not self.startup_phases:
+            return
+        name, build = self.startup_phases.pop(0)
+        build()
+        startup_profiler.mark(name)
+        if self.startup_phases:
+            QTimer.singleShot(0, self._run_next_startup_phase)
+        else:
+            startup_profiler.finish()
+    
+    def ensure_startup_complete(self):
+        """Builds any panels still waiting for an idle slice"""
+        while self.startup_phases:
+            self._run_next_startup_phase()
+    
+    def _build_file_tree(self):
+        file_tree_widget = self.file_tree_widget
+        current_dir = self.pending_root_folder or os.path.dirname(os.path.abspath(__file__))
+        self.pending_root_folder = None
+        
         file_tree_layout = QVBoxLayout(file_tree_widget)
         file_tree_layout.setContentsMargins(0, 0, 0, 0)
         
@@ -589,44 +809,41 @@ class SimpleIDE(QMainWindow):
         try:
             if QFileSystemModelClass:
                 self.file_model = QFileSystemModelClass()
-                current_dir = os.path.dirname(os.path.abspath(__file__))
                 
                 self.file_model.setRootPath(current_dir)
                 
-                self.file_tree.setModel(self.file_model)
+                self._attach_file_model(current_dir)
                 
                 for i in range(1, self.file_model.columnCount()):
                     self.file_tree.hideColumn(i)
                 
-                root_index = self.file_model.index(current_dir)
+                root_index = self.file_filter.mapFromSource(self.file_model.index(current_dir))
                 if root_index.isValid():
                     self.file_tree.setRootIndex(root_index)
                 
                 self.using_qt_model = True
             else:
                 self.file_model = SimpleFileSystemModel()
-                current_dir = os.path.dirname(os.path.abspath(__file__))
                 
                 self.file_model.setRootPath(current_dir)
                 
                 self.file_model.setRootPath(current_dir)
-                self.file_tree.setModel(self.file_model)
+                self._attach_file_model(current_dir)
                 
-                root_index = self.file_model.index(0, 0)
+                root_index = self.file_filter.mapFromSource(self.file_model.index(0, 0))
                 if root_index.isValid():
                     self.file_tree.setRootIndex(root_index)
                 
                 self.using_qt_model = False
         except Exception as e:
-            print(f"Error initializing file system model: {str(e)}")
+            logger.error(f"Error initializing file system model: {str(e)}")
             self.file_model = SimpleFileSystemModel()
-            current_dir = os.path.dirname(os.path.abspath(__file__))
             
             self.file_model.setRootPath(current_dir)
             
-            self.file_tree.setModel(self.file_model)
+            self._attach_file_model(current_dir)
             
-            root_index = self.file_model.index(0, 0)
+            root_index = self.file_filter.mapFromSource(self.file_model.index(0, 0))
             if root_index.isValid():
                 self.file_tree.setRootIndex(root_index)
             
@@ -645,73 +862,16 @@ class SimpleIDE(QMainWindow):
         
         file_tree_layout.addWidget(self.file_tree)
         
-        editor_splitter.addWidget(file_tree_widget)
-
-        self.editor_tabs = QTabWidget()
-        self.editor_tabs.setTabsClosable(True)
-        self.editor_tabs.setMovable(True)
-        self.editor_tabs.setDocumentMode(True)
-        self.editor_tabs.tabCloseRequested.connect(self.close_tab)
-        
-        self.editor = CodeEditor()
-        self.editor.setStyleSheet("""
-            QTextEdit {
-                background-color: #1E1E1E;
-                color: #D4D4D4;
-                border: none;
-                selection-background-color: #264F78;
-                selection-color: #FFFFFF;
-            }
-            QTextEdit[readOnly="true"] {
-                background-color: #252526;
-                color: #A0A0A0;
-            }
-        """)
-        
-        editor_tab = QWidget()
-        editor_tab_layout = QVBoxLayout(editor_tab)
-        editor_tab_layout.setContentsMargins(0, 0, 0, 0)
-        editor_tab_layout.setSpacing(0)
-        
-        editor_with_line_numbers = QWidget()
-        editor_with_line_numbers_layout = QHBoxLayout(editor_with_line_numbers)
-        editor_with_line_numbers_layout.setContentsMargins(0, 0, 0, 0)
-        editor_with_line_numbers_layout.setSpacing(0)
-        
-        self.line_numbers = QTextEdit()
-        self.line_numbers.setReadOnly(True)
-        self.line_numbers.setMaximumWidth(50)
-        self.line_numbers.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.line_numbers.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.line_numbers.setStyleSheet("""
-            background-color: #1E1E1E; 
-            color: #6D6D6D; 
-            border-right: 1px solid #383838; 
-            padding-right: 5px; 
-            text-align: right;
-            font-family: 'Consolas', monospace;
-            font-size: 10pt;
-        """)
-        editor_with_line_numbers_layout.addWidget(self.line_numbers)
-        
-        editor_with_line_numbers_layout.addWidget(self.editor)
-        editor_tab_layout.addWidget(editor_with_line_numbers)
-        
-        self.editor.textChanged.connect(self.update_line_numbers)
-        self.editor.cursorPositionChanged.connect(self.update_cursor_position)
-        self.editor.verticalScrollBar().valueChanged.connect(self.sync_line_numbers_scroll)
-        
-        self.highlighter = PythonHighlighter(self.editor.document())
-        
-        self.editor_tabs.addTab(editor_tab, "Untitled")
         
-        editor_splitter.addWidget(self.editor_tabs)
-        
-        chat_widget = QWidget()
+        self.file_tree.setColumnWidth(0, 220) 
+        self.file_tree.setTextElideMode(Qt.TextElideMode.ElideMiddle) 
+        self.file_tree.setFont(QFont('Segoe UI', 9))
+    
+    def _build_chat_panel(self):
+        chat_widget = self.chat_widget
         chat_layout = QVBoxLayout(chat_widget)
         chat_layout.setContentsMargins(0, 0, 0, 0)
         chat_layout.setSpacing(0)
-        main_splitter.addWidget(chat_widget)
         
         chat_header = QWidget()
         chat_header.setStyleSheet("""
@@ -734,6 +894,18 @@ class SimpleIDE(QMainWindow):
         
         chat_header_layout.addStretch()
         
+        new_conversation_btn = QPushButton("✎")
+        new_conversation_btn.setMaximumWidth(25)
+        new_conversation_btn.setToolTip("New Conversation")
+        new_conversation_btn.setStyleSheet("""
+            background-color: transparent;
+            border: none;
+            color: #E0E0E0;
+            font-size: 10px;
+        """)
+        new_conversation_btn.clicked.connect(self.new_conversation)
+        chat_header_layout.addWidget(new_conversation_btn)
+        
         self.chat_toggle_btn = QPushButton("▶")
         self.chat_toggle_btn.setMaximumWidth(25)
         self.chat_toggle_btn.setToolTip("Hide Chat")
@@ -850,7 +1022,6 @@ class SimpleIDE(QMainWindow):
         self.file_list.setFont(QFont('Segoe UI', 8))
         file_selection_layout.addWidget(self.file_list)
         
-        self.context_files = []
         
         chat_layout.addWidget(file_selection_container)
         
@@ -894,20 +1065,21 @@ class SimpleIDE(QMainWindow):
         
         chat_layout.addWidget(chat_input_container)
         
-        main_splitter.setSizes([800, 400])  
-        editor_splitter.setSizes([250, 550]) 
-        
-        chat_widget.setVisible(True)
-        
-        file_tree_widget.setMinimumWidth(250)
+        self._update_file_list_display()
+    
+    def _start_background_services(self):
+        self.warm_up_local_model()
+        QTimer.singleShot(0, self.preload_provider)
         
-        self.file_tree.setColumnWidth(0, 220) 
-        self.file_tree.setTextElideMode(Qt.TextElideMode.ElideMiddle) 
-        self.file_tree.setFont(QFont('Segoe UI', 9))
+        self.session_timer = QTimer(self)
+        self.session_timer.timeout.connect(self.save_session)
+        self.session_timer.start(30000)
         
-        self.update_line_numbers()
-        self.show()
+        self.tab_reclaim_timer = QTimer(self)
+        self.tab_reclaim_timer.timeout.connect(self.reclaim_idle_tabs)
+        self.tab_reclaim_timer.start(60000)
     
+    @timed()
     def update_line_numbers(self):
         text = self.editor.toPlainText()
         line_count = text.count('\n') + 1
@@ -923,6 +1095,11 @@ class SimpleIDE(QMainWindow):
         
         self.line_numbers.setText(line_numbers_text)
         
+        state = self.current_document()
+        if state is not None and state.line_heat and hash(text) != state.heat_source:
+            state.line_heat = None
+        self.line_numbers.set_heat(state.line_heat if state is not None else None)
+        
         self.line_numbers.verticalScrollBar().setValue(
             self.editor.verticalScrollBar().value())
         
@@ -932,7 +1109,7 @@ class SimpleIDE(QMainWindow):
             self.editor_tabs.setTabText(self.editor_tabs.currentIndex(), "Untitled")
             
     def file_tree_double_clicked(self, index):
-        path = self.file_model.filePath(index)
+        path = self.file_filter.filePath(index)
         if os.path.isfile(path):
             self.open_file(path)
         elif os.path.isdir(path):
@@ -944,12 +1121,22 @@ class SimpleIDE(QMainWindow):
         new_tab_layout.setContentsMargins(0, 0, 0, 0)
         new_tab_layout.setSpacing(0)
         
+        state = self.documents.add(DocumentState(new_tab))
+        self._populate_editor_tab(state)
+        
+        index = self.editor_tabs.addTab(new_tab, "Untitled")
+        self.editor_tabs.setCurrentIndex(index)
+        
+        self.current_file = None
+        self.update_line_numbers()
+    
+    def _populate_editor_tab(self, state):
         editor_with_line_numbers = QWidget()
         editor_with_line_numbers_layout = QHBoxLayout(editor_with_line_numbers)
         editor_with_line_numbers_layout.setContentsMargins(0, 0, 0, 0)
         editor_with_line_numbers_layout.setSpacing(0)
         
-        line_numbers = QTextEdit()
+        line_numbers = LineNumberGutter()
         line_numbers.setReadOnly(True)
         line_numbers.setMaximumWidth(50)
         line_numbers.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
@@ -960,50 +1147,223 @@ class SimpleIDE(QMainWindow):
         new_editor = CodeEditor()
         editor_with_line_numbers_layout.addWidget(new_editor)
         
-        new_tab_layout.addWidget(editor_with_line_numbers)
+        state.tab.layout().addWidget(editor_with_line_numbers)
         
-        new_highlighter = PythonHighlighter(new_editor.document())
-        
-        index = self.editor_tabs.addTab(new_tab, "Untitled")
-        self.editor_tabs.setCurrentIndex(index)
+        state.editor = new_editor
+        state.line_numbers = line_numbers
+        state.highlighter = PythonHighlighter(new_editor.document())
         
         self.editor = new_editor
         self.line_numbers = line_numbers
-        self.highlighter = new_highlighter
+        self.highlighter = state.highlighter
         
         self.editor.textChanged.connect(self.update_line_numbers)
         self.editor.cursorPositionChanged.connect(self.update_cursor_position)
         self.editor.verticalScrollBar().valueChanged.connect(self.sync_line_numbers_scroll)
+    
+    def current_document(self):
+        return self.documents.get(self.editor_tabs.currentWidget())
+    
+    @timed()
+    def on_tab_changed(self, index):
+        state = self.documents.get(self.editor_tabs.widget(index))
+        if state is None:
+            return
         
-        self.current_file = None
-        self.update_line_numbers()
+        if not state.materialized:
+            self._materialize_tab(state)
+        elif not state.dirty and state.path and state.mtime is not None:
+            self._reload_if_changed_on_disk(state)
+        
+        self.editor = state.editor
+        self.line_numbers = state.line_numbers
+        self.highlighter = state.highlighter
+        self.current_file = state.path
+        state.touch()
+        
+        self.encoding_status.setText(state.encoding.upper())
+        if self.current_file:
+            self.setWindowTitle(f'Parviz Mind IDE - {os.path.basename(self.current_file)}')
+        self.update_cursor_position()
+    
+    def _read_file(self, path):
+        """Returns (content, encoding)"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        try:
+            return data.decode('utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            return data.decode('latin-1'), 'latin-1'
+    
+    def _reload_if_changed_on_disk(self, state):
+        if state.reloading:
+            return
+        try:
+            if os.path.getmtime(state.path) == state.mtime:
+                return
+            content, state.encoding = self._read_file(state.path)
+        except OSError:
+            return
+        
+        def reloaded(hunks, conflicts):
+            state.reloading = False
+            # Edits typed while a large file was merging stay unsaved
+            was_modified = state.editor.document().isModified()
+            state.editor.apply_hunks(hunks)
+            if not was_modified and not conflicts:
+                state.editor.document().setModified(False)
+            state.update_mtime()
+        
+        state.reloading = True
+        self._merge_into_document(state, state.editor.toPlainText(), content, reloaded,
+                                  lambda: setattr(state, 'reloading', False))
+    
+    def _merge_into_document(self, state, base, suggested, callback, cancelled=None):
+        """
+        Rebases the base -> suggested changes onto the text of state's editor
+        and calls callback(hunks, conflicts). Large documents are merged in a
+        MergeWorker; if the text changes meanwhile, the merge is redone against
+        the new text, and if the editor goes away, cancelled() is called instead.
+        """
+        current = state.editor.toPlainText()
+        if max(current.count('\n'), suggested.count('\n')) < BACKGROUND_MERGE_LINES:
+            callback(*merge_hunks(base, current, suggested))
+            return
+        
+        from .diff_preview import MergeWorker
+        
+        editor = state.editor
+        worker = MergeWorker(base, current, suggested)
+        
+        def merged(hunks, conflicts):
+            if state.editor is not editor or state.tab not in self.documents or hunks is None:
+                if cancelled:
+                    cancelled()
+                return
+            if editor.toPlainText() != current:
+                self._merge_into_document(state, base, suggested, callback, cancelled)
+                return
+            callback(hunks, conflicts)
+        
+        worker.merged.connect(merged)
+        # Referenced until the thread is done, so it is never destroyed while running
+        worker.finished.connect(lambda: self.merge_workers.discard(worker))
+        self.merge_workers.add(worker)
+        self.statusBar().showMessage("Merging changes...", 5000)
+        worker.start()
+    
+    def _add_lazy_tab(self, path, cursor_position=0, scroll_value=0):
+        placeholder = QWidget()
+        placeholder_layout = QVBoxLayout(placeholder)
+        placeholder_layout.setContentsMargins(0, 0, 0, 0)
+        placeholder_layout.setSpacing(0)
+        
+        state = DocumentState(placeholder, path)
+        state.cursor = cursor_position
+        state.scroll = scroll_value
+        self.documents.add(state)
+        
+        index = self.editor_tabs.addTab(placeholder, state.title)
+        self.editor_tabs.setTabToolTip(index, path)
+        return state
+    
+    @timed()
+    def _materialize_tab(self, state):
+        if state.buffer is not None:
+            file_content = zlib.decompress(state.buffer).decode('utf-8')
+        else:
+            try:
+                file_content, state.encoding = self._read_file(state.path)
+                state.update_mtime()
+            except Exception as e:
+                file_content = ""
+                QMessageBox.warning(self, "Warning", f"Could not open file {state.path}: {str(e)}")
+        
+        self._populate_editor_tab(state)
+        state.editor.setText(file_content)
+        state.editor.document().setModified(state.buffer is not None)
+        if state.line_heat and hash(file_content) == state.heat_source:
+            state.line_numbers.set_heat(state.line_heat)
+        state.buffer = None
+        self._restore_editor_position(state.editor, state.cursor, state.scroll)
+    
+    def _dematerialize_tab(self, state):
+        """Frees a background tab's editor widgets, keeping only its path (and text if unsaved)"""
+        if not state.materialized:
+            return False
+        if getattr(self, 'terminal_widget', None) and state.tab.isAncestorOf(self.terminal_widget):
+            return False
+        
+        editor = state.editor
+        state.cursor = editor.textCursor().position()
+        state.scroll = editor.verticalScrollBar().value()
+        state.buffer = None
+        if editor.document().isModified() or not state.path:
+            state.buffer = zlib.compress(editor.toPlainText().encode('utf-8'))
+        
+        layout = state.tab.layout()
+        while layout.count():
+            widget = layout.takeAt(0).widget()
+            if widget is not None:
+                widget.deleteLater()
+        
+        state.release_widgets()
+        return True
+    
+    def _memory_pressure(self):
+        try:
+            import psutil
+        except ImportError:
+            return False
+        try:
+            return psutil.virtual_memory().percent >= MEMORY_PRESSURE_PERCENT
+        except Exception:
+            return False
+    
+    def reclaim_idle_tabs(self):
+        current = self.current_document()
+        now = time.monotonic()
+        live = [state for state in self.documents if state.materialized]
+        candidates = sorted((state for state in live if state is not current), key=lambda state: state.last_used)
+        
+        under_pressure = self._memory_pressure()
+        live_count = len(live)
+        for state in candidates:
+            if under_pressure or (live_count > MAX_LIVE_TABS and now - state.last_used >= IDLE_TAB_SECONDS):
+                if self._dematerialize_tab(state):
+                    live_count -= 1
+            else:
+                break
+    
+    def _restore_editor_position(self, editor, cursor_position, scroll_value):
+        cursor = editor.textCursor()
+        cursor.setPosition(min(cursor_position, len(editor.toPlainText())))
+        editor.setTextCursor(cursor)
+        QTimer.singleShot(0, lambda: editor.verticalScrollBar().setValue(scroll_value))
         
     def close_tab(self, index):
+        tab = self.editor_tabs.widget(index)
+        state = self.documents.get(tab)
+        
         if self.editor_tabs.count() <= 1:
+            if state is None:
+                return
+            if not state.materialized:
+                self._materialize_tab(state)
+            self.documents.set_path(state, None)
+            state.encoding = 'utf-8'
             self.editor.clear()
+            self.editor.document().setModified(False)
             self.current_file = None
             self.editor_tabs.setTabText(0, "Untitled")
+            self.editor_tabs.setTabToolTip(0, "")
             self.update_line_numbers()
         else:
+            self.documents.remove(tab)
+            self.suggestion_bases.pop(tab, None)
             self.editor_tabs.removeTab(index)
-            
-            current_tab = self.editor_tabs.currentWidget()
-            editor_layout = current_tab.layout()
-            editor_with_line_numbers = editor_layout.itemAt(0).widget()
-            editor_with_line_numbers_layout = editor_with_line_numbers.layout()
-            
-            self.line_numbers = editor_with_line_numbers_layout.itemAt(0).widget()
-            self.editor = editor_with_line_numbers_layout.itemAt(1).widget()
-            self.highlighter = PythonHighlighter(self.editor.document())
-            
-            current_tab_name = self.editor_tabs.tabText(self.editor_tabs.currentIndex())
-            if current_tab_name != "Untitled":
-                for file_path in self.open_files.keys():
-                    if os.path.basename(file_path) == current_tab_name:
-                        self.current_file = file_path
-                        break
-            else:
-                self.current_file = None
+            tab.deleteLater()
+            self.on_tab_changed(self.editor_tabs.currentIndex())
                 
     def show_go_to_line_dialog(self):
         dialog = QDialog(self)
@@ -1066,32 +1426,47 @@ class SimpleIDE(QMainWindow):
         else:
             self.statusBar().showMessage(f"Untitled - Python - Ln {line}, Col {column}")
             
-    def open_file(self, path=None):
+    @timed()
+    def open_file(self, path=None, activate=True):
         if not path:
             start_dir = os.path.dirname(self.current_file) if self.current_file else (
                 self.file_model.rootPath() if hasattr(self.file_model, 'rootPath') else os.getcwd()
             )
             
-            path, _ = QFileDialog.getOpenFileName(
+            paths, _ = QFileDialog.getOpenFileNames(
                 self, 
                 "Open File", 
                 start_dir,
                 "Python Files (*.py);;All Files (*)",
                 options=QFileDialog.Option.ReadOnly
             )
+            if not paths:
+                return
+            
+            self.open_file(paths[0])
+            for extra_path in paths[1:]:
+                self.open_file(extra_path, activate=False)
+            return
         
         if path:
-            if hasattr(self, 'open_files') and path in self.open_files:
-                self.editor_tabs.setCurrentIndex(self.open_files[path])
+            existing = self.documents.for_path(path)
+            if existing:
+                if activate:
+                    self.editor_tabs.setCurrentWidget(existing.tab)
+                return
+            
+            if not activate:
+                if os.path.isfile(path):
+                    self._add_lazy_tab(path)
                 return
                 
             try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    file_content = f.read()
+                file_content, encoding = self._read_file(path)
                 
                 self.new_file()
                 
                 self.editor.setText(file_content)
+                self.editor.document().setModified(False)
                 self.current_file = path
                 
                 current_index = self.editor_tabs.currentIndex()
@@ -1099,22 +1474,20 @@ class SimpleIDE(QMainWindow):
                 
                 self.setWindowTitle(f'Parviz Mind IDE - {os.path.basename(path)}')
                 
-                if not hasattr(self, 'open_files'):
-                    self.open_files = {}
-                self.open_files[path] = current_index
+                state = self.current_document()
+                self.documents.set_path(state, path)
+                state.encoding = encoding
+                self.encoding_status.setText(encoding.upper())
+                self.editor_tabs.setTabToolTip(current_index, path)
                 
                 file_dir = os.path.dirname(path)
                 try:
-                    if self.using_qt_model:
-                        self.file_model.setRootPath(file_dir)
-                        self.file_tree.setRootIndex(self.file_model.index(file_dir))
+                    if self.file_model is None:
+                        self.pending_root_folder = file_dir
                     else:
-                        self.file_model.setRootPath(file_dir)
-                        self.file_tree.setRootIndex(self.file_model.index(0, 0))
-                        if hasattr(self.file_model, 'refresh'):
-                            self.file_model.refresh()
+                        self._set_tree_root(file_dir)
                 except Exception as e:
-                    print(f"Error updating file tree: {str(e)}")
+                    logger.error(f"Error updating file tree: {str(e)}")
                 
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Could not open file: {str(e)}")
@@ -1163,7 +1536,137 @@ class SimpleIDE(QMainWindow):
             else:
                 QMessageBox.critical(self, "Error", f"Could not run code: {str(e)}")
 
+    def _add_bottom_dock(self, dock):
+        """Docks at the bottom, tabbed together with the other tool docks"""
+        existing = [other for other in (self.profiler_dock, self.memory_dock, self.runs_dock, self.tests_dock)
+                    if other is not None and other is not dock]
+        self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, dock)
+        if existing:
+            self.tabifyDockWidget(existing[0], dock)
+
+    def _ensure_profiler_dock(self):
+        if self.profiler_dock is None:
+            from .profiler_panel import ProfilerPanel
+            
+            self.profiler_panel = ProfilerPanel(self)
+            self.profiler_panel.location_activated.connect(self.go_to_location)
+            self.profiler_panel.line_timings_ready.connect(self.apply_line_timings)
+            self.profiler_panel.rerun_requested.connect(self._start_profiled_run)
+            self.profiler_dock = QDockWidget("Profiler", self)
+            self.profiler_dock.setObjectName("ProfilerDock")
+            self.profiler_dock.setWidget(self.profiler_panel)
+            self._add_bottom_dock(self.profiler_dock)
+        self.profiler_dock.show()
+        self.profiler_dock.raise_()
+        return self.profiler_panel
+
+    def run_with_profiler(self):
+        self._start_profiled_run(False)
+
+    def run_with_line_timing(self):
+        self._start_profiled_run(True)
+
+    def _start_profiled_run(self, line_timing):
+        if not self.current_file:
+            QMessageBox.warning(self, "Warning", "Please save the file first")
+            return
+        
+        self.save_file()
+        panel = self._ensure_profiler_dock()
+        if not panel.start(self.current_file, line_timing=line_timing):
+            QMessageBox.information(self, "Profiler", "A profiled run is already in progress")
+
+    def _ensure_memory_dock(self):
+        if self.memory_dock is None:
+            from .memory_panel import MemoryPanel
+            
+            self.memory_panel = MemoryPanel(self)
+            self.memory_panel.location_activated.connect(self.go_to_location)
+            self.memory_panel.rerun_requested.connect(self.run_with_memory_profiler)
+            self.memory_dock = QDockWidget("Memory", self)
+            self.memory_dock.setObjectName("MemoryDock")
+            self.memory_dock.setWidget(self.memory_panel)
+            self._add_bottom_dock(self.memory_dock)
+        self.memory_dock.show()
+        self.memory_dock.raise_()
+        return self.memory_panel
+
+    def run_with_memory_profiler(self):
+        if not self.current_file:
+            QMessageBox.warning(self, "Warning", "Please save the file first")
+            return
+        
+        self.save_file()
+        panel = self._ensure_memory_dock()
+        if not panel.start(self.current_file):
+            QMessageBox.information(self, "Memory Profiler", "A memory profiling run is already in progress")
+
+    def show_run_configurations(self):
+        if self.runs_dock is None:
+            from .run_panel import RunPanel
+            
+            self.run_panel = RunPanel(self)
+            self.runs_dock = QDockWidget("Runs", self)
+            self.runs_dock.setObjectName("RunsDock")
+            self.runs_dock.setWidget(self.run_panel)
+            self._add_bottom_dock(self.runs_dock)
+        self.run_panel.default_script = self.current_file
+        self.runs_dock.show()
+        self.runs_dock.raise_()
+
+    def show_test_runner(self):
+        if self.tests_dock is None:
+            from .test_panel import TestPanel
+            
+            self.test_panel = TestPanel(self)
+            self.test_panel.location_activated.connect(self.go_to_location)
+            self.tests_dock = QDockWidget("Tests", self)
+            self.tests_dock.setObjectName("TestsDock")
+            self.tests_dock.setWidget(self.test_panel)
+            self._add_bottom_dock(self.tests_dock)
+        self.test_panel.set_root(self.get_root_folder())
+        self.tests_dock.show()
+        self.tests_dock.raise_()
+
+    def apply_line_timings(self, path, lines):
+        """Shades the gutter of path's editor with the per-line times of a line-timing run"""
+        self.open_file(path)
+        state = self.documents.for_path(path)
+        if state is None or not state.materialized:
+            return
+        
+        text = state.editor.toPlainText()
+        try:
+            on_disk, _ = self._read_file(path)
+        except Exception:
+            on_disk = None
+        if on_disk != text:
+            self.statusBar().showMessage(f"{os.path.basename(path)} changed since the run; line timings not shown", 5000)
+            return
+        
+        state.line_heat = lines
+        state.heat_source = hash(text)
+        state.line_numbers.set_heat(lines)
+
+    def go_to_location(self, path, line):
+        """Opens path and puts the cursor at the start of the given 1-based line"""
+        self.open_file(path)
+        state = self.documents.for_path(path)
+        if state is None or state.editor is None:
+            return
+        
+        block = state.editor.document().findBlockByNumber(max(line - 1, 0))
+        if block.isValid():
+            cursor = state.editor.textCursor()
+            cursor.setPosition(block.position())
+            state.editor.setTextCursor(cursor)
+            state.editor.ensureCursorVisible()
+        state.editor.setFocus()
+
+    @timed()
     def send_chat(self):
+        from ..services.llm_service import AIModelWorker
+        
         query = self.chat_input.text().strip()
         if not query:
             return
@@ -1174,6 +1677,9 @@ class SimpleIDE(QMainWindow):
         self.chat_input.clear()
         
         editor_code = self.editor.toPlainText()
+        state = self.current_document()
+        if state is not None:
+            self.suggestion_bases[state.tab] = editor_code
         
         file_contexts = {}
         for file_path in self.context_files:
@@ -1184,37 +1690,56 @@ class SimpleIDE(QMainWindow):
                 self.chat_display.append(f"<div style='margin-bottom: 10px;'><span style='color: #F44747;'>Error reading file {file_path}: {str(e)}</span></div>")
         
         self.chat_display.append("<div style='margin-bottom: 10px;'><span style='color: #4EC9B0; font-weight: bold;'>AI:</span> <em>Thinking...</em></div>")
-        self.worker = AIModelWorker(query, editor_code, self.model_settings, file_contexts)
+        conversation = self.conversation if self.model_settings.get("conversation_mode", False) else None
+        self.worker = AIModelWorker(query, editor_code, self.model_settings, file_contexts, conversation,
+                                    self.current_file)
         self.worker.response_ready.connect(self.handle_llm_response)
         self.worker.code_suggestion.connect(self.handle_code_suggestion)
         self.worker.file_changes.connect(self.handle_file_changes)  
+        self.worker.status_update.connect(lambda message: self.statusBar().showMessage(message, 10000))
+        self.worker.block_ready.connect(self.handle_block_ready)
         self.worker.start()
     
     
-    def handle_llm_response(self, response):
+    @timed()
+    def handle_llm_response(self, response, events=None):
         current_text = self.chat_display.toHtml()
         if "<em>Thinking...</em>" in current_text:
             current_text = current_text.replace("<div style='margin-bottom: 10px;'><span style='color: #4EC9B0; font-weight: bold;'>AI:</span> <em>Thinking...</em></div>", "")
             self.chat_display.setHtml(current_text)
         
-        formatted_response = response
-        
-        code_blocks = re.findall(r'```python\n(.*?)```', response, re.DOTALL)
-        
-        for code_block in code_blocks:
-            placeholder = f"```python\n{code_block}```"
-            styled_block = f"""<div style='background-color: #1E1E1E; color: #D4D4D4; 
+        parts = []
+        # The worker's streaming parser already split the response; only errors arrive without events
+        if events is None:
+            events = ResponseParser.parse(response)
+        for event in events:
+            if event.kind == PROSE:
+                parts.append(event.content)
+            else:
+                parts.append(f"""<div style='background-color: #1E1E1E; color: #D4D4D4; 
                             font-family: Consolas, monospace; padding: 10px; 
                             border: 1px solid #3E3E3E; border-radius: 5px; 
                             margin: 10px 0; white-space: pre; overflow-x: auto;'>
-                            {self.syntax_highlight_for_html(code_block)}
-                            </div>"""
-            formatted_response = formatted_response.replace(placeholder, styled_block)
+                            {self.syntax_highlight_for_html(event.content)}
+                            </div>""")
+        formatted_response = "\n".join(parts)
         
         self.chat_display.append(f"<div style='margin-bottom: 15px;'><span style='color: #4EC9B0; font-weight: bold;'>AI:</span> {formatted_response}</div>")
         
         self.chat_history.append(self.query)
     
+    def handle_block_ready(self, kind, name):
+        if kind == FILE:
+            self.chat_display.append(f"<div style='margin-bottom: 5px;'><span style='color: #6A9955;'>Received changes for: {name}</span></div>")
+            self.statusBar().showMessage(f"Receiving response... {name} ready", 5000)
+        else:
+            self.statusBar().showMessage(f"Receiving response... {name or 'code'} block ready", 5000)
+    
+    def new_conversation(self):
+        self.conversation.reset()
+        self.chat_history = []
+        self.chat_display.append("<div style='margin-bottom: 10px;'><span style='color: #6A9955;'>Started a new conversation.</span></div>")
+    
     def syntax_highlight_for_html(self, code):
         code = code.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
         
@@ -1235,9 +1760,28 @@ class SimpleIDE(QMainWindow):
         
         return code
     
+    def _attach_file_model(self, folder):
+        # The view sees the model through the ignore filter
+        self.file_filter = IgnoreFilterModel(self)
+        self.file_filter.setSourceModel(self.file_model)
+        self.file_filter.set_root(folder)
+        self.file_tree.setModel(self.file_filter)
+    
+    def _set_tree_root(self, folder):
+        self.file_model.setRootPath(folder)
+        self.file_filter.set_root(folder)
+        if self.using_qt_model:
+            source_index = self.file_model.index(folder)
+        else:
+            source_index = self.file_model.index(0, 0)
+        self.file_tree.setRootIndex(self.file_filter.mapFromSource(source_index))
+    
     def refresh_file_tree(self):
+        self.ensure_startup_complete()
         if hasattr(self.file_model, 'refresh'):
             self.file_model.refresh()
+        if self.file_filter is not None:
+            self.file_filter.refresh_rules()
 
         self.file_tree.update()
         
@@ -1251,45 +1795,201 @@ class SimpleIDE(QMainWindow):
         
         if folder:
             try:
-                if self.using_qt_model:
-                    self.file_model.setRootPath(folder)
-                    self.file_tree.setRootIndex(self.file_model.index(folder))
-                else:
-                    self.file_model.setRootPath(folder)
-                    self.file_tree.setRootIndex(self.file_model.index(0, 0))
-                
-                self.file_tree.setExpanded(self.file_tree.rootIndex(), False)
+                self.set_root_folder(folder)
                 self.setWindowTitle(f'Parviz Mind IDE - {folder}')
                 
                 if self.current_file:
                     self.new_file()
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Could not change folder: {str(e)}")
+    
+    def refresh_ignore_rules(self):
+        """Applies edited ignore files to the tree and the Go to File index"""
+        if self.file_filter is not None:
+            self.file_filter.refresh_rules()
+        self.path_index.refresh()
+    
+    def edit_excluded_files(self):
+        self.open_file(user_excludes_path())
+    
+    def show_go_to_file(self):
+        # Indexes the project root, not the tree's root, which follows each opened file
+        if self.path_index.root is None:
+            self.path_index.set_root(self.get_root_folder())
+        if self.quick_open_dialog is None:
+            from .quick_open import QuickOpenDialog
+            
+            self.quick_open_dialog = QuickOpenDialog(self.path_index, self)
+            self.quick_open_dialog.file_selected.connect(self.open_file)
+        self.quick_open_dialog.show()
+        self.quick_open_dialog.raise_()
+        self.quick_open_dialog.activateWindow()
+    
+    def set_root_folder(self, folder):
+        self.path_index.set_root(folder)
+        if self.file_model is None:
+            self.pending_root_folder = folder
+            return
+        self._set_tree_root(folder)
+        
+        self.file_tree.setExpanded(self.file_tree.rootIndex(), False)
+    
+    def get_root_folder(self):
+        if self.file_model is None:
+            return self.pending_root_folder or os.getcwd()
+        if hasattr(self.file_model, 'rootPath'):
+            return self.file_model.rootPath()
+        return getattr(self.file_model, 'root_path', '') or os.getcwd()
+    
+    def collect_session(self):
+        tabs = []
+        current = 0
+        for index in range(self.editor_tabs.count()):
+            state = self.documents.get(self.editor_tabs.widget(index))
+            if not state or not state.path:
+                continue
+            if state.materialized:
+                cursor_position = state.editor.textCursor().position()
+                scroll_value = state.editor.verticalScrollBar().value()
+            else:
+                cursor_position, scroll_value = state.cursor, state.scroll
+            if index == self.editor_tabs.currentIndex():
+                current = len(tabs)
+            tabs.append({'path': state.path, 'cursor': cursor_position, 'scroll': scroll_value})
+        
+        return {
+            'tabs': tabs,
+            'current': current,
+            'root': self.get_root_folder(),
+            'context_files': list(self.context_files),
+            'model_settings': strip_secrets(self.model_settings),
+        }
+    
+    def save_session(self, wait=False):
+        try:
+            session = self.collect_session()
+            if wait:
+                self.session_store.save(session)
+            else:
+                self.session_store.save_async(session)
+        except Exception as e:
+            logger.error(f"Error saving session: {str(e)}")
+    
+    def restore_session(self):
+        session = self.session_store.load()
+        if not session:
+            return False
+        
+        api_key = self.model_settings.get("groq_api_key", "")
+        self.model_settings.update(session.get('model_settings', {}))
+        self.model_settings["groq_api_key"] = api_key
+        
+        tabs = [tab for tab in session.get('tabs', []) if os.path.isfile(tab.get('path', ''))]
+        current = min(session.get('current', 0), len(tabs) - 1) if tabs else -1
+        
+        initial_tab = self.editor_tabs.widget(0)
+        initial_document = self.documents.get(initial_tab)
+        replace_initial = (self.editor_tabs.count() == 1 and initial_document is not None
+                           and not initial_document.path and not self.editor.toPlainText())
+        
+        for index, tab in enumerate(tabs):
+            if index == current:
+                self.open_file(tab['path'])
+                if self.current_file == tab['path']:
+                    self._restore_editor_position(self.editor, tab.get('cursor', 0), tab.get('scroll', 0))
+            else:
+                self._add_lazy_tab(tab['path'], tab.get('cursor', 0), tab.get('scroll', 0))
+        
+        if replace_initial and tabs and self.editor_tabs.count() > 1:
+            self.documents.remove(initial_tab)
+            self.editor_tabs.removeTab(self.editor_tabs.indexOf(initial_tab))
+            initial_tab.deleteLater()
+            self.on_tab_changed(self.editor_tabs.currentIndex())
+        
+        root = session.get('root')
+        if root and os.path.isdir(root):
+            try:
+                self.set_root_folder(root)
+            except Exception as e:
+                logger.error(f"Error restoring root folder: {str(e)}")
+        
+        self.context_files = [path for path in session.get('context_files', []) if os.path.isfile(path)]
+        self._update_file_list_display()
+        
+        return True
+    
+    def closeEvent(self, event):
+        self.watchdog.stop()
+        if self.profiler_panel:
+            self.profiler_panel.runner.stop()
+        if self.memory_panel:
+            self.memory_panel.runner.stop()
+        if self.run_panel:
+            self.run_panel.manager.stop_all()
+        if self.test_panel:
+            self.test_panel.runner.stop()
+        self.path_index.stop()
+        for worker in list(self.diff_workers) + list(self.merge_workers):
+            worker.wait()
+        if self.session_timer:
+            self.session_timer.stop()
+        self.save_session(wait=True)
+        super().closeEvent(event)
 
     def get_current_code(self):
         return self.editor.toPlainText()
         
+    @timed()
     def update_editor_content(self, code):
-        print("Updating editor content with new code")  
+        logger.debug("Updating editor content with new code")
         
         if self.current_file:
             try:
                 backup_file = f"{self.current_file}.backup"
                 with open(backup_file, 'w', encoding='utf-8') as f:
                     f.write(self.editor.toPlainText())
-                    print(f"Backup created at: {backup_file}")
+                    logger.debug(f"Backup created at: {backup_file}")
             except Exception as e:
-                print(f"Error creating backup: {str(e)}")
+                logger.error(f"Error creating backup: {str(e)}")
                 QMessageBox.warning(self, "Backup Warning", 
                                  f"Could not create backup file: {str(e)}")
         
+        state = self.current_document()
+        if state is None:
+            return
         old_code = self.editor.toPlainText()
-        self.editor.setText(code)
+        base_code = self.suggestion_bases.pop(state.tab, old_code)
+        self._merge_into_document(
+            state, base_code, code,
+            lambda hunks, conflicts: self._apply_suggestion(state, code, hunks, conflicts)
+        )
+    
+    def _apply_suggestion(self, state, code, hunks, conflicts):
+        old_code = state.editor.toPlainText()
+        if conflicts:
+            conflict_box = QMessageBox(self)
+            conflict_box.setWindowTitle("Conflicting Changes")
+            conflict_box.setText(f"{len(conflicts)} of the suggested changes overlap edits you made "
+                                 f"after asking the AI. How would you like to continue?")
+            merge_btn = conflict_box.addButton("Apply Non-conflicting", QMessageBox.ButtonRole.AcceptRole)
+            replace_btn = conflict_box.addButton("Replace Everything", QMessageBox.ButtonRole.DestructiveRole)
+            conflict_box.addButton("Cancel", QMessageBox.ButtonRole.RejectRole)
+            conflict_box.exec()
+            
+            if conflict_box.clickedButton() == replace_btn:
+                hunks = compute_hunks(old_code, code)
+            elif conflict_box.clickedButton() != merge_btn:
+                return
+        
+        state.editor.apply_hunks(hunks)
+        if state.editor is not self.editor:
+            # The user switched tabs while a large merge was running
+            return
         self.update_line_numbers()
         
-        QMessageBox.information(self, "Code Updated", "The code has been updated in the editor.")
+        QMessageBox.information(self, "Code Updated", f"The code has been updated in the editor ({len(hunks)} changes).")
         
-        print(f"Code changed from {len(old_code)} characters to {len(code)} characters")
+        logger.debug(f"Code changed from {len(old_code)} characters to {len(code)} characters")
         
         if self.current_file:
             reply = QMessageBox.question(
@@ -1310,25 +2010,36 @@ class SimpleIDE(QMainWindow):
             if reply == QMessageBox.StandardButton.Yes:
                 self.save_file()
 
+    @timed()
     def save_file(self, save_as=False):
         if not self.current_file or save_as:
             path, _ = QFileDialog.getSaveFileName(self, "Save File", "", 
                                                "Python Files (*.py);;All Files (*)")
             if not path:
                 return
+            self.documents.set_path(self.current_document(), path)
             self.current_file = path
             current_index = self.editor_tabs.currentIndex()
             self.editor_tabs.setTabText(current_index, os.path.basename(path))
 
+        state = self.current_document()
+        encoding = state.encoding if state else 'utf-8'
         try:
-            with open(self.current_file, 'w', encoding='utf-8') as f:
+            with open(self.current_file, 'w', encoding=encoding) as f:
                 f.write(self.editor.toPlainText())
+            self.editor.document().setModified(False)
+            if state:
+                state.update_mtime()
             self.setWindowTitle(f'Parviz Mind IDE - {os.path.basename(self.current_file)}')
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not save file: {str(e)}")
+            return
+        if is_ignore_file(self.current_file):
+            self.refresh_ignore_rules()
     
+    @timed()
     def handle_code_suggestion(self, code, explanation):
-        print("Received code suggestion, length:", len(code))  
+        logger.debug(f"Received code suggestion, length: {len(code)}")
         
         current_text = self.chat_display.toHtml()
         if "<em>Thinking...</em>" in current_text:
@@ -1355,10 +2066,10 @@ class SimpleIDE(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            print("User accepted code changes, updating editor...") 
+            logger.debug("User accepted code changes, updating editor...")
             self.update_editor_content(code)
         else:
-            print("User rejected code changes")
+            logger.debug("User rejected code changes")
             self.chat_display.append("<div style='margin-bottom: 15px;'><span style='color: #4EC9B0;'>Code changes were not applied.</span></div>")
     
     def sync_line_numbers_scroll(self, value):
@@ -1397,6 +2108,26 @@ class SimpleIDE(QMainWindow):
         self.api_key_input.setPlaceholderText("Enter Groq API key")
         groq_form_layout.addRow("API Key:", self.api_key_input)
         
+        self.groq_base_url_input = QLineEdit()
+        self.groq_base_url_input.setText(self.model_settings.get("groq_base_url", ""))
+        self.groq_base_url_input.setPlaceholderText("Default: https://api.groq.com")
+        self.groq_base_url_input.setToolTip("Server to send online model requests to, e.g. a local stand-in server")
+        groq_form_layout.addRow("Base URL:", self.groq_base_url_input)
+        
+        self.hedge_check = QCheckBox("Hedge slow requests with a second model")
+        self.hedge_check.setChecked(self.model_settings.get("hedge_requests", False))
+        self.hedge_check.setToolTip("If the first model has not started answering within its usual (p90) delay, "
+                                    "the same prompt is sent to the second model and the first answer wins")
+        groq_form_layout.addRow(self.hedge_check)
+        
+        self.hedge_model_combo = QComboBox()
+        self.hedge_model_combo.addItems([self.groq_model_combo.itemText(i)
+                                         for i in range(self.groq_model_combo.count())])
+        self.hedge_model_combo.setCurrentText(self.model_settings.get("hedge_model", "llama-3.3-70b-versatile"))
+        self.hedge_model_combo.setEnabled(self.hedge_check.isChecked())
+        self.hedge_check.toggled.connect(self.hedge_model_combo.setEnabled)
+        groq_form_layout.addRow("Hedge Model:", self.hedge_model_combo)
+        
         model_layout.addWidget(groq_form)
         
         self.local_radio = QRadioButton("Use Local Models")
@@ -1410,10 +2141,25 @@ class SimpleIDE(QMainWindow):
         self.local_model_input.setPlaceholderText("Example: deepseek-r1:8b")
         local_form_layout.addRow("Model Name:", self.local_model_input)
         
+        self.keep_alive_input = QLineEdit()
+        self.keep_alive_input.setText(str(self.model_settings.get("keep_alive", DEFAULT_KEEP_ALIVE)))
+        self.keep_alive_input.setPlaceholderText("Example: 30m, 2h, -1 (never unload)")
+        self.keep_alive_input.setToolTip("How long Ollama keeps the model in memory after a request")
+        local_form_layout.addRow("Keep Alive:", self.keep_alive_input)
+        
+        self.ollama_base_url_input = QLineEdit()
+        self.ollama_base_url_input.setText(self.model_settings.get("ollama_base_url", DEFAULT_OLLAMA_URL))
+        self.ollama_base_url_input.setPlaceholderText(DEFAULT_OLLAMA_URL)
+        local_form_layout.addRow("Ollama URL:", self.ollama_base_url_input)
+        
         model_layout.addWidget(local_form)
         
         layout.addWidget(model_group)
         
+        self.conversation_check = QCheckBox("Keep conversation history (send only diffs of files already sent)")
+        self.conversation_check.setChecked(self.model_settings.get("conversation_mode", False))
+        layout.addWidget(self.conversation_check)
+        
         button_layout = QHBoxLayout()
         save_btn = QPushButton("Save")
         cancel_btn = QPushButton("Cancel")
@@ -1434,13 +2180,72 @@ class SimpleIDE(QMainWindow):
         self.model_settings["use_local"] = self.local_radio.isChecked()
         self.model_settings["groq_model"] = self.groq_model_combo.currentText()
         self.model_settings["groq_api_key"] = self.api_key_input.text()
+        self.model_settings["groq_base_url"] = self.groq_base_url_input.text().strip()
         self.model_settings["local_model"] = self.local_model_input.text()
+        self.model_settings["hedge_requests"] = self.hedge_check.isChecked()
+        self.model_settings["hedge_model"] = self.hedge_model_combo.currentText()
+        self.model_settings["keep_alive"] = self.keep_alive_input.text().strip() or DEFAULT_KEEP_ALIVE
+        self.model_settings["ollama_base_url"] = self.ollama_base_url_input.text().strip() or DEFAULT_OLLAMA_URL
+        
+        if self.model_settings.get("conversation_mode", False) != self.conversation_check.isChecked():
+            self.conversation.reset()
+        self.model_settings["conversation_mode"] = self.conversation_check.isChecked()
         
         dialog.accept()
         
+        self.warm_up_local_model()
+        self.preload_provider()
+        
         QMessageBox.information(self, "Settings Saved", "LLM settings have been updated.")
     
+    def warm_up_local_model(self):
+        if not self.model_settings["use_local"] or not self.model_settings["local_model"]:
+            self.model_status.hide()
+            return
+        
+        if self.warmup_worker is not None and self.warmup_worker.isRunning():
+            # Warm up whatever the settings name once the current warm-up is done
+            self.warmup_pending = True
+            return
+        
+        from ..services.ollama_warmup import OllamaWarmupWorker
+        self.warmup_pending = False
+        self.warmup_worker = OllamaWarmupWorker(
+            self.model_settings["local_model"],
+            self.model_settings.get("keep_alive", DEFAULT_KEEP_ALIVE),
+            self.model_settings.get("ollama_base_url") or DEFAULT_OLLAMA_URL
+        )
+        self.warmup_worker.status_changed.connect(self.update_model_status)
+        self.warmup_worker.finished.connect(self._warmup_finished)
+        self.warmup_worker.start()
+    
+    def _warmup_finished(self):
+        if self.warmup_pending:
+            self.warm_up_local_model()
+    
+    def update_model_status(self, status):
+        self.model_status.setText(status)
+        self.model_status.show()
+    
+    def preload_provider(self):
+        from ..services.provider_loader import ProviderPreloader, provider_for
+        
+        provider = provider_for(self.model_settings)
+        preloader = self.provider_preloaders.get(provider)
+        if preloader and preloader.isRunning():
+            return
+        
+        preloader = ProviderPreloader(provider)
+        preloader.status_changed.connect(self.update_provider_status)
+        self.provider_preloaders[provider] = preloader
+        preloader.start(QThread.Priority.LowPriority)
+    
+    def update_provider_status(self, status):
+        self.provider_status.setText(status)
+        self.provider_status.show()
+    
     def toggle_explorer(self):
+        self.ensure_startup_complete()
         file_tree_widget = self.file_tree.parent()
         editor_splitter = file_tree_widget.parent()
         
@@ -1477,6 +2282,7 @@ class SimpleIDE(QMainWindow):
             self.explorer_toggle_btn.setToolTip("Hide Explorer")
     
     def toggle_chat(self):
+        self.ensure_startup_complete()
         chat_widget = self.chat_display.parent()
         main_splitter = chat_widget.parent()
         
@@ -1586,6 +2392,8 @@ class SimpleIDE(QMainWindow):
             self.toggle_context_btn.setToolTip("Hide Context Files")
     
     def _update_file_list_display(self):
+        if self.file_list is None:
+            return
         if not self.context_files:
             self.file_list.setText("<i>No files selected</i>")
         else:
@@ -1596,8 +2404,9 @@ class SimpleIDE(QMainWindow):
             html += "</ul>"
             self.file_list.setHtml(html)
     
+    @timed()
     def handle_file_changes(self, file_changes, explanation):
-        print(f"Received changes for {len(file_changes)} files") 
+        logger.info(f"Received changes for {len(file_changes)} files")
         
         current_text = self.chat_display.toHtml()
         if "<em>Thinking...</em>" in current_text:
@@ -1645,8 +2454,8 @@ class SimpleIDE(QMainWindow):
                 full_path = clean_filename
             
             full_path = os.path.normpath(full_path)
-            print(f"Filename: {clean_filename}")
-            print(f"Full path: {full_path}")
+            logger.debug(f"Filename: {clean_filename}")
+            logger.debug(f"Full path: {full_path}")
             
             file_exists = os.path.isfile(full_path)
             
@@ -1656,7 +2465,7 @@ class SimpleIDE(QMainWindow):
                     with open(full_path, 'r', encoding='utf-8') as f:
                         current_content = f.read()
                 except Exception as e:
-                    print(f"Error reading file {full_path}: {str(e)}")
+                    logger.error(f"Error reading file {full_path}: {str(e)}")
             
             file_states[clean_filename] = {
                 'full_path': full_path,
@@ -1685,10 +2494,14 @@ class SimpleIDE(QMainWindow):
         
         msg_box.exec()
     
+    @timed()
     def preview_file_changes(self):
         if not hasattr(self, 'pending_file_changes') or not self.pending_file_changes:
             return
         
+        from .diff_preview import DiffView, DiffTableModel, DiffWorker, DiffCache
+        if self.diff_cache is None:
+            self.diff_cache = DiffCache()
         preview_dialog = QDialog(self)
         preview_dialog.setWindowTitle("Preview File Changes")
         preview_dialog.setMinimumSize(800, 600)
@@ -1702,10 +2515,12 @@ class SimpleIDE(QMainWindow):
         layout.addWidget(QLabel("Select File:"))
         layout.addWidget(file_selector)
         
-        preview_text = QTextEdit()
-        preview_text.setReadOnly(True)
-        preview_text.setFont(QFont('Consolas', 10))
-        layout.addWidget(preview_text)
+        status_label = QLabel("")
+        status_label.setStyleSheet("font-weight: normal; color: #A0A0A0;")
+        layout.addWidget(status_label)
+        
+        preview_view = DiffView()
+        layout.addWidget(preview_view)
         
         button_layout = QHBoxLayout()
         apply_btn = QPushButton("Apply This File")
@@ -1717,48 +2532,49 @@ class SimpleIDE(QMainWindow):
         
         layout.addLayout(button_layout)
         
+        diff_workers = []
         
-        def update_preview(filename):
+        def cache_key(filename):
             file_info = self.pending_file_changes[filename]
-            if file_info['exists']:
-                from difflib import unified_diff
-                original_lines = file_info['original_content'].splitlines()
-                new_lines = file_info['new_content'].splitlines()
-                
-                diff = list(unified_diff(
-                    original_lines, 
-                    new_lines,
-                    fromfile=f"Original: {filename}",
-                    tofile=f"Modified: {filename}",
-                    lineterm=''
-                ))
-                
-                diff_text = ""
-                for line in diff:
-                    color = "#D4D4D4"  
-                    if line.startswith('+'):
-                        color = "#6A9955" 
-                    elif line.startswith('-'):
-                        color = "#F44747" 
-                    elif line.startswith('@@'):
-                        color = "#569CD6" 
-                    
-                    diff_text += f"<span style='color: {color};'>{line}</span><br>"
-                
-                preview_text.setHtml(f"""
-                <div style='font-family: Consolas, monospace; white-space: pre;'>
-                {diff_text}
-                </div>
-                """)
+            return (filename, hash(file_info['original_content']), hash(file_info['new_content']))
+        
+        def show_diff(filename, result):
+            if filename != file_selector.currentText():
+                return
+            if result is None:
+                status_label.setText(f"Could not compute diff for {filename}")
+                preview_view.setModel(None)
+                return
+            if filename in self.pending_file_changes and not self.pending_file_changes[filename]['exists']:
+                status_label.setText(f"New file will be created: {filename} ({len(result.new_lines)} lines)")
             else:
-                preview_text.setHtml(f"""
-                <div style='color: #6A9955; font-family: Consolas, monospace;'>
-                # New file will be created: {filename}
-                </div>
-                <pre style='color: #D4D4D4; font-family: Consolas, monospace;'>
-                {file_info['new_content']}
-                </pre>
-                """)
+                status_label.setText(f"{filename}: {result.changed_lines} changed lines")
+            preview_view.setModel(DiffTableModel(result, preview_view))
+        
+        def diff_finished(filename, result):
+            if result is not None and filename in self.pending_file_changes:
+                self.diff_cache.put(cache_key(filename), result)
+            show_diff(filename, result)
+        
+        def update_preview(filename):
+            if filename not in self.pending_file_changes:
+                return
+            file_info = self.pending_file_changes[filename]
+            cached = self.diff_cache.get(cache_key(filename))
+            if cached is not None:
+                show_diff(filename, cached)
+                return
+            
+            status_label.setText(f"Computing diff for {filename}...")
+            preview_view.setModel(None)
+            original = file_info['original_content'] if file_info['exists'] else ""
+            worker = DiffWorker(filename, original, file_info['new_content'])
+            worker.diff_ready.connect(diff_finished)
+            worker.finished.connect(lambda: self.diff_workers.discard(worker))
+            diff_workers.append(worker)
+            # Referenced by the window until it finishes, so closing the dialog never waits for it
+            self.diff_workers.add(worker)
+            worker.start()
         
         file_selector.currentTextChanged.connect(update_preview)
         close_btn.clicked.connect(preview_dialog.close)
@@ -1775,6 +2591,9 @@ class SimpleIDE(QMainWindow):
             update_preview(file_selector.currentText())
         
         preview_dialog.exec()
+        
+        for worker in diff_workers:
+            worker.diff_ready.disconnect()
     
     def apply_file_change(self, filename):
         if not hasattr(self, 'pending_file_changes') or filename not in self.pending_file_changes:
@@ -1785,61 +2604,138 @@ class SimpleIDE(QMainWindow):
         if file_info['applied']:
             return 
         
-        try:
-            clean_filename = filename.replace('\n', '').replace('\r', '')
-            
-            full_path = file_info['full_path']
-            
-            full_path = os.path.normpath(full_path)
-            
-            directory = os.path.dirname(full_path)
-            if directory and not os.path.exists(directory):
-                try:
-                    os.makedirs(directory)
-                except Exception as e:
-                    print(f"Directory creation error for '{directory}': {str(e)}")
-                    self.chat_display.append(f"<div style='margin-bottom: 5px;'><span style='color: #F44747;'>Error creating directory for {clean_filename}: {str(e)}</span></div>")
-                    return False
-            
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(file_info['new_content'])
-            
-            file_info['applied'] = True
-            
-            self.chat_display.append(f"<div style='margin-bottom: 5px;'><span style='color: #6A9955;'>✓ Applied changes to: {clean_filename}</span></div>")
-            
-            if self.current_file and os.path.abspath(self.current_file) == os.path.abspath(full_path):
-                self.editor.setText(file_info['new_content'])
-                self.update_line_numbers()
-            
-            return True
-        except Exception as e:
-            
-            import traceback
-            error_details = traceback.format_exc()
-            print(f"Error applying changes to {filename}: {str(e)}")
-            print(f"Error details: {error_details}")
-            
-            self.chat_display.append(f"<div style='margin-bottom: 5px;'><span style='color: #F44747;'>Error applying changes to {filename}: {str(e)}</span></div>")
-            return False
+        return self._apply_change_set([filename]) == 1
     
+    @timed()
     def apply_all_file_changes(self):
         if not hasattr(self, 'pending_file_changes') or not self.pending_file_changes:
             return
         
-        success_count = 0
+        pending = [filename for filename, file_info in self.pending_file_changes.items() if not file_info['applied']]
+        total = len(self.pending_file_changes)
+        already_applied = total - len(pending)
+        success_count = already_applied + self._apply_change_set(pending)
         
-        for filename in self.pending_file_changes.keys():
-            if self.apply_file_change(filename):
-                success_count += 1
-        
-        if success_count == len(self.pending_file_changes):
+        if success_count == total:
             self.chat_display.append(f"<div style='margin-bottom: 10px;'><span style='color: #6A9955;'>✓ Successfully applied all changes ({success_count} files).</span></div>")
         else:
-            self.chat_display.append(f"<div style='margin-bottom: 10px;'><span style='color: #F44747;'>Applied changes to {success_count} out of {len(self.pending_file_changes)} files. See above for errors.</span></div>")
+            self.chat_display.append(f"<div style='margin-bottom: 10px;'><span style='color: #F44747;'>Applied changes to {success_count} out of {total} files. See above for errors.</span></div>")
         
         self.pending_file_changes = {}
     
+    def _apply_change_set(self, filenames):
+        """Writes the given pending changes in one transaction; returns the number of files applied"""
+        if not filenames:
+            return 0
+        
+        from ..utils.file_transaction import FileTransaction, FileTransactionError
+        
+        changes = {}
+        for filename in filenames:
+            file_info = self.pending_file_changes[filename]
+            changes[os.path.normpath(file_info['full_path'])] = file_info['new_content']
+        
+        try:
+            description = ", ".join(filenames)
+            journal_id = FileTransaction(changes, description=description).commit()
+        except FileTransactionError as e:
+            logger.error(f"Error applying change set: {str(e)}")
+            error_text = str(e).replace('\n', '<br>')
+            self.chat_display.append(f"<div style='margin-bottom: 5px;'><span style='color: #F44747;'>No changes were applied: {error_text}</span></div>")
+            return 0
+        
+        for filename in filenames:
+            file_info = self.pending_file_changes[filename]
+            file_info['applied'] = True
+            clean_filename = filename.replace('\n', '').replace('\r', '')
+            self.chat_display.append(f"<div style='margin-bottom: 5px;'><span style='color: #6A9955;'>✓ Applied changes to: {clean_filename}</span></div>")
+            
+            state = self.documents.for_path(file_info['full_path'])
+            if state and state.materialized:
+                self._merge_into_document(
+                    state, file_info['original_content'], file_info['new_content'],
+                    lambda hunks, conflicts, state=state, name=clean_filename:
+                        self._show_applied_change(state, name, hunks, conflicts)
+                )
+        
+        self.statusBar().showMessage(f"Applied AI change set {journal_id} ({len(filenames)} files). Use Edit → Undo Last AI Change Set to revert.", 10000)
+        return len(filenames)
+    
+    def _show_applied_change(self, state, clean_filename, hunks, conflicts):
+        was_modified = state.dirty
+        state.editor.apply_hunks(hunks)
+        if not was_modified and not conflicts:
+            state.editor.document().setModified(False)
+        state.update_mtime()
+        if state.editor is self.editor:
+            self.update_line_numbers()
+        if conflicts:
+            self.chat_display.append(f"<div style='margin-bottom: 5px;'><span style='color: #DCDCAA;'>{len(conflicts)} changes to {clean_filename} overlap unsaved edits and were not applied in the editor.</span></div>")
+    
+    def undo_last_change_set(self):
+        from ..utils.file_transaction import FileTransactionError, list_change_sets, revert_change_set
+        
+        change_sets = list_change_sets()
+        if not change_sets:
+            QMessageBox.information(self, "Undo AI Changes", "There is no AI change set to undo.")
+            return
+        
+        latest = change_sets[0]
+        file_names = "\n".join(latest['files'])
+        reply = QMessageBox.question(
+            self,
+            'Undo AI Changes',
+            f"Revert the last AI change set ({len(latest['files'])} files)?\n\n{file_names}",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        
+        # What open tabs' files hold now, so the revert merges into them like a reload, keeping unsaved edits
+        before = {}
+        for path in latest['files']:
+            state = self.documents.for_path(path)
+            if state is not None and state.materialized:
+                try:
+                    before[path] = (state, self._read_file(path)[0])
+                except OSError:
+                    pass
+        
+        try:
+            restored, skipped = revert_change_set(latest['id'])
+        except (FileTransactionError, OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"Could not undo AI changes: {str(e)}")
+            return
+        
+        for path in restored:
+            if path in before:
+                self._reload_reverted(*before[path])
+        
+        message = f"Reverted {len(restored)} files."
+        if skipped:
+            message += ("\n\nThese files were modified after the change was applied and were left untouched:\n"
+                        + "\n".join(skipped)
+                        + "\n\nThe change set was removed from the undo history.")
+        QMessageBox.information(self, "Undo AI Changes", message)
+    
+    def _reload_reverted(self, state, previous):
+        if state.editor is None:
+            return
+        try:
+            content, state.encoding = self._read_file(state.path)
+        except OSError as e:
+            logger.error(f"Error reloading {state.path}: {str(e)}")
+            return
+        
+        def reverted(hunks, conflicts):
+            state.reloading = False
+            self._show_applied_change(state, state.title, hunks, conflicts)
+            if state.editor is self.editor:
+                self.encoding_status.setText(state.encoding.upper())
+        
+        state.reloading = True
+        self._merge_into_document(state, previous, content, reverted, lambda: setattr(state, 'reloading', False))
+    
     def open_terminal(self):
         """Open an interactive terminal window"""
         self.save_file()
@@ -1996,8 +2892,7 @@ class SimpleIDE(QMainWindow):
             self.terminal_input.setFocus()
             
         except Exception as e:
-            print(f"Error creating terminal: {str(e)}")
-            traceback.print_exc()
+            logger.exception(f"Error creating terminal: {str(e)}")
 
     def execute_terminal_command(self):
         """Send a command to the terminal process"""
@@ -2015,6 +2910,7 @@ class SimpleIDE(QMainWindow):
         command += "\n"
         self.process.write(command.encode())
 
+    @timed()
     def handle_stdout(self):
         """Handle standard output from the process"""
         data = self.process.readAllStandardOutput().data().decode('utf-8', errors='replace')
@@ -2026,6 +2922,7 @@ class SimpleIDE(QMainWindow):
             cursor.movePosition(QTextCursor.MoveOperation.End)
             self.terminal_output.setTextCursor(cursor)
 
+    @timed()
     def handle_stderr(self):
         """Handle standard error from the process"""
         data = self.process.readAllStandardError().data().decode('utf-8', errors='replace')
@@ -2131,6 +3028,18 @@ class SimpleIDE(QMainWindow):
         cursor_pos = self.mapFromGlobal(self.cursor().pos())
         menu.exec(self.mapToGlobal(cursor_pos))
 
+    def show_llm_stats(self):
+        from .llm_stats_dialog import LLMStatsDialog
+        
+        dialog = LLMStatsDialog(self)
+        dialog.exec()
+    
+    def show_diagnostics(self):
+        from .diagnostics_panel import DiagnosticsDialog
+        
+        dialog = DiagnosticsDialog(self.watchdog, self)
+        dialog.exec()
+    
     def show_help_dialog(self):
         help_dialog = QDialog(self)
         help_dialog.setWindowTitle("About Parviz Mind IDE")
@@ -2151,7 +3060,7 @@ class SimpleIDE(QMainWindow):
             logo_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             layout.addWidget(logo_label)
         except Exception as e:
-            print(f"Error loading logo for help dialog: {str(e)}")
+            logger.error(f"Error loading logo for help dialog: {str(e)}")
         
         description = QLabel("An intelligent Python IDE with integrated AI assistance that helps you write, understand, and refactor code.")
         description.setWordWrap(True)
@@ -2219,63 +3128,44 @@ class SimpleIDE(QMainWindow):
         
         layout.addLayout(button_layout)
         
-    def find_text():
-        text = find_input.text()
-        if not text:
-            return
-        
-        cursor = self.editor.textCursor()
-        current_pos = cursor.position()
-        
-        document = self.editor.document()
-        finder = QTextDocument.FindFlag(0)
-        
-        cursor = document.find(text, current_pos, finder)
-        
-        if not cursor.isNull():
-            self.editor.setTextCursor(cursor)
-        else:
-            cursor = document.find(text, 0, finder)
+        def find_text():
+            text = find_input.text()
+            if not text:
+                return
+            
+            cursor = self.editor.textCursor()
+            current_pos = cursor.position()
+            
+            document = self.editor.document()
+            finder = QTextDocument.FindFlag(0)
+            
+            cursor = document.find(text, current_pos, finder)
+            
             if not cursor.isNull():
                 self.editor.setTextCursor(cursor)
-    
-    def replace_text():
-        if not find_input.text():
-            return
-        
-        cursor = self.editor.textCursor()
-        if cursor.hasSelection() and cursor.selectedText() == find_input.text():
-            cursor.insertText(replace_input.text())
-            find_text() 
-    
-    def replace_all_text():
-        text = find_input.text()
-        if not text:
-            return
-        
-        replace_with = replace_input.text()
-        
-        cursor = self.editor.textCursor()
-        cursor.beginEditBlock()
-        
-        cursor.movePosition(QTextCursor.MoveOperation.Start)
-        self.editor.setTextCursor(cursor)
+            else:
+                cursor = document.find(text, 0, finder)
+                if not cursor.isNull():
+                    self.editor.setTextCursor(cursor)
         
-        count = 0
-        while True:
-            found = self.editor.find(text)
-            if not found:
-                break
+        def replace_text():
+            if not find_input.text():
+                return
             
             cursor = self.editor.textCursor()
-            if cursor.hasSelection():
-                cursor.insertText(replace_with)
-                count += 1
+            if cursor.hasSelection() and cursor.selectedText() == find_input.text():
+                cursor.insertText(replace_input.text())
+                find_text() 
         
-        cursor.endEditBlock()
+        def replace_all_text():
+            text = find_input.text()
+            if not text:
+                return
+            
+            count = self.replace_all(text, replace_input.text())
+            
+            QMessageBox.information(find_dialog, "Replace Complete", f"Replaced {count} occurrences.")
         
-        QMessageBox.information(find_dialog, "Replace Complete", f"Replaced {count} occurrences.")
-    
         find_btn.clicked.connect(find_text)
         replace_btn.clicked.connect(replace_text)
         replace_all_btn.clicked.connect(replace_all_text)
@@ -2284,6 +3174,22 @@ class SimpleIDE(QMainWindow):
         find_input.setFocus()
         
         find_dialog.exec()
+    
+    def replace_all(self, text, replace_with):
+        """Replaces every occurrence in the current editor as a single undo step; returns the count"""
+        document = self.editor.document()
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        
+        count = 0
+        found = document.find(text, 0)
+        while not found.isNull():
+            found.insertText(replace_with)
+            count += 1
+            found = document.find(text, found)
+        
+        cursor.endEditBlock()
+        return count
 
     def increase_font_size(self):
         font = self.editor.font()
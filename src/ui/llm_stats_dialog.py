@@ -0,0 +1,94 @@
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QAbstractItemView, QPushButton, QLabel)
+
+from ..services.telemetry import metrics_store, summarize
+
+COLUMNS = [
+    ("Model", None, ""),
+    ("Requests", 'requests', "{:.0f}"),
+    ("Errors", 'errors', "{:.0f}"),
+    ("TTFT p50", 'ttft_p50', "{:.0f} ms"),
+    ("TTFT p90", 'ttft_p90', "{:.0f} ms"),
+    ("TTFT p99", 'ttft_p99', "{:.0f} ms"),
+    ("Total p50", 'total_p50', "{:.0f} ms"),
+    ("Total p90", 'total_p90', "{:.0f} ms"),
+    ("Tokens/s p50", 'tokens_per_second_p50', "{:.1f}"),
+    ("Queue p50", 'queue_p50', "{:.1f} ms"),
+    ("Parse p50", 'parse_p50', "{:.1f} ms"),
+    ("Prompt tokens (avg)", 'prompt_tokens_avg', "{:.0f}"),
+    ("Completion tokens (avg)", 'completion_tokens_avg', "{:.0f}"),
+]
+
+
+class NumericItem(QTableWidgetItem):
+    """Sorts by the numeric value instead of the display text with its unit"""
+
+    def __init__(self, value, text):
+        super().__init__(text)
+        self.value = value
+
+    def __lt__(self, other):
+        if isinstance(other, NumericItem):
+            return self.value < other.value
+        return super().__lt__(other)
+
+
+class LLMStatsDialog(QDialog):
+    """Per-model latency and token statistics from the metrics file"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("AI Request Statistics")
+        self.resize(1100, 400)
+
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _, _ in COLUMNS])
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        self.summary_label = QLabel("")
+        self.summary_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        button_layout.addWidget(self.summary_label)
+        button_layout.addStretch()
+
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        button_layout.addWidget(refresh_btn)
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+        self.refresh()
+
+    def refresh(self):
+        records = metrics_store.load()
+        summary = summarize(records)
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(summary))
+        for row, (model, stats) in enumerate(sorted(summary.items())):
+            for column, (_, key, template) in enumerate(COLUMNS):
+                if key is None:
+                    item = QTableWidgetItem(model)
+                else:
+                    value = stats.get(key)
+                    if value is None:
+                        item = NumericItem(-1.0, "-")
+                    else:
+                        item = NumericItem(float(value), template.format(value))
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+
+        self.summary_label.setText(f"{len(records)} requests recorded in {metrics_store.path}")
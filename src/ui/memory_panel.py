@@ -0,0 +1,241 @@
+import os
+import time
+
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QFont, QTextCursor
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QAbstractItemView, QPlainTextEdit, QPushButton, QLabel, QSplitter,
+                             QListWidget, QComboBox, QSpinBox)
+
+from .llm_stats_dialog import NumericItem
+from ..services.memory_profiler import MemoryRunner, SnapshotAnalyzer, GROUP_BY_LINE, GROUP_BY_FILE
+
+SITE_HEADERS = ["Location", "File", "Line", "Size (KiB)", "Blocks", "Size change (KiB)", "Block change"]
+
+
+def format_bytes(size):
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+class MemoryPanel(QWidget):
+    """Snapshots of a tracemalloc run with their top allocation sites and diffs"""
+
+    location_activated = pyqtSignal(str, int)
+    rerun_requested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.runner = MemoryRunner(self)
+        self.runner.output_received.connect(self.append_output)
+        self.runner.snapshots_changed.connect(self.update_snapshots)
+        self.runner.run_finished.connect(self.run_finished)
+        self.script = None
+        self.snapshots = []
+        self.sites = []
+        self.analyzer = None
+        self.pending_analysis = None
+        self.analysis_key = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        header = QHBoxLayout()
+        self.summary_label = QLabel("No memory profile yet")
+        header.addWidget(self.summary_label)
+        header.addStretch()
+
+        header.addWidget(QLabel("Auto snapshot every"))
+        self.interval_spin = QSpinBox()
+        self.interval_spin.setRange(0, 3600)
+        self.interval_spin.setSuffix(" s")
+        self.interval_spin.setSpecialValueText("off")
+        self.interval_spin.setToolTip("Applies to the next run")
+        header.addWidget(self.interval_spin)
+
+        self.snapshot_btn = QPushButton("Take Snapshot")
+        self.snapshot_btn.setEnabled(False)
+        self.snapshot_btn.clicked.connect(self.take_snapshot)
+        header.addWidget(self.snapshot_btn)
+
+        self.rerun_btn = QPushButton("Run Again")
+        self.rerun_btn.clicked.connect(self.rerun_requested)
+        header.addWidget(self.rerun_btn)
+
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.runner.stop)
+        header.addWidget(self.stop_btn)
+        layout.addLayout(header)
+
+        self.tabs = QTabWidget()
+        layout.addWidget(self.tabs)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.snapshot_list = QListWidget()
+        self.snapshot_list.currentRowChanged.connect(self.analyze_selection)
+        splitter.addWidget(self.snapshot_list)
+
+        sites_widget = QWidget()
+        sites_layout = QVBoxLayout(sites_widget)
+        sites_layout.setContentsMargins(0, 0, 0, 0)
+        options = QHBoxLayout()
+        options.addWidget(QLabel("Group by:"))
+        self.group_combo = QComboBox()
+        self.group_combo.addItem("File and line", GROUP_BY_LINE)
+        self.group_combo.addItem("File", GROUP_BY_FILE)
+        self.group_combo.currentIndexChanged.connect(self.analyze_selection)
+        options.addWidget(self.group_combo)
+        options.addWidget(QLabel("Compare with:"))
+        self.compare_combo = QComboBox()
+        self.compare_combo.currentIndexChanged.connect(self.analyze_selection)
+        options.addWidget(self.compare_combo)
+        options.addStretch()
+        sites_layout.addLayout(options)
+
+        self.site_table = QTableWidget(0, len(SITE_HEADERS))
+        self.site_table.setHorizontalHeaderLabels(SITE_HEADERS)
+        self.site_table.verticalHeader().hide()
+        self.site_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.site_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.site_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.site_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.site_table.cellDoubleClicked.connect(self.open_site)
+        sites_layout.addWidget(self.site_table)
+        splitter.addWidget(sites_widget)
+        splitter.setSizes([220, 700])
+        self.tabs.addTab(splitter, "Allocations")
+
+        self.output_view = QPlainTextEdit()
+        self.output_view.setReadOnly(True)
+        self.output_view.setFont(QFont('Consolas', 9))
+        self.tabs.addTab(self.output_view, "Output")
+
+    def start(self, script, interpreter=None):
+        if self.runner.is_running():
+            return False
+        self.script = script
+        self.output_view.clear()
+        self.site_table.setRowCount(0)
+        self.tabs.setCurrentWidget(self.output_view)
+        self.summary_label.setText(f"Tracing allocations of {os.path.basename(script)}...")
+        self.snapshot_btn.setEnabled(True)
+        self.stop_btn.setEnabled(True)
+        self.rerun_btn.setEnabled(False)
+        return self.runner.start(script, interpreter, self.interval_spin.value())
+
+    def take_snapshot(self):
+        if self.runner.request_snapshot():
+            self.summary_label.setText("Snapshot requested...")
+
+    def append_output(self, text):
+        self.output_view.moveCursor(QTextCursor.MoveOperation.End)
+        self.output_view.insertPlainText(text)
+        self.output_view.ensureCursorVisible()
+
+    def run_finished(self, exit_code, error):
+        self.snapshot_btn.setEnabled(False)
+        self.stop_btn.setEnabled(False)
+        self.rerun_btn.setEnabled(True)
+        name = os.path.basename(self.script) if self.script else ""
+        if error:
+            self.summary_label.setText(f"{name}: {error}")
+            return
+        peak = max(snapshot.peak for snapshot in self.snapshots)
+        self.summary_label.setText(
+            f"{name}: exit code {exit_code}, {len(self.snapshots)} snapshots, peak {format_bytes(peak)} traced"
+        )
+        self.tabs.setCurrentIndex(0)
+
+    def update_snapshots(self, snapshots):
+        self.snapshots = snapshots
+        selected = self.snapshot_list.currentRow()
+        compare = self.compare_combo.currentIndex()
+
+        self.snapshot_list.blockSignals(True)
+        self.compare_combo.blockSignals(True)
+        self.snapshot_list.clear()
+        self.compare_combo.clear()
+        self.compare_combo.addItem("(nothing)", None)
+        for index, snapshot in enumerate(snapshots, start=1):
+            taken = time.strftime('%H:%M:%S', time.localtime(snapshot.time)) if snapshot.time else ""
+            label = f"#{index} {snapshot.label}  {format_bytes(snapshot.current)}  {taken}"
+            self.snapshot_list.addItem(label)
+            self.compare_combo.addItem(f"#{index} {snapshot.label}", snapshot.path)
+        self.compare_combo.setCurrentIndex(compare if 0 <= compare < self.compare_combo.count() else 0)
+        self.compare_combo.blockSignals(False)
+        self.snapshot_list.blockSignals(False)
+
+        if snapshots:
+            self.tabs.setCurrentIndex(0)
+            # Follow the newest snapshot unless an older one was picked
+            if selected < 0 or selected == len(snapshots) - 2 or selected >= len(snapshots):
+                selected = len(snapshots) - 1
+            self.snapshot_list.setCurrentRow(selected)
+            self.analyze_selection()
+
+    def analyze_selection(self, *args):
+        row = self.snapshot_list.currentRow()
+        if not 0 <= row < len(self.snapshots):
+            return
+        path = self.snapshots[row].path
+        base_path = self.compare_combo.currentData()
+        if base_path == path:
+            base_path = None
+        key = (path, self.group_combo.currentData(), base_path)
+        if key == self.analysis_key:
+            return
+        self.pending_analysis = key
+        self._start_pending_analysis()
+
+    def _start_pending_analysis(self):
+        if self.pending_analysis is None or (self.analyzer is not None and self.analyzer.isRunning()):
+            return
+        key, self.pending_analysis = self.pending_analysis, None
+        self.analysis_key = key
+        self.analyzer = SnapshotAnalyzer(key, *key)
+        self.analyzer.analyzed.connect(self.show_sites)
+        self.analyzer.finished.connect(self._start_pending_analysis)
+        self.analyzer.start()
+
+    def show_sites(self, key, sites):
+        if key != self.analysis_key:
+            return
+        if sites is None:
+            self.summary_label.setText("Could not read the snapshot")
+            sites = []
+        self.sites = sites
+        comparing = key[2] is not None
+        table = self.site_table
+        table.setSortingEnabled(False)
+        table.setRowCount(len(sites))
+        for row, site in enumerate(sites):
+            location = os.path.basename(site.filename) + (f":{site.line}" if site.line else "")
+            location_item = QTableWidgetItem(location)
+            location_item.setData(Qt.ItemDataRole.UserRole, row)
+            table.setItem(row, 0, location_item)
+            table.setItem(row, 1, QTableWidgetItem(site.filename))
+            values = [
+                (site.line, str(site.line) if site.line else ""),
+                (site.size, f"{site.size / 1024:.1f}"),
+                (site.count, str(site.count)),
+                (site.size_diff, f"{site.size_diff / 1024:+.1f}" if comparing else ""),
+                (site.count_diff, f"{site.count_diff:+d}" if comparing else ""),
+            ]
+            for column, (value, text) in enumerate(values, start=2):
+                item = NumericItem(float(value), text)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                table.setItem(row, column, item)
+        table.setSortingEnabled(True)
+        table.sortItems(5 if comparing else 3, Qt.SortOrder.DescendingOrder)
+
+    def open_site(self, row, column):
+        item = self.site_table.item(row, 0)
+        if item is None:
+            return
+        site = self.sites[item.data(Qt.ItemDataRole.UserRole)]
+        if os.path.isfile(site.filename):
+            self.location_activated.emit(site.filename, max(site.line, 1))
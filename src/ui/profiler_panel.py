@@ -0,0 +1,349 @@
+import os
+import zlib
+
+from PyQt6.QtCore import Qt, QRectF, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QPainter, QPen, QTextCursor
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QAbstractItemView, QPlainTextEdit, QPushButton, QLabel, QCheckBox,
+                             QScrollArea, QToolTip)
+
+from .llm_stats_dialog import NumericItem
+from ..services.profiler import ProfileRunner, function_label, sampling_profiler_path
+
+FUNCTION_HEADERS = ["Function", "File", "Line", "Calls", "Own (ms)", "Own/call (ms)",
+                    "Cumulative (ms)", "Cum/call (ms)"]
+LINE_HEADERS = ["Line", "Hits", "Time (ms)", "Per hit (us)", "% Time", "Source"]
+MAX_TABLE_ROWS = 2000
+FLAME_ROW_HEIGHT = 18
+MIN_FLAME_WIDTH = 2
+
+
+class FlameGraphWidget(QWidget):
+    """
+    Icicle-style flame graph: callers on top, callees below, widths
+    proportional to time. Click a frame to zoom in, right-click to zoom out,
+    double-click to jump to its source.
+    """
+
+    location_activated = pyqtSignal(str, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = None
+        self.zoom_stack = []
+        self.unit = "s"
+        self.frames = []
+        self.setMouseTracking(True)
+        self.setFont(QFont('Consolas', 8))
+
+    def set_root(self, root, unit="s"):
+        self.root = root
+        self.unit = unit
+        self.zoom_stack = [root] if root is not None else []
+        self._update_height()
+        self.update()
+
+    @property
+    def zoomed(self):
+        return self.zoom_stack[-1] if self.zoom_stack else None
+
+    def zoom_out(self):
+        if len(self.zoom_stack) > 1:
+            self.zoom_stack.pop()
+            self._update_height()
+            self.update()
+
+    def reset_zoom(self):
+        if self.zoom_stack:
+            self.zoom_stack = self.zoom_stack[:1]
+            self._update_height()
+            self.update()
+
+    def _update_height(self):
+        depth = self.zoomed.depth() if self.zoomed is not None else 1
+        self.setMinimumHeight(depth * FLAME_ROW_HEIGHT + 4)
+
+    def _format_value(self, value):
+        if self.unit == "s":
+            return f"{value * 1000:.1f} ms"
+        return f"{value:.0f} {self.unit}"
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#1E1E1E"))
+        self.frames = []
+        root = self.zoomed
+        if root is None or root.value <= 0:
+            painter.setPen(QColor("#888888"))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "No profile data")
+            return
+
+        scale = self.width() / root.value
+        visible_top = event.rect().top()
+        visible_bottom = event.rect().bottom()
+        metrics = painter.fontMetrics()
+
+        def draw(node, x, depth):
+            width = node.value * scale
+            if width < MIN_FLAME_WIDTH:
+                return
+            y = depth * FLAME_ROW_HEIGHT
+            if y > visible_bottom:
+                return
+            rect = QRectF(x, y, width - 1, FLAME_ROW_HEIGHT - 1)
+            self.frames.append((rect, node))
+            if y + FLAME_ROW_HEIGHT >= visible_top:
+                hue = zlib.crc32((node.filename or node.name).encode()) % 50
+                painter.fillRect(rect, QColor.fromHsv(hue, 160, 200))
+                if width > 30:
+                    painter.setPen(QPen(QColor("#1E1E1E")))
+                    text = metrics.elidedText(node.label, Qt.TextElideMode.ElideRight, int(width) - 6)
+                    painter.drawText(rect.adjusted(3, 0, -3, 0),
+                                     Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, text)
+            child_x = x
+            for child in sorted(node.children.values(), key=lambda child: child.value, reverse=True):
+                draw(child, child_x, depth + 1)
+                child_x += child.value * scale
+
+        draw(root, 0.0, 0)
+
+    def frame_at(self, position):
+        for rect, node in reversed(self.frames):
+            if rect.contains(position):
+                return node
+        return None
+
+    def mouseMoveEvent(self, event):
+        node = self.frame_at(event.position())
+        if node is None or self.root is None:
+            QToolTip.hideText()
+            return
+        share = node.value / self.root.value * 100 if self.root.value else 0
+        location = f"\n{node.filename}:{node.line}" if node.filename and node.filename != '~' else ""
+        QToolTip.showText(event.globalPosition().toPoint(),
+                          f"{node.label}\n{self._format_value(node.value)} ({share:.1f}%){location}", self)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.RightButton:
+            self.zoom_out()
+            return
+        node = self.frame_at(event.position())
+        if node is not None and node is not self.zoomed and node.children:
+            self.zoom_stack.append(node)
+            self._update_height()
+            self.update()
+
+    def mouseDoubleClickEvent(self, event):
+        node = self.frame_at(event.position())
+        if node is not None and node.filename and os.path.isfile(node.filename):
+            self.location_activated.emit(node.filename, node.line)
+
+
+class ProfilerPanel(QWidget):
+    """Output, hot-function table, flame graph and line timings of the last profiled run"""
+
+    location_activated = pyqtSignal(str, int)
+    line_timings_ready = pyqtSignal(str, object)
+    rerun_requested = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.runner = ProfileRunner(self)
+        self.runner.output_received.connect(self.append_output)
+        self.runner.run_finished.connect(self.show_result)
+        self.functions = []
+        self.line_timing = False
+        self.line_script = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        header = QHBoxLayout()
+        self.summary_label = QLabel("No profile yet")
+        header.addWidget(self.summary_label)
+        header.addStretch()
+
+        self.sampling_check = QCheckBox("Sample with py-spy")
+        available = sampling_profiler_path() is not None
+        self.sampling_check.setChecked(available)
+        self.sampling_check.setEnabled(available)
+        if not available:
+            self.sampling_check.setToolTip("py-spy was not found on PATH; the flame graph is built from cProfile data")
+        header.addWidget(self.sampling_check)
+
+        self.rerun_btn = QPushButton("Profile Again")
+        self.rerun_btn.clicked.connect(lambda: self.rerun_requested.emit(self.line_timing))
+        header.addWidget(self.rerun_btn)
+
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.runner.stop)
+        header.addWidget(self.stop_btn)
+        layout.addLayout(header)
+
+        self.tabs = QTabWidget()
+        layout.addWidget(self.tabs)
+
+        self.function_table = QTableWidget(0, len(FUNCTION_HEADERS))
+        self.function_table.setHorizontalHeaderLabels(FUNCTION_HEADERS)
+        self.function_table.verticalHeader().hide()
+        self.function_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.function_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.function_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.function_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.function_table.cellDoubleClicked.connect(self.open_function)
+        self.tabs.addTab(self.function_table, "Hot Functions")
+
+        flame_tab = QWidget()
+        flame_layout = QVBoxLayout(flame_tab)
+        flame_layout.setContentsMargins(0, 0, 0, 0)
+        flame_buttons = QHBoxLayout()
+        self.flame_label = QLabel("")
+        flame_buttons.addWidget(self.flame_label)
+        flame_buttons.addStretch()
+        reset_zoom_btn = QPushButton("Reset Zoom")
+        flame_buttons.addWidget(reset_zoom_btn)
+        flame_layout.addLayout(flame_buttons)
+
+        self.flame_graph = FlameGraphWidget()
+        self.flame_graph.location_activated.connect(self.location_activated)
+        reset_zoom_btn.clicked.connect(self.flame_graph.reset_zoom)
+        flame_scroll = QScrollArea()
+        flame_scroll.setWidgetResizable(True)
+        flame_scroll.setWidget(self.flame_graph)
+        flame_layout.addWidget(flame_scroll)
+        self.tabs.addTab(flame_tab, "Flame Graph")
+
+        self.line_table = QTableWidget(0, len(LINE_HEADERS))
+        self.line_table.setHorizontalHeaderLabels(LINE_HEADERS)
+        self.line_table.verticalHeader().hide()
+        self.line_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.line_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.line_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.line_table.horizontalHeader().setSectionResizeMode(len(LINE_HEADERS) - 1, QHeaderView.ResizeMode.Stretch)
+        self.line_table.cellDoubleClicked.connect(self.open_line)
+        self.tabs.addTab(self.line_table, "Lines")
+
+        self.output_view = QPlainTextEdit()
+        self.output_view.setReadOnly(True)
+        self.output_view.setFont(QFont('Consolas', 9))
+        self.tabs.addTab(self.output_view, "Output")
+
+    def start(self, script, interpreter=None, line_timing=False):
+        if self.runner.is_running():
+            return False
+        self.line_timing = line_timing
+        self.output_view.clear()
+        self.tabs.setCurrentWidget(self.output_view)
+        action = "Timing lines of" if line_timing else "Profiling"
+        self.summary_label.setText(f"{action} {os.path.basename(script)}...")
+        self.stop_btn.setEnabled(True)
+        self.rerun_btn.setEnabled(False)
+        return self.runner.start(script, interpreter, self.sampling_check.isChecked(), line_timing=line_timing)
+
+    def append_output(self, text):
+        self.output_view.moveCursor(QTextCursor.MoveOperation.End)
+        self.output_view.insertPlainText(text)
+        self.output_view.ensureCursorVisible()
+
+    def show_result(self, result):
+        self.stop_btn.setEnabled(False)
+        self.rerun_btn.setEnabled(True)
+        name = os.path.basename(result.script)
+        if result.error:
+            self.summary_label.setText(f"{name}: {result.error}")
+            return
+
+        if result.line_timing:
+            self.summary_label.setText(
+                f"{name}: exit code {result.exit_code}, {result.wall_time:.2f} s wall, "
+                f"{len(result.lines)} lines timed with {result.line_backend}"
+            )
+            self._fill_line_table(result)
+            self.tabs.setCurrentWidget(self.line_table)
+            self.line_timings_ready.emit(result.script, result.lines)
+            return
+
+        self.summary_label.setText(
+            f"{name}: exit code {result.exit_code}, {result.wall_time:.2f} s wall, "
+            f"{result.total_time:.2f} s profiled, {len(result.functions)} functions"
+        )
+        self.functions = result.functions[:MAX_TABLE_ROWS]
+        self._fill_function_table()
+
+        self.flame_graph.set_root(result.flame, result.flame_unit)
+        source = "py-spy samples" if result.flame_unit == "samples" else "cProfile call graph"
+        self.flame_label.setText(f"From {source}. Click to zoom, right-click to zoom out, double-click to open.")
+        self.tabs.setCurrentWidget(self.function_table)
+
+    def _fill_function_table(self):
+        table = self.function_table
+        table.setSortingEnabled(False)
+        table.setRowCount(len(self.functions))
+        for row, function in enumerate(self.functions):
+            own_per_call = function.own_time / function.calls if function.calls else 0.0
+            cumulative_per_call = function.cumulative_time / function.primitive_calls if function.primitive_calls else 0.0
+            calls = (str(function.calls) if function.calls == function.primitive_calls
+                     else f"{function.calls}/{function.primitive_calls}")
+
+            name_item = QTableWidgetItem(function_label(function.filename, function.name))
+            name_item.setData(Qt.ItemDataRole.UserRole, row)
+            table.setItem(row, 0, name_item)
+            table.setItem(row, 1, QTableWidgetItem(function.filename))
+            values = [
+                (function.line, str(function.line)),
+                (function.calls, calls),
+                (function.own_time, f"{function.own_time * 1000:.2f}"),
+                (own_per_call, f"{own_per_call * 1000:.3f}"),
+                (function.cumulative_time, f"{function.cumulative_time * 1000:.2f}"),
+                (cumulative_per_call, f"{cumulative_per_call * 1000:.3f}"),
+            ]
+            for column, (value, text) in enumerate(values, start=2):
+                item = NumericItem(float(value), text)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                table.setItem(row, column, item)
+        table.setSortingEnabled(True)
+        table.sortItems(4, Qt.SortOrder.DescendingOrder)
+
+    def _fill_line_table(self, result):
+        self.line_script = result.script
+        try:
+            with open(result.script, 'r', encoding='utf-8', errors='replace') as f:
+                source = f.read().splitlines()
+        except OSError:
+            source = []
+
+        table = self.line_table
+        table.setSortingEnabled(False)
+        table.setRowCount(len(result.lines))
+        for row, (line, (hits, seconds)) in enumerate(result.lines.items()):
+            per_hit = seconds / hits if hits else 0.0
+            share = seconds / result.total_time * 100 if result.total_time else 0.0
+            values = [
+                (line, str(line)),
+                (hits, str(hits)),
+                (seconds, f"{seconds * 1000:.2f}"),
+                (per_hit, f"{per_hit * 1000000:.1f}"),
+                (share, f"{share:.1f}"),
+            ]
+            for column, (value, text) in enumerate(values):
+                item = NumericItem(float(value), text)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                table.setItem(row, column, item)
+            text = source[line - 1].strip() if 0 < line <= len(source) else ""
+            table.setItem(row, len(values), QTableWidgetItem(text))
+        table.setSortingEnabled(True)
+        table.sortItems(2, Qt.SortOrder.DescendingOrder)
+
+    def open_line(self, row, column):
+        item = self.line_table.item(row, 0)
+        if item is not None and self.line_script:
+            self.location_activated.emit(self.line_script, int(item.value))
+
+    def open_function(self, row, column):
+        item = self.function_table.item(row, 0)
+        if item is None:
+            return
+        function = self.functions[item.data(Qt.ItemDataRole.UserRole)]
+        if os.path.isfile(function.filename):
+            self.location_activated.emit(function.filename, function.line)
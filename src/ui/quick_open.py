@@ -0,0 +1,82 @@
+import time
+
+from PyQt6.QtCore import Qt, QEvent, pyqtSignal
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QLabel
+
+
+class QuickOpenDialog(QDialog):
+    """Go to File: fuzzy matches from the path index, updated on every keystroke"""
+
+    file_selected = pyqtSignal(str)
+
+    def __init__(self, path_index, parent=None):
+        super().__init__(parent)
+        self.path_index = path_index
+        self.setWindowTitle("Go to File")
+        self.setMinimumWidth(600)
+        self.resize(600, 420)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 6, 6, 6)
+
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText("File name or path, e.g. idewin or ui/ide")
+        self.query_input.textChanged.connect(self.update_results)
+        self.query_input.installEventFilter(self)
+        layout.addWidget(self.query_input)
+
+        self.result_list = QListWidget()
+        self.result_list.itemActivated.connect(self.open_item)
+        layout.addWidget(self.result_list)
+
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #888888;")
+        layout.addWidget(self.status_label)
+
+        self.path_index.updated.connect(self.update_results)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.query_input.selectAll()
+        self.query_input.setFocus()
+        # Pick up files created or removed since the last look; results follow when it is done
+        self.path_index.refresh()
+        self.update_results()
+
+    def eventFilter(self, obj, event):
+        if obj is self.query_input and event.type() == QEvent.Type.KeyPress:
+            key = event.key()
+            if key in (Qt.Key.Key_Down, Qt.Key.Key_Up, Qt.Key.Key_PageDown, Qt.Key.Key_PageUp):
+                self.result_list.keyPressEvent(event)
+                return True
+            if key in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+                self.open_item(self.result_list.currentItem())
+                return True
+        return super().eventFilter(obj, event)
+
+    def update_results(self, *args):
+        started = time.perf_counter()
+        paths = self.path_index.search(self.query_input.text())
+        elapsed = (time.perf_counter() - started) * 1000
+
+        self.result_list.clear()
+        for path in paths:
+            folder, _, name = path.rpartition('/')
+            item = QListWidgetItem(f"{name}    {folder}" if folder else name)
+            item.setData(Qt.ItemDataRole.UserRole, path)
+            item.setToolTip(path)
+            self.result_list.addItem(item)
+        if paths:
+            self.result_list.setCurrentRow(0)
+
+        total = len(self.path_index.snapshot)
+        status = f"{len(paths)} of {total:,} files ({elapsed:.1f} ms)"
+        if self.path_index.is_indexing():
+            status += ", indexing..."
+        self.status_label.setText(status)
+
+    def open_item(self, item):
+        if item is None:
+            return
+        self.file_selected.emit(self.path_index.absolute_path(item.data(Qt.ItemDataRole.UserRole)))
+        self.accept()
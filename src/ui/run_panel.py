@@ -0,0 +1,319 @@
+import os
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QDialog, QDialogButtonBox,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QPlainTextEdit,
+                             QPushButton, QLabel, QSplitter, QListWidget, QLineEdit, QSpinBox, QStackedWidget,
+                             QFileDialog, QMessageBox)
+
+from ..services.run_configurations import (RunConfiguration, RunConfigurationStore, RunManager,
+                                           parse_cpu_list, format_cpu_list, QUEUED, RUNNING)
+
+RUN_HEADERS = ["Run", "State", "PID", "Wall (s)", "CPU (s)", "Exit code"]
+MAX_OUTPUT_LINES = 20000
+REFRESH_MS = 500
+
+
+class RunConfigurationDialog(QDialog):
+    def __init__(self, configuration, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Run Configuration")
+        self.setMinimumWidth(520)
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+
+        self.name_input = QLineEdit(configuration.name)
+        form.addRow("Name:", self.name_input)
+
+        script_layout = QHBoxLayout()
+        self.script_input = QLineEdit(configuration.script)
+        browse_btn = QPushButton("...")
+        browse_btn.setFixedWidth(30)
+        browse_btn.clicked.connect(self.browse_script)
+        script_layout.addWidget(self.script_input)
+        script_layout.addWidget(browse_btn)
+        form.addRow("Script:", script_layout)
+
+        self.args_input = QLineEdit(configuration.args)
+        form.addRow("Arguments:", self.args_input)
+
+        self.working_dir_input = QLineEdit(configuration.working_dir)
+        self.working_dir_input.setPlaceholderText("Script folder")
+        form.addRow("Working directory:", self.working_dir_input)
+
+        self.interpreter_input = QLineEdit(configuration.interpreter)
+        self.interpreter_input.setPlaceholderText("python3 / python")
+        form.addRow("Interpreter:", self.interpreter_input)
+
+        self.cpus_input = QLineEdit(format_cpu_list(configuration.cpus))
+        self.cpus_input.setPlaceholderText(f"Any of {os.cpu_count() or 1} CPUs, e.g. 0-3,6")
+        form.addRow("CPU affinity:", self.cpus_input)
+
+        self.env_input = QPlainTextEdit("\n".join(f"{key}={value}" for key, value in configuration.env.items()))
+        self.env_input.setPlaceholderText("KEY=VALUE, one per line")
+        self.env_input.setFixedHeight(90)
+        form.addRow("Environment:", self.env_input)
+        layout.addLayout(form)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def browse_script(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Script", self.script_input.text(),
+                                              "Python Files (*.py);;All Files (*)")
+        if path:
+            self.script_input.setText(path)
+
+    def accept(self):
+        if not self.name_input.text().strip() or not os.path.isfile(self.script_input.text().strip()):
+            QMessageBox.warning(self, "Warning", "A run configuration needs a name and an existing script")
+            return
+        try:
+            parse_cpu_list(self.cpus_input.text())
+        except ValueError:
+            QMessageBox.warning(self, "Warning", "CPU affinity must look like 0-3,6")
+            return
+        super().accept()
+
+    def configuration(self):
+        env = {}
+        for line in self.env_input.toPlainText().splitlines():
+            key, separator, value = line.partition("=")
+            if separator and key.strip():
+                env[key.strip()] = value
+        return RunConfiguration(
+            self.name_input.text().strip(),
+            self.script_input.text().strip(),
+            self.args_input.text().strip(),
+            self.working_dir_input.text().strip(),
+            self.interpreter_input.text().strip(),
+            env,
+            parse_cpu_list(self.cpus_input.text()),
+        )
+
+
+class RunPanel(QWidget):
+    """Run configurations on the left; their runs, each with its own output pane, on the right"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store = RunConfigurationStore()
+        self.configurations, max_parallel = self.store.load()
+        self.manager = RunManager(max_parallel, self)
+        self.manager.run_changed.connect(self.update_run)
+        self.manager.output_received.connect(self.append_output)
+        self.rows = {}
+        self.outputs = {}
+        self.default_script = None
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        layout.addWidget(splitter)
+
+        left = QWidget()
+        left_layout = QVBoxLayout(left)
+        left_layout.setContentsMargins(0, 0, 0, 0)
+        left_layout.addWidget(QLabel("Configurations"))
+        self.configuration_list = QListWidget()
+        self.configuration_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.configuration_list.itemDoubleClicked.connect(lambda item: self.run_selected())
+        left_layout.addWidget(self.configuration_list)
+
+        buttons = QHBoxLayout()
+        for text, slot in (("New", self.new_configuration), ("Edit", self.edit_configuration),
+                           ("Delete", self.delete_configuration)):
+            button = QPushButton(text)
+            button.clicked.connect(slot)
+            buttons.addWidget(button)
+        left_layout.addLayout(buttons)
+
+        run_buttons = QHBoxLayout()
+        run_btn = QPushButton("Run Selected")
+        run_btn.clicked.connect(self.run_selected)
+        run_buttons.addWidget(run_btn)
+        run_buttons.addWidget(QLabel("Parallel:"))
+        self.parallel_spin = QSpinBox()
+        self.parallel_spin.setRange(1, max(64, os.cpu_count() or 1))
+        self.parallel_spin.setValue(self.manager.max_parallel)
+        self.parallel_spin.setToolTip("Runs beyond this limit wait in a queue")
+        self.parallel_spin.valueChanged.connect(self.set_max_parallel)
+        run_buttons.addWidget(self.parallel_spin)
+        left_layout.addLayout(run_buttons)
+        splitter.addWidget(left)
+
+        right = QSplitter(Qt.Orientation.Vertical)
+        runs_widget = QWidget()
+        runs_layout = QVBoxLayout(runs_widget)
+        runs_layout.setContentsMargins(0, 0, 0, 0)
+        self.run_table = QTableWidget(0, len(RUN_HEADERS))
+        self.run_table.setHorizontalHeaderLabels(RUN_HEADERS)
+        self.run_table.verticalHeader().hide()
+        self.run_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.run_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.run_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.run_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.run_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.run_table.currentCellChanged.connect(lambda row, column, previous_row, previous_column: self.show_output(row))
+        runs_layout.addWidget(self.run_table)
+
+        run_actions = QHBoxLayout()
+        run_actions.addStretch()
+        stop_btn = QPushButton("Stop")
+        stop_btn.clicked.connect(self.stop_selected)
+        run_actions.addWidget(stop_btn)
+        stop_all_btn = QPushButton("Stop All")
+        stop_all_btn.clicked.connect(self.manager.stop_all)
+        run_actions.addWidget(stop_all_btn)
+        clear_btn = QPushButton("Clear Finished")
+        clear_btn.clicked.connect(self.clear_finished)
+        run_actions.addWidget(clear_btn)
+        runs_layout.addLayout(run_actions)
+        right.addWidget(runs_widget)
+
+        self.output_stack = QStackedWidget()
+        self.output_stack.addWidget(QLabel("Select a run to see its output"))
+        right.addWidget(self.output_stack)
+        right.setSizes([150, 300])
+        splitter.addWidget(right)
+        splitter.setSizes([250, 750])
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh_running)
+        self.refresh_timer.start(REFRESH_MS)
+
+        self._fill_configuration_list()
+
+    def _fill_configuration_list(self):
+        self.configuration_list.clear()
+        for configuration in self.configurations:
+            self.configuration_list.addItem(configuration.name)
+            item = self.configuration_list.item(self.configuration_list.count() - 1)
+            item.setToolTip(f"{configuration.script} {configuration.args}".strip())
+
+    def _save(self):
+        self.store.save(self.configurations, self.manager.max_parallel)
+
+    def set_max_parallel(self, value):
+        self.manager.set_max_parallel(value)
+        self._save()
+
+    def new_configuration(self):
+        script = self.default_script or ""
+        name = os.path.splitext(os.path.basename(script))[0] if script else ""
+        dialog = RunConfigurationDialog(RunConfiguration(name, script), self)
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            self.configurations.append(dialog.configuration())
+            self._save()
+            self._fill_configuration_list()
+
+    def edit_configuration(self):
+        row = self.configuration_list.currentRow()
+        if not 0 <= row < len(self.configurations):
+            return
+        dialog = RunConfigurationDialog(self.configurations[row], self)
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            self.configurations[row] = dialog.configuration()
+            self._save()
+            self._fill_configuration_list()
+
+    def delete_configuration(self):
+        rows = sorted({index.row() for index in self.configuration_list.selectedIndexes()}, reverse=True)
+        for row in rows:
+            del self.configurations[row]
+        if rows:
+            self._save()
+            self._fill_configuration_list()
+
+    def run_selected(self):
+        rows = sorted({index.row() for index in self.configuration_list.selectedIndexes()})
+        for row in rows:
+            self.manager.submit(self.configurations[row])
+
+    def _selected_run(self):
+        row = self.run_table.currentRow()
+        if row < 0:
+            return None
+        item = self.run_table.item(row, 0)
+        return item.data(Qt.ItemDataRole.UserRole) if item is not None else None
+
+    def stop_selected(self):
+        run = self._selected_run()
+        if run is not None:
+            self.manager.stop(run)
+
+    def clear_finished(self):
+        for run in [run for run in self.manager.runs if run.state not in (QUEUED, RUNNING)]:
+            self.manager.runs.remove(run)
+            self.output_stack.removeWidget(self.outputs.pop(run))
+            self.rows.pop(run)
+        self.run_table.setRowCount(0)
+        runs = list(self.rows)
+        self.rows = {}
+        for run in runs:
+            self.update_run(run)
+
+    def _output_for(self, run):
+        view = self.outputs.get(run)
+        if view is None:
+            view = QPlainTextEdit()
+            view.setReadOnly(True)
+            view.setFont(QFont('Consolas', 9))
+            view.setMaximumBlockCount(MAX_OUTPUT_LINES)
+            self.outputs[run] = view
+            self.output_stack.addWidget(view)
+        return view
+
+    def append_output(self, run, text):
+        view = self._output_for(run)
+        cursor = view.textCursor()
+        cursor.movePosition(cursor.MoveOperation.End)
+        cursor.insertText(text)
+        if view.isVisible():
+            view.ensureCursorVisible()
+
+    def show_output(self, row):
+        item = self.run_table.item(row, 0) if row >= 0 else None
+        if item is not None:
+            self.output_stack.setCurrentWidget(self._output_for(item.data(Qt.ItemDataRole.UserRole)))
+
+    def update_run(self, run):
+        self._output_for(run)
+        row = self.rows.get(run)
+        if row is None:
+            row = self.rows[run] = self.run_table.rowCount()
+            self.run_table.insertRow(row)
+            title_item = QTableWidgetItem(run.title)
+            title_item.setData(Qt.ItemDataRole.UserRole, run)
+            self.run_table.setItem(row, 0, title_item)
+            if self.run_table.currentRow() < 0:
+                self.run_table.selectRow(row)
+
+        wall = run.wall_time
+        cpu = run.cpu_time
+        values = [
+            run.state,
+            str(run.pid) if run.pid else "",
+            f"{wall:.1f}" if wall is not None else "",
+            f"{cpu:.2f}" if cpu is not None else "",
+            str(run.exit_code) if run.exit_code is not None else "",
+        ]
+        for column, value in enumerate(values, start=1):
+            item = self.run_table.item(row, column)
+            if item is None:
+                item = QTableWidgetItem()
+                if column > 1:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.run_table.setItem(row, column, item)
+            item.setText(value)
+        if run.error:
+            self.run_table.item(row, 1).setToolTip(run.error)
+
+    def refresh_running(self):
+        for run in self.manager.active:
+            if run in self.rows:
+                self.update_run(run)
@@ -0,0 +1,275 @@
+import os
+
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QFont, QColor, QTextCursor
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, QTreeWidget, QTreeWidgetItem,
+                             QHeaderView, QPlainTextEdit, QPushButton, QLabel, QSplitter, QSpinBox)
+
+from ..services.test_runner import TestRunner, DEFAULT_WORKERS, PASSED, FAILED, ERROR, SKIPPED
+
+MAX_OUTPUT_LINES = 20000
+OUTCOME_COLORS = {
+    PASSED: QColor("#6A9955"),
+    FAILED: QColor("#F44747"),
+    ERROR: QColor("#F44747"),
+    SKIPPED: QColor("#CCA700"),
+}
+
+
+def test_path_parts(test_id):
+    """Class and test names below the file node: 'f.py::C::t[x]' -> ['C', 't[x]'], 'm.C.t' -> ['C', 't']"""
+    head, bracket, params = test_id.partition('[')
+    if '::' in head:
+        parts = head.split('::')[1:]
+    else:
+        parts = head.rsplit('.', 2)[-2:]
+    parts[-1] += bracket + params
+    return parts
+
+
+class TestPanel(QWidget):
+    """Discovered tests as a file / class / test tree, with the results of the last run"""
+
+    location_activated = pyqtSignal(str, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.runner = TestRunner(self)
+        self.runner.discovered.connect(self.show_tests)
+        self.runner.result_received.connect(self.show_result)
+        self.runner.output_received.connect(self.append_output)
+        self.runner.run_finished.connect(self.run_finished)
+        self.runner.affected_found.connect(self.run_affected)
+        self.items = {}
+        self.run_after_discovery = False
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        header = QHBoxLayout()
+        self.summary_label = QLabel("No tests discovered yet")
+        header.addWidget(self.summary_label)
+        header.addStretch()
+
+        self.discover_btn = QPushButton("Discover")
+        self.discover_btn.clicked.connect(self.discover)
+        header.addWidget(self.discover_btn)
+
+        self.run_all_btn = QPushButton("Run All")
+        self.run_all_btn.clicked.connect(self.run_all)
+        header.addWidget(self.run_all_btn)
+
+        self.run_failed_btn = QPushButton("Re-run Failed")
+        self.run_failed_btn.clicked.connect(self.run_failed)
+        header.addWidget(self.run_failed_btn)
+
+        self.run_affected_btn = QPushButton("Re-run Affected")
+        self.run_affected_btn.setToolTip("Tests importing, directly or not, a file changed since the last run")
+        self.run_affected_btn.clicked.connect(self.find_affected)
+        header.addWidget(self.run_affected_btn)
+
+        header.addWidget(QLabel("Workers:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, max(64, os.cpu_count() or 1))
+        self.workers_spin.setValue(DEFAULT_WORKERS)
+        header.addWidget(self.workers_spin)
+
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.runner.stop)
+        header.addWidget(self.stop_btn)
+        layout.addLayout(header)
+
+        self.tabs = QTabWidget()
+        layout.addWidget(self.tabs)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Test", "Result", "Time (s)"])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.tree.header().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        self.tree.header().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        self.tree.header().setStretchLastSection(False)
+        self.tree.currentItemChanged.connect(self.show_details)
+        self.tree.itemDoubleClicked.connect(self.open_test)
+        splitter.addWidget(self.tree)
+
+        self.details_view = QPlainTextEdit()
+        self.details_view.setReadOnly(True)
+        self.details_view.setFont(QFont('Consolas', 9))
+        splitter.addWidget(self.details_view)
+        splitter.setSizes([600, 400])
+        self.tabs.addTab(splitter, "Tests")
+
+        self.output_view = QPlainTextEdit()
+        self.output_view.setReadOnly(True)
+        self.output_view.setFont(QFont('Consolas', 9))
+        self.output_view.setMaximumBlockCount(MAX_OUTPUT_LINES)
+        self.tabs.addTab(self.output_view, "Output")
+
+    def set_root(self, root, interpreter=None):
+        if root != self.runner.root and not self.runner.is_running():
+            self.runner.set_root(root, interpreter)
+            self.tree.clear()
+            self.items = {}
+            self.summary_label.setText(f"No tests discovered yet in {root}")
+
+    def _set_busy(self, busy):
+        for button in (self.discover_btn, self.run_all_btn, self.run_failed_btn, self.run_affected_btn):
+            button.setEnabled(not busy)
+        self.stop_btn.setEnabled(busy)
+
+    def discover(self):
+        self.output_view.clear()
+        if self.runner.discover():
+            self._set_busy(True)
+            self.summary_label.setText("Discovering tests...")
+
+    def _run(self, test_ids=None):
+        if self.runner.framework is None:
+            self.run_after_discovery = True
+            self.discover()
+            return
+        if not self.runner.run(test_ids, self.workers_spin.value()):
+            self.summary_label.setText("No tests to run")
+            return
+        self._set_busy(True)
+        self.summary_label.setText("Running tests...")
+        cleared = {}
+        for test_id in (self.runner.tests if test_ids is None else test_ids):
+            item = self.items.get(test_id)
+            if item is not None:
+                self._set_outcome(item, "")
+                item.setText(2, "")
+                cleared[id(item.parent())] = item
+        for item in cleared.values():
+            self._update_parents(item)
+
+    def run_all(self):
+        self._run()
+
+    def run_failed(self):
+        failed = self.runner.failed_ids()
+        if not failed:
+            self.summary_label.setText("No failed tests to re-run")
+            return
+        self._run(failed)
+
+    def find_affected(self):
+        if self.runner.framework is None:
+            self._run()
+            return
+        self._set_busy(True)
+        self.summary_label.setText("Looking for changed files...")
+        self.runner.find_affected()
+
+    def run_affected(self, test_ids):
+        self._set_busy(False)
+        if test_ids is None:
+            self._run()
+        elif not test_ids:
+            self.summary_label.setText("No tests are affected by changes since the last run")
+        else:
+            self._run(test_ids)
+
+    def show_tests(self, tests, error):
+        self._set_busy(False)
+        self.tree.clear()
+        self.items = {}
+        nodes = {}
+        root = self.runner.root
+        for test in tests:
+            label = os.path.relpath(test.path, root) if test.path else "(unknown file)"
+            key = (label,)
+            parent = nodes.get(key)
+            if parent is None:
+                parent = nodes[key] = QTreeWidgetItem(self.tree, [label])
+                parent.setData(0, Qt.ItemDataRole.UserRole, (test.path, 1))
+            parts = test_path_parts(test.id)
+            for name in parts[:-1]:
+                key += (name,)
+                child = nodes.get(key)
+                if child is None:
+                    child = nodes[key] = QTreeWidgetItem(parent, [name])
+                    child.setData(0, Qt.ItemDataRole.UserRole, (test.path, test.line))
+                parent = child
+            item = QTreeWidgetItem(parent, [parts[-1]])
+            item.setData(0, Qt.ItemDataRole.UserRole, (test.path, test.line))
+            item.setData(1, Qt.ItemDataRole.UserRole, test.id)
+            self.items[test.id] = item
+        self.tree.expandToDepth(0)
+
+        if error:
+            self.summary_label.setText(error)
+            self.tabs.setCurrentWidget(self.output_view)
+            self.run_after_discovery = False
+            return
+        self.summary_label.setText(f"{len(tests)} tests discovered ({self.runner.framework})")
+        if self.run_after_discovery:
+            self.run_after_discovery = False
+            self._run()
+
+    def _update_parents(self, item):
+        parent = item.parent()
+        while parent is not None:
+            outcomes = {parent.child(index).text(1) for index in range(parent.childCount())}
+            for outcome in (ERROR, FAILED, "", PASSED, SKIPPED):
+                if outcome in outcomes:
+                    break
+            self._set_outcome(parent, outcome)
+            parent = parent.parent()
+
+    def _set_outcome(self, item, outcome):
+        item.setText(1, outcome)
+        color = OUTCOME_COLORS.get(outcome)
+        item.setForeground(1, color if color is not None else self.tree.palette().text().color())
+
+    def show_result(self, test):
+        item = self.items.get(test.id)
+        if item is None:
+            return
+        self._set_outcome(item, test.outcome)
+        item.setText(2, f"{test.duration:.3f}")
+        item.setTextAlignment(2, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self._update_parents(item)
+        if test.outcome in (FAILED, ERROR):
+            parent = item.parent()
+            while parent is not None:
+                parent.setExpanded(True)
+                parent = parent.parent()
+        if item is self.tree.currentItem():
+            self.show_details(item)
+
+    def run_finished(self, summary):
+        self._set_busy(False)
+        counts = summary['counts']
+        parts = [f"{counts[outcome]} {outcome}" for outcome in (PASSED, FAILED, ERROR, SKIPPED) if counts.get(outcome)]
+        if summary['not_run']:
+            parts.append(f"{summary['not_run']} not run")
+        text = ", ".join(parts) or "no results"
+        if summary['stopped']:
+            text = "Stopped: " + text
+        self.summary_label.setText(f"{text} in {summary['wall_time']:.1f} s")
+
+    def show_details(self, item, *args):
+        test_id = item.data(1, Qt.ItemDataRole.UserRole) if item is not None else None
+        test = self.runner.tests.get(test_id) if test_id else None
+        if test is None:
+            self.details_view.clear()
+            return
+        lines = [test.id]
+        if test.outcome:
+            lines.append(f"{test.outcome} in {test.duration:.3f} s")
+        if test.message:
+            lines += ["", test.message]
+        self.details_view.setPlainText("\n".join(lines))
+
+    def open_test(self, item, column):
+        path, line = item.data(0, Qt.ItemDataRole.UserRole) or ("", 0)
+        if path and os.path.isfile(path):
+            self.location_activated.emit(path, max(line, 1))
+
+    def append_output(self, text):
+        self.output_view.moveCursor(QTextCursor.MoveOperation.End)
+        self.output_view.insertPlainText(text)
+        self.output_view.ensureCursorVisible()
@@ -0,0 +1,188 @@
+"""
+GUI responsiveness diagnostics: timing histograms for hot handlers and an
+event-loop stall watchdog that captures the GUI thread's Python stack.
+"""
+
+import functools
+import inspect
+import logging
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from collections import deque
+
+from PyQt6.QtCore import QObject, QTimer
+
+# Upper bounds of the histogram buckets, in milliseconds
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float('inf'))
+
+DEFAULT_HEARTBEAT_MS = 50
+DEFAULT_STALL_THRESHOLD_MS = 250
+MAX_STALLS = 50
+EVENT_LOOP_LATENCY = "event loop latency"
+
+
+class TimingHistogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKET_BOUNDS_MS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        milliseconds = seconds * 1000
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, milliseconds)] += 1
+        self.count += 1
+        self.total += milliseconds
+        self.max = max(self.max, milliseconds)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction):
+        """Upper bound (ms) of the bucket holding the given fraction of samples"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS_MS, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+class TimingRegistry:
+    def __init__(self):
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = TimingHistogram()
+            histogram.record(seconds)
+
+    def snapshot(self):
+        """Returns [(name, count, mean, p50, p95, max)] sorted by total time, slowest first"""
+        with self.lock:
+            rows = [
+                (name, h.count, h.mean, h.percentile(0.5), h.percentile(0.95), h.max, h.total)
+                for name, h in self.histograms.items()
+            ]
+        rows.sort(key=lambda row: row[6], reverse=True)
+        return [row[:6] for row in rows]
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+
+
+timing_registry = TimingRegistry()
+
+
+def timed(name=None):
+    """Records every call's duration in timing_registry under `name` (the function's qualified name by default)"""
+    def decorator(func):
+        label = name or func.__qualname__
+        code = func.__code__
+        # Signals may pass more arguments than a slot takes (e.g. clicked(bool));
+        # PyQt drops the extras for plain slots, so the wrapper has to as well.
+        max_args = None if code.co_flags & inspect.CO_VARARGS else code.co_argcount
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if max_args is not None:
+                args = args[:max_args]
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timing_registry.record(label, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+class Stall:
+    def __init__(self, started, stack):
+        self.started = started
+        self.wall_time = time.time()
+        self.stack = stack
+        self.duration = None
+
+    def summary(self):
+        duration = f"{self.duration * 1000:.0f} ms" if self.duration is not None else "ongoing"
+        location = self.stack[-1].strip().splitlines()[0] if self.stack else "unknown location"
+        return f"{time.strftime('%H:%M:%S', time.localtime(self.wall_time))}  {duration}  {location}"
+
+
+class StallWatchdog(QObject):
+    """
+    A heartbeat timer on the GUI thread records event-loop latency; a
+    background thread notices when the heartbeat stops for longer than the
+    threshold and captures the GUI thread's stack while it is still stuck.
+    """
+
+    def __init__(self, parent=None, heartbeat_ms=DEFAULT_HEARTBEAT_MS, threshold_ms=DEFAULT_STALL_THRESHOLD_MS):
+        super().__init__(parent)
+        self.heartbeat_interval = heartbeat_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.gui_thread_id = threading.get_ident()
+        self.last_beat = time.perf_counter()
+        self.current_stall = None
+        self.stalls = deque(maxlen=MAX_STALLS)
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+        self.heartbeat = QTimer(self)
+        self.heartbeat.timeout.connect(self._beat)
+        self.watcher = threading.Thread(target=self._watch, name="StallWatchdog", daemon=True)
+
+    def start(self):
+        self.last_beat = time.perf_counter()
+        self.heartbeat.start(int(self.heartbeat_interval * 1000))
+        self.watcher.start()
+
+    def stop(self):
+        self.heartbeat.stop()
+        self.stopped.set()
+
+    def _beat(self):
+        now = time.perf_counter()
+        with self.lock:
+            latency = now - self.last_beat - self.heartbeat_interval
+            self.last_beat = now
+            if self.current_stall is not None:
+                self.current_stall.duration = now - self.current_stall.started
+                self.current_stall = None
+        timing_registry.record(EVENT_LOOP_LATENCY, max(latency, 0.0))
+
+    def _watch(self):
+        interval = min(self.threshold / 4, self.heartbeat_interval)
+        while not self.stopped.wait(interval):
+            with self.lock:
+                stalled_since = self.last_beat
+                if self.current_stall is not None or time.perf_counter() - stalled_since < self.threshold:
+                    continue
+                frame = sys._current_frames().get(self.gui_thread_id)
+                stack = traceback.format_stack(frame) if frame is not None else []
+                self.current_stall = Stall(stalled_since, stack)
+                self.stalls.append(self.current_stall)
+
+    def recent_stalls(self):
+        with self.lock:
+            return list(self.stalls)
+
+    def export_to_log(self, logger=None):
+        logger = logger or logging.getLogger("ParvizIDE.diagnostics")
+        logger.info("Handler timings (count, mean, p50, p95, max in ms):")
+        for name, count, mean, p50, p95, maximum in timing_registry.snapshot():
+            logger.info(f"  {name}: {count}, {mean:.1f}, {p50:.1f}, {p95:.1f}, {maximum:.1f}")
+        stalls = self.recent_stalls()
+        logger.info(f"{len(stalls)} event loop stalls over {self.threshold * 1000:.0f} ms")
+        for stall in stalls:
+            logger.info(f"Stall {stall.summary()}\n{''.join(stall.stack)}")
@@ -0,0 +1,300 @@
+"""
+Transactional multi-file writes with an undo journal
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from .file_utils import get_app_data_dir
+
+logger = logging.getLogger(__name__)
+
+MAX_JOURNALS = 20
+
+_stamp_lock = threading.Lock()
+_last_stamp = 0
+
+
+class FileTransactionError(Exception):
+    pass
+
+
+def _default_journal_dir():
+    return get_app_data_dir("journal")
+
+
+def _encode(data):
+    return base64.b64encode(zlib.compress(data)).decode('ascii')
+
+
+def _decode(text):
+    return zlib.decompress(base64.b64decode(text))
+
+
+def _fsync_directory(directory):
+    if os.name == 'nt':
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def _journal_stamp():
+    """Zero-padded nanosecond time, strictly increasing within the process, so journal names sort in commit order"""
+    global _last_stamp
+    with _stamp_lock:
+        _last_stamp = max(time.time_ns(), _last_stamp + 1)
+        return f"{_last_stamp:020d}"
+
+
+def _write_temp(path, data, mode_source=None):
+    directory = os.path.dirname(path) or '.'
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode_source and os.path.exists(mode_source):
+            shutil.copymode(mode_source, temp_path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return temp_path
+
+
+class FileTransaction:
+    """
+    Writes a set of files all-or-nothing.
+
+    Every target is first written to a temp file next to it, in parallel, and
+    fsynced. The previous contents are recorded in a compressed journal, then
+    the temp files are renamed over their targets. If any step fails the
+    targets already replaced are restored. A committed transaction can be
+    reverted later with revert_change_set(journal_id).
+    """
+
+    def __init__(self, changes, description="", journal_dir=None, max_workers=8):
+        self.changes = {os.path.normpath(os.path.abspath(path)): content for path, content in changes.items()}
+        self.description = description
+        self.journal_dir = journal_dir or _default_journal_dir()
+        self.max_workers = max_workers
+        self.journal_id = None
+
+    def _prepare(self, path):
+        content = self.changes[path]
+        data = content.encode('utf-8') if isinstance(content, str) else content
+
+        directory = os.path.dirname(path)
+        created_dirs = []
+        if directory and not os.path.isdir(directory):
+            missing = directory
+            while missing and not os.path.isdir(missing):
+                created_dirs.append(missing)
+                missing = os.path.dirname(missing)
+            os.makedirs(directory, exist_ok=True)
+
+        existed = os.path.isfile(path)
+        original = None
+        if existed:
+            with open(path, 'rb') as f:
+                original = f.read()
+
+        temp_path = _write_temp(path, data, mode_source=path if existed else None)
+        return {
+            'path': path,
+            'temp_path': temp_path,
+            'existed': existed,
+            'original': original,
+            'created_dirs': created_dirs,
+            'new_hash': hashlib.sha1(data).hexdigest(),
+        }
+
+    def _write_journal(self, prepared):
+        self.journal_id = f"{_journal_stamp()}-{uuid.uuid4().hex[:8]}"
+        journal = {
+            'id': self.journal_id,
+            'created': time.time(),
+            'description': self.description,
+            'files': [
+                {
+                    'path': entry['path'],
+                    'existed': entry['existed'],
+                    'original': _encode(entry['original']) if entry['existed'] else None,
+                    'new_hash': entry['new_hash'],
+                    'created_dirs': entry['created_dirs'],
+                }
+                for entry in prepared
+            ],
+        }
+        journal_path = os.path.join(self.journal_dir, f"{self.journal_id}.json")
+        temp_path = _write_temp(journal_path, json.dumps(journal, separators=(',', ':')).encode('utf-8'))
+        os.replace(temp_path, journal_path)
+        _prune_journals(self.journal_dir)
+
+    def commit(self):
+        """Applies all changes; returns the journal id. Raises FileTransactionError on failure."""
+        if not self.changes:
+            return None
+
+        prepared = []
+        errors = []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.changes))) as executor:
+            futures = {executor.submit(self._prepare, path): path for path in self.changes}
+            for future, path in futures.items():
+                try:
+                    prepared.append(future.result())
+                except Exception as e:
+                    errors.append(f"{path}: {str(e)}")
+
+        if errors:
+            self._discard(prepared)
+            raise FileTransactionError("Could not prepare changes:\n" + "\n".join(errors))
+
+        try:
+            self._write_journal(prepared)
+        except Exception as e:
+            self._discard(prepared)
+            raise FileTransactionError(f"Could not write undo journal: {str(e)}")
+
+        replaced = []
+        try:
+            for entry in prepared:
+                os.replace(entry['temp_path'], entry['path'])
+                replaced.append(entry)
+        except Exception as e:
+            self._rollback(replaced)
+            self._discard([entry for entry in prepared if entry not in replaced])
+            _remove_journal(self.journal_dir, self.journal_id)
+            raise FileTransactionError(f"Could not commit changes, rolled back: {str(e)}")
+
+        for directory in {os.path.dirname(entry['path']) for entry in prepared}:
+            _fsync_directory(directory)
+
+        return self.journal_id
+
+    def _discard(self, prepared):
+        for entry in prepared:
+            try:
+                os.remove(entry['temp_path'])
+            except OSError:
+                pass
+
+    def _rollback(self, replaced):
+        for entry in reversed(replaced):
+            try:
+                if entry['existed']:
+                    temp_path = _write_temp(entry['path'], entry['original'])
+                    os.replace(temp_path, entry['path'])
+                else:
+                    os.remove(entry['path'])
+            except OSError as e:
+                logger.error(f"Error rolling back {entry['path']}: {str(e)}")
+
+
+def _journal_paths(journal_dir):
+    try:
+        names = [name for name in os.listdir(journal_dir) if name.endswith('.json')]
+    except OSError:
+        return []
+    return [os.path.join(journal_dir, name) for name in sorted(names)]
+
+
+def _prune_journals(journal_dir, keep=MAX_JOURNALS):
+    for path in _journal_paths(journal_dir)[:-keep]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _remove_journal(journal_dir, journal_id):
+    try:
+        os.remove(os.path.join(journal_dir, f"{journal_id}.json"))
+    except OSError:
+        pass
+
+
+def list_change_sets(journal_dir=None):
+    """Returns journal summaries, newest first"""
+    journal_dir = journal_dir or _default_journal_dir()
+    summaries = []
+    for path in reversed(_journal_paths(journal_dir)):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                journal = json.load(f)
+            summaries.append({
+                'id': journal['id'],
+                'created': journal['created'],
+                'description': journal.get('description', ''),
+                'files': [entry['path'] for entry in journal['files']],
+            })
+        except (OSError, ValueError, KeyError):
+            continue
+    return summaries
+
+
+def revert_change_set(journal_id=None, journal_dir=None, force=False):
+    """
+    Restores the files of a committed transaction (the latest one by default).
+    Files modified since the change set was applied are skipped unless force is set.
+    The journal is removed either way, so the next undo reaches the change set
+    before it instead of stopping at the skipped files again.
+
+    Returns:
+        tuple: (restored_paths, skipped_paths)
+    """
+    journal_dir = journal_dir or _default_journal_dir()
+    if journal_id is None:
+        journals = _journal_paths(journal_dir)
+        if not journals:
+            raise FileTransactionError("There is no AI change set to undo")
+        journal_path = journals[-1]
+    else:
+        journal_path = os.path.join(journal_dir, f"{journal_id}.json")
+
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        journal = json.load(f)
+
+    restored = []
+    skipped = []
+    for entry in journal['files']:
+        path = entry['path']
+        if not force and os.path.isfile(path):
+            with open(path, 'rb') as f:
+                if hashlib.sha1(f.read()).hexdigest() != entry['new_hash']:
+                    skipped.append(path)
+                    continue
+
+        if entry['existed']:
+            temp_path = _write_temp(path, _decode(entry['original']))
+            os.replace(temp_path, path)
+        elif os.path.isfile(path):
+            os.remove(path)
+            for directory in entry.get('created_dirs', []):
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    break
+        restored.append(path)
+
+    os.remove(journal_path)
+    return restored, skipped
@@ -47,4 +47,19 @@ def ensure_directory_exists(file_path):
             os.makedirs(directory)
         return True
     except Exception:
-        return False
\ No newline at end of file
+        return False
+
+def get_app_data_dir(*parts):
+    """
+    Returns (and creates) the per-user data directory of the IDE
+    
+    Args:
+        *parts: Optional sub-directory names
+        
+    Returns:
+        str: Absolute path of the directory
+    """
+    base_dir = os.environ.get("PARVIZ_IDE_HOME") or os.path.join(os.path.expanduser("~"), ".parviz_mind_ide")
+    path = os.path.join(base_dir, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
\ No newline at end of file
@@ -0,0 +1,296 @@
+"""
+.gitignore matching shared by the file tree and every directory scan
+(Go to File, test impact analysis). The user's excludes file, the
+project's .git/info/exclude and every .gitignore found so far are compiled
+into one regular expression, so checking a path is a single match whatever
+the number of rules.
+"""
+
+import os
+import re
+import threading
+
+from .file_utils import get_app_data_dir
+
+GITIGNORE = ".gitignore"
+ALWAYS_IGNORED = {".git"}
+USER_EXCLUDES_FILE = "excludes.gitignore"
+DEFAULT_USER_EXCLUDES = """\
+# Skipped in every project, on top of the project's own .gitignore files.
+# Same syntax as .gitignore; a project's .gitignore can re-include with !pattern.
+__pycache__/
+*.py[cod]
+node_modules/
+.venv/
+venv/
+.tox/
+.nox/
+.mypy_cache/
+.pytest_cache/
+.ruff_cache/
+.eggs/
+*.egg-info/
+.hg/
+.svn/
+"""
+
+
+def _translate_glob(glob):
+    """gitignore glob (no leading or trailing '/') -> regex source; '*' and '?' stay within one path segment"""
+    parts = []
+    index = 0
+    while index < len(glob):
+        char = glob[index]
+        if glob.startswith("**/", index):
+            parts.append("(?:.*/)?")
+            index += 3
+            continue
+        if glob.startswith("/**", index) and index + 3 == len(glob):
+            # Everything inside, but not the folder itself
+            parts.append("/.+")
+            break
+        if glob.startswith("**", index):
+            parts.append(".*")
+            index += 2
+            continue
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = glob.find("]", index + 2)
+            if end < 0:
+                parts.append(re.escape(char))
+            else:
+                body = glob[index + 1:end]
+                if body[0] in "!^":
+                    body = "^" + body[1:]
+                parts.append("[" + body.replace("\\", "\\\\") + "]")
+                index = end
+        elif char == "\\" and index + 1 < len(glob):
+            index += 1
+            parts.append(re.escape(glob[index]))
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return "".join(parts)
+
+
+def parse_pattern(line, base=""):
+    """
+    One .gitignore line -> (regex source, negated), or None for blanks and
+    comments. base is the folder of the .gitignore relative to the scan
+    root, with '/' separators ('' for the root itself).
+    """
+    line = line.rstrip("\n\r")
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(line) > len(stripped):
+        stripped += " "
+    line = stripped
+    if not line or line.startswith("#"):
+        return None
+
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+
+    directory_only = line.endswith("/")
+    line = line.strip("/") if directory_only else line
+    if not line:
+        return None
+    # A slash anywhere but at the end anchors the pattern to the .gitignore's folder
+    anchored = "/" in line.rstrip("/")
+    line = line.lstrip("/")
+
+    prefix = re.escape(base + "/") if base else ""
+    if not anchored:
+        prefix += "(?:.*/)?"
+    # Paths are matched with a trailing '/' when they are directories
+    suffix = "/" if directory_only else "/?"
+    return prefix + _translate_glob(line) + suffix, negated
+
+
+class IgnoreRules:
+    """
+    Ignore rules of one project root. Later rules override earlier ones, so
+    they are added in git's order of precedence: user excludes, then
+    .git/info/exclude, then .gitignore files from the root down. Shared
+    between the GUI thread and scanning threads.
+    """
+
+    def __init__(self, root, user_excludes=None):
+        self.root = os.path.abspath(root)
+        self.rules = []
+        self.sources = {}
+        self.version = 0
+        self._regex = None
+        self._lock = threading.Lock()
+        if user_excludes:
+            self.add_file(user_excludes, "")
+        self.add_file(os.path.join(self.root, ".git", "info", "exclude"), "")
+        self.add_file(os.path.join(self.root, GITIGNORE), "")
+
+    def add_file(self, path, base):
+        """Adds the patterns of an ignore file that lives in the folder base (relative, '/' separated)"""
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                lines = f.readlines()
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            # Remembered as missing, so creating it later counts as a change
+            lines, mtime = [], None
+        rules = [rule for rule in (parse_pattern(line, base) for line in lines) if rule is not None]
+        with self._lock:
+            if path in self.sources:
+                return
+            self.sources[path] = mtime
+            if mtime is not None:
+                self.version += 1
+            if rules:
+                self.rules.extend(rules)
+                self._regex = None
+
+    def add_pattern(self, line, base=""):
+        rule = parse_pattern(line, base)
+        if rule is not None:
+            with self._lock:
+                self.rules.append(rule)
+                self._regex = None
+
+    def add_directory(self, relative_dir, names=None):
+        """Picks up relative_dir's own .gitignore while scanning; names is its listing, if already read"""
+        if names is not None and GITIGNORE not in names:
+            return
+        path = os.path.join(self.root, relative_dir, GITIGNORE) if relative_dir else os.path.join(self.root, GITIGNORE)
+        if path not in self.sources:
+            self.add_file(path, relative_dir.replace(os.sep, "/"))
+
+    def add_parents(self, relative_path):
+        """Reads the .gitignore of every folder from the root down to relative_path's folder"""
+        parts = relative_path.split("/")[:-1]
+        for length in range(1, len(parts) + 1):
+            self.add_directory("/".join(parts[:length]))
+
+    def sources_changed(self):
+        """True when an ignore file looked at so far was created, modified or removed since"""
+        for path, mtime in list(self.sources.items()):
+            try:
+                current = os.stat(path).st_mtime_ns
+            except OSError:
+                current = None
+            if current != mtime:
+                return True
+        return False
+
+    def _compiled(self):
+        regex = self._regex
+        if regex is None:
+            with self._lock:
+                # Alternatives are tried in order, so the last rule comes first and its group tells which matched
+                alternatives = [f"(?P<r{index}>{source})"
+                                for index, (source, _) in reversed(list(enumerate(self.rules)))]
+                regex = self._regex = re.compile("|".join(alternatives) or "(?!)", re.DOTALL)
+        return regex
+
+    def relative(self, path):
+        """path relative to the root with '/' separators; None outside the root, '' for the root itself"""
+        relative = os.path.relpath(os.path.abspath(path), self.root)
+        if relative == ".":
+            return ""
+        if relative == ".." or relative.startswith(".." + os.sep) or os.path.isabs(relative):
+            return None
+        return relative.replace(os.sep, "/")
+
+    def matches(self, relative_path, is_dir=False):
+        """Whether the rules ignore relative_path itself, not looking at its parent folders"""
+        name = relative_path.rsplit("/", 1)[-1]
+        if name in ALWAYS_IGNORED:
+            return True
+        if not self.rules:
+            return False
+        match = self._compiled().fullmatch(relative_path + "/" if is_dir else relative_path)
+        if match is None:
+            return False
+        return not self.rules[int(match.lastgroup[1:])][1]
+
+    def is_ignored(self, path, is_dir=None):
+        """Whether path (absolute or relative to the root) or one of its parent folders is ignored"""
+        relative = self.relative(path if os.path.isabs(path) else os.path.join(self.root, path))
+        if not relative:
+            return False
+        if is_dir is None:
+            is_dir = os.path.isdir(os.path.join(self.root, relative))
+        self.add_parents(relative)
+        parts = relative.split("/")
+        for length in range(1, len(parts)):
+            if self.matches("/".join(parts[:length]), True):
+                return True
+        return self.matches(relative, is_dir)
+
+    def walk(self, top=None):
+        """os.walk of top (the root by default) that never enters ignored folders or yields ignored files"""
+        top = os.path.abspath(top or self.root)
+        for folder, dirs, files in os.walk(top):
+            relative_dir = self.relative(folder)
+            if relative_dir is None:
+                yield folder, dirs, files
+                continue
+            self.add_directory(relative_dir, files)
+            prefix = relative_dir + "/" if relative_dir else ""
+            dirs[:] = [name for name in dirs if not self.matches(prefix + name, True)]
+            yield folder, dirs, [name for name in files if not self.matches(prefix + name, False)]
+
+
+def user_excludes_path():
+    """The user's excludes file, created with the defaults on first use"""
+    path = os.path.join(get_app_data_dir(), USER_EXCLUDES_FILE)
+    if not os.path.exists(path):
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(DEFAULT_USER_EXCLUDES)
+        except OSError:
+            pass
+    return path
+
+
+def is_ignore_file(path):
+    """Whether path is a file ignore rules are read from"""
+    path = os.path.abspath(path)
+    return (os.path.basename(path) == GITIGNORE
+            or path.endswith(os.path.join(".git", "info", "exclude"))
+            or path == os.path.join(get_app_data_dir(), USER_EXCLUDES_FILE))
+
+
+def project_root(path):
+    """The git work tree path is in (the nearest folder up with a .git), or path itself"""
+    path = os.path.abspath(path)
+    folder = path
+    while True:
+        if os.path.exists(os.path.join(folder, ".git")):
+            return folder
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return path
+        folder = parent
+
+
+class IgnoreRulesCache:
+    """One IgnoreRules per project root, rebuilt when one of its ignore files changes"""
+
+    def __init__(self):
+        self._rules = {}
+        self._lock = threading.Lock()
+
+    def rules_for(self, path):
+        """Rules of the project path belongs to; path is a folder"""
+        root = project_root(path)
+        with self._lock:
+            rules = self._rules.get(root)
+            if rules is None or rules.sources_changed():
+                rules = self._rules[root] = IgnoreRules(root, user_excludes_path())
+            return rules
+
+
+ignore_rules_cache = IgnoreRulesCache()
@@ -0,0 +1,107 @@
+"""
+Line diffs that stay fast on large inputs.
+
+difflib.SequenceMatcher with autojunk=False is quadratic when lines repeat
+(blank lines, closing brackets), and autojunk=True gives poor alignments on
+code. Instead, lines occurring exactly once on both sides anchor the diff
+(patience diff); the anchors are found in linear time, and SequenceMatcher
+only runs on the small gaps between them.
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from difflib import SequenceMatcher
+
+# Gaps up to this many line pairs are matched exactly; larger ones let
+# SequenceMatcher junk popular lines to stay fast
+EXACT_MATCH_LIMIT = 250000
+
+
+def _unique_anchors(a, a1, a2, b, b1, b2):
+    """Longest increasing run of (i, j) pairs of lines occurring exactly once in a[a1:a2] and b[b1:b2]"""
+    counts_a = Counter(a[a1:a2])
+    counts_b = Counter(b[b1:b2])
+    positions = {a[i]: i for i in range(a1, a2) if counts_a[a[i]] == 1}
+    pairs = [(positions[b[j]], j) for j in range(b1, b2)
+             if counts_b[b[j]] == 1 and b[j] in positions]
+    if not pairs:
+        return []
+
+    # Patience sorting: tails[k] is the smallest a index ending an increasing run of length k + 1
+    tails = []
+    tail_pairs = []
+    previous = [None] * len(pairs)
+    for index, (i, _) in enumerate(pairs):
+        k = bisect_left(tails, i)
+        if k == len(tails):
+            tails.append(i)
+            tail_pairs.append(index)
+        else:
+            tails[k] = i
+            tail_pairs[k] = index
+        previous[index] = tail_pairs[k - 1] if k else None
+
+    anchors = []
+    index = tail_pairs[-1]
+    while index is not None:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _matched_pairs(a, b):
+    """Sorted (i, j) pairs of equal lines forming the diff's common subsequence"""
+    pairs = []
+    pending = [(0, len(a), 0, len(b))]
+    while pending:
+        a1, a2, b1, b2 = pending.pop()
+        while a1 < a2 and b1 < b2 and a[a1] == b[b1]:
+            pairs.append((a1, b1))
+            a1 += 1
+            b1 += 1
+        while a1 < a2 and b1 < b2 and a[a2 - 1] == b[b2 - 1]:
+            a2 -= 1
+            b2 -= 1
+            pairs.append((a2, b2))
+        if a1 == a2 or b1 == b2:
+            continue
+
+        anchors = _unique_anchors(a, a1, a2, b, b1, b2)
+        if anchors:
+            for i, j in anchors:
+                pending.append((a1, i, b1, j))
+                pairs.append((i, j))
+                a1, b1 = i + 1, j + 1
+            pending.append((a1, a2, b1, b2))
+            continue
+
+        exact = (a2 - a1) * (b2 - b1) <= EXACT_MATCH_LIMIT
+        matcher = SequenceMatcher(None, a[a1:a2], b[b1:b2], autojunk=not exact)
+        for i, j, size in matcher.get_matching_blocks():
+            pairs.extend((a1 + i + k, b1 + j + k) for k in range(size))
+    pairs.sort()
+    return pairs
+
+
+def diff_opcodes(a_lines, b_lines):
+    """Opcodes turning a_lines into b_lines, in the format of SequenceMatcher.get_opcodes()"""
+    # Interned to integers so comparisons and hashing are cheap
+    ids = {}
+    a = [ids.setdefault(line, len(ids)) for line in a_lines]
+    b = [ids.setdefault(line, len(ids)) for line in b_lines]
+
+    opcodes = []
+    i = j = 0
+    for pair_i, pair_j in _matched_pairs(a, b) + [(len(a), len(b))]:
+        if pair_i > i or pair_j > j:
+            tag = 'replace' if pair_i > i and pair_j > j else ('delete' if pair_i > i else 'insert')
+            opcodes.append((tag, i, pair_i, j, pair_j))
+        if pair_i == len(a):
+            break
+        if opcodes and opcodes[-1][0] == 'equal':
+            opcodes[-1] = ('equal', opcodes[-1][1], pair_i + 1, opcodes[-1][3], pair_j + 1)
+        else:
+            opcodes.append(('equal', pair_i, pair_i + 1, pair_j, pair_j + 1))
+        i, j = pair_i + 1, pair_j + 1
+    return opcodes
@@ -0,0 +1,190 @@
+"""
+Per-line hit counts and times for one script, run in the script's own
+interpreter:
+
+    python line_timer.py OUTPUT.json SCRIPT [ARGS...]
+
+Only lines of SCRIPT are timed. A line's time includes calls into other
+modules but not into the script's own functions, whose lines are timed
+separately, so recursion is not counted twice.
+Uses sys.monitoring on Python 3.12+ and sys.settrace before that, or when
+no monitoring tool id is free. Only the main thread is timed. Standard
+library only, since it runs outside the IDE.
+"""
+
+import json
+import os
+import runpy
+import sys
+import threading
+from collections import defaultdict
+from time import perf_counter
+
+TOOL_NAME = "parviz-line-timer"
+# Tool ids without a reserved use; PROFILER_ID would make a script that runs cProfile itself fail
+FREE_TOOL_IDS = (3, 4)
+
+
+class LineTimer:
+    def __init__(self, target):
+        self.target = target
+        self.hits = defaultdict(int)
+        self.times = defaultdict(float)
+        self.main_thread = threading.get_ident()
+        # [current line, time it started] for every active frame of the target
+        self.stack = []
+        self.backend = "sys.settrace"
+        self.tool = None
+
+    def start(self):
+        if hasattr(sys, 'monitoring'):
+            self.tool = self._claim_tool_id()
+            if self.tool is not None:
+                self.backend = "sys.monitoring"
+                self._start_monitoring()
+                return
+            sys.stderr.write("line_timer: no sys.monitoring tool id is free, timing with sys.settrace\n")
+        sys.settrace(self._global_trace)
+
+    def stop(self):
+        if self.backend == "sys.monitoring":
+            monitoring = sys.monitoring
+            monitoring.set_events(self.tool, monitoring.events.NO_EVENTS)
+            monitoring.free_tool_id(self.tool)
+        else:
+            sys.settrace(None)
+
+    @staticmethod
+    def _claim_tool_id():
+        for tool in FREE_TOOL_IDS:
+            if sys.monitoring.get_tool(tool) is None:
+                try:
+                    sys.monitoring.use_tool_id(tool, TOOL_NAME)
+                except ValueError:
+                    continue
+                return tool
+        return None
+
+    def _enter(self):
+        now = perf_counter()
+        if self.stack:
+            caller = self.stack[-1]
+            if caller[0] is not None:
+                self.times[caller[0]] += now - caller[1]
+        self.stack.append([None, perf_counter()])
+
+    def _leave(self):
+        if not self.stack:
+            return
+        now = perf_counter()
+        frame = self.stack.pop()
+        if frame[0] is not None:
+            self.times[frame[0]] += now - frame[1]
+        if self.stack:
+            self.stack[-1][1] = perf_counter()
+
+    def _line(self, line_number):
+        now = perf_counter()
+        frame = self.stack[-1]
+        if frame[0] is not None:
+            self.times[frame[0]] += now - frame[1]
+        self.hits[line_number] += 1
+        frame[0] = line_number
+        frame[1] = perf_counter()
+
+    def _global_trace(self, frame, event, arg):
+        if frame.f_code.co_filename != self.target:
+            return None
+        self._enter()
+
+        def local_trace(frame, event, arg):
+            if event == 'line':
+                self._line(frame.f_lineno)
+            elif event == 'return':
+                self._leave()
+            return local_trace
+
+        return local_trace
+
+    def _start_monitoring(self):
+        monitoring = sys.monitoring
+        events = monitoring.events
+        tool = self.tool
+        disable = monitoring.DISABLE
+        target = self.target
+        main_thread = self.main_thread
+        get_ident = threading.get_ident
+
+        def enter(code, offset, *args):
+            if code.co_filename != target:
+                return disable
+            if get_ident() == main_thread:
+                self._enter()
+
+        def leave(code, offset, *args):
+            if code.co_filename != target:
+                return disable
+            if get_ident() == main_thread:
+                self._leave()
+
+        # PY_THROW and PY_UNWIND cannot be disabled per code object
+        def throw(code, offset, exception):
+            if code.co_filename == target and get_ident() == main_thread:
+                self._enter()
+
+        def unwind(code, offset, exception):
+            if code.co_filename == target and get_ident() == main_thread:
+                self._leave()
+
+        def line(code, line_number):
+            if code.co_filename != target:
+                return disable
+            if get_ident() == main_thread and self.stack:
+                self._line(line_number)
+
+        for event in (events.PY_START, events.PY_RESUME):
+            monitoring.register_callback(tool, event, enter)
+        monitoring.register_callback(tool, events.PY_THROW, throw)
+        for event in (events.PY_RETURN, events.PY_YIELD):
+            monitoring.register_callback(tool, event, leave)
+        monitoring.register_callback(tool, events.PY_UNWIND, unwind)
+        monitoring.register_callback(tool, events.LINE, line)
+        monitoring.set_events(
+            tool,
+            events.PY_START | events.PY_RESUME | events.PY_THROW | events.PY_RETURN
+            | events.PY_YIELD | events.PY_UNWIND | events.LINE,
+        )
+
+    def results(self, wall_time):
+        return {
+            'file': self.target,
+            'backend': self.backend,
+            'wall_time': wall_time,
+            'lines': {str(line): [self.hits.get(line, 0), self.times.get(line, 0.0)]
+                      for line in set(self.hits) | set(self.times)},
+        }
+
+
+def main(argv):
+    if len(argv) < 2:
+        sys.stderr.write("usage: line_timer.py OUTPUT.json SCRIPT [ARGS...]\n")
+        return 2
+
+    output, script = argv[0], os.path.abspath(argv[1])
+    sys.argv = [script] + argv[2:]
+    sys.path[0] = os.path.dirname(script)
+
+    timer = LineTimer(script)
+    started = perf_counter()
+    timer.start()
+    try:
+        runpy.run_path(script, run_name='__main__')
+    finally:
+        timer.stop()
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(timer.results(perf_counter() - started), f)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,107 @@
+"""
+Queue-based logging: callers only enqueue records, a listener thread
+formats them and does the file and console I/O.
+"""
+
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import time
+from datetime import datetime
+
+LOG_FILE = "parviz_ide.log"
+MAX_LOG_BYTES = 10 * 1024 * 1024
+LOG_BACKUPS = 7
+ROTATE_INTERVAL_SECONDS = 24 * 60 * 60
+CONSOLE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+            'module': record.module,
+            'function': record.funcName,
+            'line': record.lineno,
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SizeAndTimeRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rolls over when the file reaches max_bytes or when the interval has elapsed, whichever comes first"""
+
+    def __init__(self, filename, max_bytes=MAX_LOG_BYTES, backup_count=LOG_BACKUPS,
+                 interval=ROTATE_INTERVAL_SECONDS, encoding='utf-8'):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+        self.interval = interval
+        try:
+            opened = os.path.getmtime(filename)
+        except OSError:
+            opened = time.time()
+        self.rollover_at = opened + interval
+
+    def shouldRollover(self, record):
+        if time.time() >= self.rollover_at and os.path.exists(self.baseFilename):
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = time.time() + self.interval
+
+
+class _PreformattedQueueHandler(logging.handlers.QueueHandler):
+    """Leaves formatting to the listener thread; only the message args are resolved here"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def setup_logging(log_level="INFO", logs_dir=None):
+    """
+    Routes the root logger through a queue to a JSON rotating file and the console.
+
+    Returns:
+        QueueListener: already started; call stop() at shutdown to flush pending records
+    """
+    if logs_dir is None:
+        logs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "logs")
+    os.makedirs(logs_dir, exist_ok=True)
+
+    level = logging.getLevelName(str(log_level).upper())
+    if not isinstance(level, int):
+        level = logging.INFO
+
+    file_handler = SizeAndTimeRotatingFileHandler(os.path.join(logs_dir, LOG_FILE))
+    file_handler.setFormatter(JsonFormatter())
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_PreformattedQueueHandler(log_queue))
+    root.setLevel(level)
+
+    listener.start()
+    return listener
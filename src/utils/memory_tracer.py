@@ -0,0 +1,100 @@
+"""
+Runs a script under tracemalloc and dumps allocation snapshots, in the
+script's own interpreter:
+
+    python memory_tracer.py SNAPSHOT_DIR INTERVAL SCRIPT [ARGS...]
+
+A snapshot is written when the script exits, every INTERVAL seconds (0 turns
+that off) and whenever a file named "request" appears in SNAPSHOT_DIR. Each
+snapshot is NNN-label.snapshot (tracemalloc's pickle format) next to a
+NNN-label.json with the label, time and traced/peak sizes. Standard library
+only, since it runs outside the IDE.
+"""
+
+import builtins
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import types
+
+REQUEST_FILE = "request"
+POLL_SECONDS = 0.2
+TRACEBACK_FRAMES = 1
+
+
+class SnapshotWriter:
+    def __init__(self, directory):
+        self.directory = directory
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def take(self, label):
+        with self.lock:
+            self.count += 1
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            name = os.path.join(self.directory, f"{self.count:03d}-{label}")
+            with open(name + ".json", 'w', encoding='utf-8') as f:
+                json.dump({'label': label, 'time': time.time(), 'current': current, 'peak': peak}, f)
+            # Written under a temporary name so the IDE never loads a partial file
+            snapshot.dump(name + ".tmp")
+            os.replace(name + ".tmp", name + ".snapshot")
+
+
+def watch(writer, interval, stopped):
+    request = os.path.join(writer.directory, REQUEST_FILE)
+    next_automatic = time.monotonic() + interval if interval > 0 else None
+    while not stopped.wait(POLL_SECONDS):
+        if os.path.exists(request):
+            try:
+                os.remove(request)
+            except OSError:
+                continue
+            writer.take("manual")
+        if next_automatic is not None and time.monotonic() >= next_automatic:
+            writer.take("auto")
+            next_automatic = time.monotonic() + interval
+
+
+def run_script(script, module):
+    """Executes script as __main__ in module's namespace, which stays alive after it returns"""
+    with open(script, 'rb') as f:
+        code = compile(f.read(), script, 'exec', dont_inherit=True)
+    module.__dict__.update({'__file__': script, '__builtins__': builtins, '__cached__': None})
+    sys.modules['__main__'] = module
+    exec(code, module.__dict__)
+
+
+def main(argv):
+    if len(argv) < 3:
+        sys.stderr.write("usage: memory_tracer.py SNAPSHOT_DIR INTERVAL SCRIPT [ARGS...]\n")
+        return 2
+
+    directory, interval, script = argv[0], float(argv[1]), os.path.abspath(argv[2])
+    os.makedirs(directory, exist_ok=True)
+    sys.argv = [script] + argv[3:]
+    sys.path[0] = os.path.dirname(script)
+
+    writer = SnapshotWriter(directory)
+    stopped = threading.Event()
+    watcher = threading.Thread(target=watch, args=(writer, interval, stopped), name="SnapshotWatcher", daemon=True)
+
+    # Kept referenced until after the exit snapshot, so it still holds what the script held
+    module = types.ModuleType('__main__')
+    tracemalloc.start(TRACEBACK_FRAMES)
+    watcher.start()
+    try:
+        run_script(script, module)
+    finally:
+        stopped.set()
+        watcher.join()
+        writer.take("exit")
+        tracemalloc.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,91 @@
+"""
+Line hunks between texts and three-way merging of AI suggestions
+"""
+
+from .line_diff import diff_opcodes
+
+# Merges of documents at least this long run off the GUI thread
+BACKGROUND_MERGE_LINES = 5000
+
+
+class Hunk:
+    """Replace lines [start, end) of the target text with `lines` (each keeping its line ending)"""
+    __slots__ = ('start', 'end', 'lines')
+
+    def __init__(self, start, end, lines):
+        self.start = start
+        self.end = end
+        self.lines = lines
+
+    def line_delta(self):
+        return len(self.lines) - (self.end - self.start)
+
+    def __repr__(self):
+        return f"Hunk({self.start}, {self.end}, +{len(self.lines)})"
+
+
+def split_lines(text):
+    """
+    Lines keeping their terminators, split at '\n' only: QTextDocument blocks
+    end there, while str.splitlines also breaks at '\f', '\v', '\x85', '\u2028'...
+    """
+    lines = text.split('\n')
+    last = lines.pop()
+    lines = [line + '\n' for line in lines]
+    if last:
+        lines.append(last)
+    return lines
+
+
+def compute_hunks(original, suggested):
+    """Minimal hunks turning `original` into `suggested`"""
+    original_lines = split_lines(original)
+    suggested_lines = split_lines(suggested)
+    return [
+        Hunk(i1, i2, suggested_lines[j1:j2])
+        for tag, i1, i2, j1, j2 in diff_opcodes(original_lines, suggested_lines)
+        if tag != 'equal'
+    ]
+
+
+def _overlaps(local_start, local_end, start, end):
+    if local_start < end and start < local_end:
+        return True
+    # Insertions (empty ranges) conflict with anything touching the same point;
+    # two non-empty ranges that are merely adjacent do not conflict.
+    if local_start == local_end or start == end:
+        return local_start <= end and start <= local_end
+    return False
+
+
+def merge_hunks(base, current, suggested):
+    """
+    Three-way merge: rebases the base→suggested hunks onto `current`, which
+    may contain local edits made after the suggestion was requested.
+
+    Returns:
+        tuple: (hunks relative to current, conflicting hunks relative to base)
+    """
+    base_lines = split_lines(base)
+    local_edits = [
+        (i1, i2, (j2 - j1) - (i2 - i1))
+        for tag, i1, i2, j1, j2 in diff_opcodes(base_lines, split_lines(current))
+        if tag != 'equal'
+    ]
+
+    merged = []
+    conflicts = []
+    for hunk in compute_hunks(base, suggested):
+        if any(_overlaps(i1, i2, hunk.start, hunk.end) for i1, i2, _ in local_edits):
+            conflicts.append(hunk)
+            continue
+        offset = sum(delta for i1, i2, delta in local_edits if i2 <= hunk.start)
+        merged.append(Hunk(hunk.start + offset, hunk.end + offset, hunk.lines))
+    return merged, conflicts
+
+
+def apply_hunks_to_text(text, hunks):
+    lines = split_lines(text)
+    for hunk in sorted(hunks, key=lambda h: h.start, reverse=True):
+        lines[hunk.start:hunk.end] = hunk.lines
+    return "".join(lines)
@@ -0,0 +1,61 @@
+"""
+Starts a script for a run configuration, in the configuration's interpreter:
+
+    python run_launcher.py REPORT.json CPUS SCRIPT [ARGS...]
+
+CPUS is a comma-separated list of CPU numbers the process is pinned to
+before the script starts ("-" for no pinning). When the script ends,
+REPORT.json receives the process's user and system CPU time, including
+waited-for child processes. Standard library only (psutil is used for
+pinning where os.sched_setaffinity does not exist, if it is installed).
+"""
+
+import json
+import os
+import runpy
+import sys
+
+
+def set_affinity(cpus):
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpus)
+        return True
+    try:
+        import psutil
+    except ImportError:
+        return False
+    psutil.Process().cpu_affinity(list(cpus))
+    return True
+
+
+def main(argv):
+    if len(argv) < 3:
+        sys.stderr.write("usage: run_launcher.py REPORT.json CPUS SCRIPT [ARGS...]\n")
+        return 2
+
+    report, cpus, script = argv[0], argv[1], os.path.abspath(argv[2])
+    if cpus != "-":
+        try:
+            if not set_affinity({int(cpu) for cpu in cpus.split(",")}):
+                sys.stderr.write("CPU affinity is not supported on this platform without psutil\n")
+        except (OSError, ValueError) as e:
+            sys.stderr.write(f"Could not set CPU affinity {cpus}: {e}\n")
+
+    sys.argv = [script] + argv[3:]
+    sys.path[0] = os.path.dirname(script)
+    try:
+        runpy.run_path(script, run_name='__main__')
+    finally:
+        times = os.times()
+        with open(report, 'w', encoding='utf-8') as f:
+            json.dump({
+                'user': times.user,
+                'system': times.system,
+                'children_user': times.children_user,
+                'children_system': times.children_system,
+            }, f)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,35 @@
+"""
+Per-phase startup timing, printed with --profile-startup
+"""
+
+import time
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.last = self.origin
+        self.phases = []
+        self.finished = False
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last, now - self.origin))
+        self.last = now
+
+    def report(self):
+        lines = ["Startup profile:"]
+        for name, duration, elapsed in self.phases:
+            lines.append(f"  {name:<28} {duration * 1000:8.1f} ms   (at {elapsed * 1000:8.1f} ms)")
+        return "\n".join(lines)
+
+    def finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        if self.enabled:
+            print(self.report())
+
+
+startup_profiler = StartupProfiler()
@@ -0,0 +1,177 @@
+"""
+Collects or runs tests for the IDE's test runner, in the project's own
+interpreter:
+
+    python test_worker.py collect ROOT
+    python test_worker.py run ROOT FRAMEWORK IDS_FILE
+
+pytest is used when it is importable, unittest otherwise. Results are
+written to stdout as lines starting with MARKER followed by a JSON object,
+one per collected test or finished test, so they can be picked out of the
+tests' own output. Standard library only, since it runs outside the IDE.
+"""
+
+import importlib.util
+import inspect
+import json
+import os
+import sys
+import time
+import traceback
+import unittest
+
+MARKER = "@@parviz-test "
+PYTEST = "pytest"
+UNITTEST = "unittest"
+
+
+def emit(**message):
+    stream = sys.__stdout__
+    stream.write("\n" + MARKER + json.dumps(message) + "\n")
+    stream.flush()
+
+
+def detect_framework():
+    return PYTEST if importlib.util.find_spec("pytest") is not None else UNITTEST
+
+
+class PytestCollector:
+    def pytest_collection_modifyitems(self, session, config, items):
+        for item in items:
+            path = str(getattr(item, 'path', None) or item.fspath)
+            line = item.location[1]
+            emit(event='test', id=item.nodeid, file=path, line=line + 1 if line is not None else 0)
+
+
+class PytestReporter:
+    def __init__(self):
+        self.pending = {}
+
+    def pytest_runtest_logreport(self, report):
+        entry = self.pending.setdefault(report.nodeid, {'outcome': 'passed', 'duration': 0.0, 'message': ''})
+        entry['duration'] += report.duration
+        if report.failed:
+            entry['outcome'] = 'failed' if report.when == 'call' else 'error'
+            entry['message'] = report.longreprtext
+        elif report.skipped and entry['outcome'] == 'passed':
+            entry['outcome'] = 'skipped'
+            longrepr = report.longrepr
+            entry['message'] = longrepr[2] if isinstance(longrepr, tuple) and len(longrepr) == 3 else str(longrepr)
+        if report.when == 'teardown':
+            entry = self.pending.pop(report.nodeid)
+            emit(event='result', id=report.nodeid, **entry)
+
+
+def _iter_tests(suite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from _iter_tests(test)
+        else:
+            yield test
+
+
+def _test_location(test):
+    module = sys.modules.get(type(test).__module__)
+    path = getattr(module, '__file__', None) or ""
+    line = 0
+    method = getattr(type(test), getattr(test, '_testMethodName', ''), None)
+    if method is not None:
+        try:
+            line = inspect.getsourcelines(method)[1]
+        except (OSError, TypeError):
+            pass
+    return os.path.abspath(path) if path else "", line
+
+
+class StreamingResult(unittest.TestResult):
+    def startTest(self, test):
+        super().startTest(test)
+        self.started = time.perf_counter()
+        self.outcome = 'passed'
+        self.message = ''
+
+    def _set(self, outcome, message=''):
+        self.outcome = outcome
+        self.message = message
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._set('error', self._exc_info_to_string(err, test))
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._set('failed', self._exc_info_to_string(err, test))
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._set('skipped', reason)
+
+    def addExpectedFailure(self, test, err):
+        super().addExpectedFailure(test, err)
+        self._set('passed', 'expected failure')
+
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self._set('failed', 'unexpected success')
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        emit(event='result', id=test.id(), outcome=self.outcome,
+             duration=time.perf_counter() - self.started, message=self.message)
+
+
+def collect(root):
+    framework = detect_framework()
+    emit(event='framework', name=framework)
+    if framework == PYTEST:
+        import pytest
+        code = pytest.main(['--collect-only', '-q', '-p', 'no:cacheprovider', f'--rootdir={root}', root],
+                           plugins=[PytestCollector()])
+        return 0 if code in (0, 5) else int(code)
+
+    suite = unittest.TestLoader().discover(root, top_level_dir=root)
+    for test in _iter_tests(suite):
+        path, line = _test_location(test)
+        emit(event='test', id=test.id(), file=path, line=line)
+    return 0
+
+
+def run(root, framework, ids_file):
+    with open(ids_file, 'r', encoding='utf-8') as f:
+        ids = [line.strip() for line in f if line.strip()]
+    if not ids:
+        return 0
+
+    if framework == PYTEST:
+        import pytest
+        code = pytest.main(['-q', '-p', 'no:cacheprovider', f'--rootdir={root}'] + ids,
+                           plugins=[PytestReporter()])
+        return int(code)
+
+    result = StreamingResult()
+    for test_id in ids:
+        try:
+            suite = unittest.TestLoader().loadTestsFromName(test_id)
+        except Exception:
+            emit(event='result', id=test_id, outcome='error', duration=0.0, message=traceback.format_exc())
+            continue
+        suite.run(result)
+    return 0 if result.wasSuccessful() else 1
+
+
+def main(argv):
+    if len(argv) < 2 or argv[0] not in ('collect', 'run') or (argv[0] == 'run' and len(argv) < 4):
+        sys.stderr.write("usage: test_worker.py collect ROOT | run ROOT FRAMEWORK IDS_FILE\n")
+        return 2
+
+    root = os.path.abspath(argv[1])
+    os.chdir(root)
+    # Replace this script's folder so the IDE's own modules cannot shadow the project's
+    sys.path[0] = root
+    if argv[0] == 'collect':
+        return collect(root)
+    return run(root, argv[2], argv[3])
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# Same import root as src/main.py, so tests import the code as "src...."
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def app_data_dir(tmp_path, monkeypatch):
+    """Keeps the per-user data directory (journals, excludes, durations) out of the real home"""
+    path = tmp_path / "app_data"
+    monkeypatch.setenv("PARVIZ_IDE_HOME", str(path))
+    return path
@@ -0,0 +1,43 @@
+from src.services.conversation import Conversation
+from src.services.prompts import build_prompt
+
+
+def test_first_turn_matches_one_shot_prompt():
+    conversation = Conversation()
+    files = {"b.py": "B = 1", "a.py": "A = 1"}
+    prompt, _, _ = conversation.build_prompt("why?", "x = 1", files, "main.py")
+    assert prompt == build_prompt("why?", "x = 1", files)
+
+
+def test_follow_up_sends_diff_of_the_same_file():
+    conversation = Conversation()
+    code = "\n".join(f"line{i} = {i}" for i in range(40))
+    prompt, snapshot, generation = conversation.build_prompt("q1", code, code_path="main.py")
+    conversation.add_turn(prompt, "answer", snapshot, generation)
+
+    prompt, _, _ = conversation.build_prompt("q2", code, code_path="main.py")
+    assert "(unchanged since my last message)" in prompt
+
+    changed = code.replace("line5 = 5", "line5 = 50")
+    prompt, _, _ = conversation.build_prompt("q3", changed, code_path="main.py")
+    assert "```diff" in prompt
+    assert "+line5 = 50" in prompt
+
+
+def test_other_editor_file_is_sent_in_full():
+    conversation = Conversation()
+    prompt, snapshot, generation = conversation.build_prompt("q1", "a = 1\n" * 30, code_path="a.py")
+    conversation.add_turn(prompt, "answer", snapshot, generation)
+
+    prompt, _, _ = conversation.build_prompt("q2", "b = 2\n" * 30, code_path="b.py")
+    assert "```diff" not in prompt
+    assert "```python\n" + "b = 2\n" * 30 in prompt
+
+
+def test_turn_started_before_reset_is_dropped():
+    conversation = Conversation()
+    prompt, snapshot, generation = conversation.build_prompt("q1", "x = 1", code_path="main.py")
+    conversation.reset()
+    conversation.add_turn(prompt, "answer", snapshot, generation)
+    assert conversation.is_empty()
+    assert conversation.seen_files == {}
@@ -0,0 +1,90 @@
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+
+from src.utils.diagnostics import TimingHistogram, timed, timing_registry  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    timing_registry.reset()
+    yield
+    timing_registry.reset()
+
+
+def histogram_of(*milliseconds):
+    histogram = TimingHistogram()
+    for value in milliseconds:
+        histogram.record(value / 1000)
+    return histogram
+
+
+def test_percentiles_are_bucket_upper_bounds():
+    histogram = histogram_of(0.5, 1.5, 1.8, 4.0, 30.0)
+    assert histogram.percentile(0.2) == 1
+    # 3 of 5 samples are at most 2 ms
+    assert histogram.percentile(0.5) == 2
+    assert histogram.percentile(0.6) == 2
+    assert histogram.percentile(0.61) == 5
+    assert histogram.percentile(0.95) == 30.0
+    assert histogram.mean == pytest.approx(7.56)
+
+
+def test_percentile_never_exceeds_the_slowest_sample():
+    assert histogram_of(12.0).percentile(0.5) == pytest.approx(12.0)
+    assert histogram_of(1.0).percentile(1.0) == 1
+    # A sample exactly on a bound belongs to that bucket
+    assert histogram_of(5.0, 5.0).counts[2] == 2
+
+
+def test_overflow_bucket_and_empty_histogram():
+    assert histogram_of(60000.0).percentile(0.99) == pytest.approx(60000.0)
+    assert TimingHistogram().percentile(0.5) == 0.0
+    assert TimingHistogram().mean == 0.0
+
+
+def test_timed_records_each_call():
+    @timed()
+    def handler(value):
+        return value * 2
+
+    assert handler(21) == 42
+    handler(1)
+    [(name, count, mean, p50, p95, maximum)] = timing_registry.snapshot()
+    assert name.endswith("handler")
+    assert count == 2
+    assert 0 <= p50 <= p95 <= max(maximum, 1)
+
+
+def test_timed_records_and_reraises_exceptions():
+    @timed("failing")
+    def failing():
+        raise KeyError("boom")
+
+    with pytest.raises(KeyError):
+        failing()
+    assert [row[:2] for row in timing_registry.snapshot()] == [("failing", 1)]
+
+
+def test_timed_drops_extra_signal_arguments():
+    class Window:
+        @timed("clicked")
+        def on_click(self):
+            return "clicked"
+
+    # clicked(bool) passes a checked flag the slot does not take
+    assert Window().on_click(False) == "clicked"
+
+    @timed("variadic")
+    def variadic(*args):
+        return args
+
+    assert variadic(1, 2, 3) == (1, 2, 3)
+
+
+def test_snapshot_is_sorted_by_total_time():
+    timing_registry.record("fast", 0.001)
+    timing_registry.record("slow", 0.5)
+    for _ in range(3):
+        timing_registry.record("often", 0.1)
+    assert [row[0] for row in timing_registry.snapshot()] == ["slow", "often", "fast"]
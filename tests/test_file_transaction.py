@@ -0,0 +1,117 @@
+import os
+
+import pytest
+
+from src.utils import file_transaction
+from src.utils.file_transaction import (FileTransaction, FileTransactionError, list_change_sets,
+                                        revert_change_set)
+
+
+@pytest.fixture
+def journal_dir(tmp_path):
+    path = tmp_path / "journal"
+    path.mkdir()
+    return str(path)
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def write(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_commit_writes_every_file_and_journals_it(tmp_path, journal_dir):
+    existing = tmp_path / "a.py"
+    write(existing, "old")
+    new = tmp_path / "pkg" / "b.py"
+
+    journal_id = FileTransaction({str(existing): "new", str(new): "created"}, "edit", journal_dir).commit()
+
+    assert read(existing) == "new"
+    assert read(new) == "created"
+    [change_set] = list_change_sets(journal_dir)
+    assert change_set['id'] == journal_id
+    assert change_set['description'] == "edit"
+    assert sorted(change_set['files']) == sorted([str(existing), str(new)])
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_revert_restores_and_removes_created_files(tmp_path, journal_dir):
+    existing = tmp_path / "a.py"
+    write(existing, "old")
+    new = tmp_path / "pkg" / "b.py"
+    FileTransaction({str(existing): "new", str(new): "created"}, journal_dir=journal_dir).commit()
+
+    restored, skipped = revert_change_set(journal_dir=journal_dir)
+
+    assert sorted(restored) == sorted([str(existing), str(new)])
+    assert skipped == []
+    assert read(existing) == "old"
+    assert not new.exists() and not new.parent.exists()
+    assert list_change_sets(journal_dir) == []
+
+
+def test_failed_replace_rolls_back(tmp_path, journal_dir, monkeypatch):
+    first = tmp_path / "a.py"
+    second = tmp_path / "b.py"
+    write(first, "a")
+    write(second, "b")
+    real_replace = os.replace
+
+    def failing_replace(source, target):
+        if target == str(second):
+            raise OSError("disk full")
+        real_replace(source, target)
+
+    monkeypatch.setattr(file_transaction.os, "replace", failing_replace)
+    with pytest.raises(FileTransactionError):
+        FileTransaction({str(first): "A", str(second): "B"}, journal_dir=journal_dir, max_workers=1).commit()
+    monkeypatch.undo()
+
+    assert read(first) == "a"
+    assert read(second) == "b"
+    assert list_change_sets(journal_dir) == []
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_change_sets_in_the_same_second_keep_commit_order(tmp_path, journal_dir, monkeypatch):
+    monkeypatch.setattr(file_transaction.time, "time_ns", lambda: 1_700_000_000_000_000_000)
+    target = tmp_path / "a.py"
+    ids = []
+    for index in range(10):
+        ids.append(FileTransaction({str(target): str(index)}, journal_dir=journal_dir).commit())
+
+    assert [change_set['id'] for change_set in list_change_sets(journal_dir)] == ids[::-1]
+    restored, _ = revert_change_set(journal_dir=journal_dir)
+    assert read(target) == "8"
+
+
+def test_skipped_revert_does_not_block_older_change_sets(tmp_path, journal_dir):
+    first = tmp_path / "a.py"
+    second = tmp_path / "b.py"
+    write(first, "a0")
+    FileTransaction({str(first): "a1"}, journal_dir=journal_dir).commit()
+    FileTransaction({str(second): "b1"}, journal_dir=journal_dir).commit()
+    write(second, "edited by hand")
+
+    restored, skipped = revert_change_set(journal_dir=journal_dir)
+    assert (restored, skipped) == ([], [str(second)])
+    assert read(second) == "edited by hand"
+
+    restored, skipped = revert_change_set(journal_dir=journal_dir)
+    assert (restored, skipped) == ([str(first)], [])
+    assert read(first) == "a0"
+
+
+def test_force_revert_overwrites_modified_files(tmp_path, journal_dir):
+    target = tmp_path / "a.py"
+    write(target, "old")
+    journal_id = FileTransaction({str(target): "new"}, journal_dir=journal_dir).commit()
+    write(target, "edited")
+
+    assert revert_change_set(journal_id, journal_dir, force=True) == ([str(target)], [])
+    assert read(target) == "old"
@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+
+from src.services.hedging import LatencyTracker, HedgeStats, HedgedRequest
+
+
+def make_stream(delays, chunks=("Hello", " world")):
+    """stream_factory whose model waits delays[model] seconds before its first chunk"""
+    def factory(model_name):
+        time.sleep(delays[model_name])
+        for chunk in chunks:
+            yield f"{model_name}:{chunk}"
+    return factory
+
+
+def test_hedge_delay_uses_default_until_enough_samples():
+    tracker = LatencyTracker(min_samples=3, default_delay=2.5)
+    tracker.record("a", 0.1)
+    tracker.record("a", 0.2)
+    assert tracker.hedge_delay("a") == 2.5
+    tracker.record("a", 0.3)
+    assert tracker.hedge_delay("a") == pytest.approx(0.3)
+
+
+def test_percentile_over_rolling_window():
+    tracker = LatencyTracker(window=10)
+    for value in range(100):
+        tracker.record("a", float(value))
+    assert tracker.percentile("a", 0) == 90.0
+    assert tracker.percentile("a", 100) == 99.0
+    assert tracker.percentile("missing", 50) is None
+
+
+def test_fast_primary_is_not_hedged():
+    stats = HedgeStats()
+    request = HedgedRequest(make_stream({"a": 0.0, "b": 0.0}), "a", "b", delay=1.0,
+                            tracker=LatencyTracker(), stats=stats)
+    winner, text = request.run()
+    assert winner == "a"
+    assert text == "a:Helloa: world"
+    assert "b" not in request.attempts
+    assert stats.hedged == 0 and stats.total == 1
+
+
+def test_slow_primary_is_hedged_and_secondary_wins():
+    stats = HedgeStats()
+    request = HedgedRequest(make_stream({"a": 1.0, "b": 0.0}), "a", "b", delay=0.05,
+                            tracker=LatencyTracker(), stats=stats)
+    started = time.monotonic()
+    winner, text = request.run()
+    assert winner == "b"
+    assert text == "b:Hellob: world"
+    assert time.monotonic() - started < 0.9
+    assert stats.hedged == 1 and stats.secondary_wins == 1
+    assert request.attempts["a"].cancel.is_set()
+
+
+def test_empty_chunks_do_not_win_the_race():
+    def factory(model_name):
+        if model_name == "a":
+            # A role-only delta right away, then nothing useful for a while
+            yield ""
+            time.sleep(1.0)
+            yield "late"
+        else:
+            time.sleep(0.05)
+            yield "b:ok"
+
+    received = []
+    request = HedgedRequest(factory, "a", "b", delay=0.01, tracker=LatencyTracker(), stats=HedgeStats(),
+                            on_chunk=received.append)
+    assert request.run() == ("b", "b:ok")
+    assert received == ["b:ok"]
+    assert request.attempts["a"].first_token_at is None
+
+
+def test_winning_stream_reports_its_chunks_and_timings():
+    def factory(model_name):
+        yield ""
+        yield "Hello"
+        yield ""
+        yield " world"
+
+    received = []
+    request = HedgedRequest(factory, "a", "b", delay=1.0, tracker=LatencyTracker(), stats=HedgeStats(),
+                            on_chunk=received.append)
+    assert request.run() == ("a", "Hello world")
+    assert received == ["Hello", "", " world"]
+    winning = request.attempts["a"]
+    assert winning.launched_at <= winning.first_chunk_at <= winning.first_token_at
+
+
+def test_failing_primary_falls_over_to_secondary_immediately():
+    def factory(model_name):
+        if model_name == "a":
+            raise ConnectionError("down")
+        return iter(["ok"])
+
+    request = HedgedRequest(factory, "a", "b", delay=10.0, tracker=LatencyTracker(), stats=HedgeStats())
+    started = time.monotonic()
+    assert request.run() == ("b", "ok")
+    assert time.monotonic() - started < 5.0
+
+
+def test_every_attempt_failing_raises_the_first_error():
+    def factory(model_name):
+        raise ValueError(model_name)
+
+    request = HedgedRequest(factory, "a", "b", delay=0.0, tracker=LatencyTracker(), stats=HedgeStats())
+    with pytest.raises(ValueError):
+        request.run()
+
+
+def test_stats_are_thread_safe():
+    stats = HedgeStats()
+    threads = [threading.Thread(target=lambda: [stats.record(True, False, 0.0) for _ in range(500)])
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stats.total == 2000
+    assert stats.hedge_rate() == 1.0
@@ -0,0 +1,140 @@
+import os
+
+from src.utils.ignore_rules import (DEFAULT_USER_EXCLUDES, IgnoreRules, ignore_rules_cache, is_ignore_file,
+                                    user_excludes_path)
+
+
+def rules_with(*lines, root="/project"):
+    rules = IgnoreRules(root)
+    for line in lines:
+        rules.add_pattern(line)
+    return rules
+
+
+def write(path, text=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_unanchored_patterns_match_at_any_depth():
+    rules = rules_with("*.log", "build")
+    assert rules.matches("debug.log")
+    assert rules.matches("a/b/debug.log")
+    assert rules.matches("src/build", True)
+    assert rules.matches("src/build")
+    assert not rules.matches("debug.log.txt")
+
+
+def test_slash_anchors_to_the_ignore_files_folder():
+    rules = rules_with("/dist", "docs/*.html")
+    assert rules.matches("dist", True)
+    assert not rules.matches("pkg/dist", True)
+    assert rules.matches("docs/index.html")
+    assert not rules.matches("pkg/docs/index.html")
+    # '*' stays within one path segment
+    assert not rules.matches("docs/api/index.html")
+
+
+def test_trailing_slash_matches_folders_only():
+    rules = rules_with("cache/")
+    assert rules.matches("cache", True)
+    assert rules.matches("src/cache", True)
+    assert not rules.matches("cache", False)
+
+
+def test_double_star():
+    rules = rules_with("**/generated", "assets/**/*.png", "vendor/**")
+    assert rules.matches("generated", True)
+    assert rules.matches("a/b/generated", True)
+    assert rules.matches("assets/logo.png")
+    assert rules.matches("assets/icons/small/logo.png")
+    assert rules.matches("vendor/lib/module.py")
+    # "vendor/**" ignores what is inside, not the folder itself
+    assert not rules.matches("vendor", True)
+
+
+def test_later_negation_re_includes():
+    rules = rules_with("*.py[cod]", "!keep.pyc", "secrets/**", "!secrets/README.md")
+    assert rules.matches("module.pyc")
+    assert not rules.matches("keep.pyc")
+    assert rules.matches("secrets/key.pem")
+    assert not rules.matches("secrets/README.md")
+    assert rules_with("!keep.pyc", "*.pyc").matches("keep.pyc")
+
+
+def test_escapes_comments_and_blank_lines():
+    rules = rules_with("# comment", "", "\\#notes.txt", "\\!important.txt", "trailing\\ ")
+    assert rules.matches("#notes.txt")
+    assert rules.matches("!important.txt")
+    assert rules.matches("trailing ")
+    assert not rules.matches("comment")
+
+
+def test_git_folder_is_always_ignored():
+    assert IgnoreRules("/project").matches("sub/.git", True)
+
+
+def test_precedence_and_nested_gitignores(tmp_path):
+    user = tmp_path / "excludes.gitignore"
+    write(str(user), "*.tmp\nnotes/\n")
+    write(str(tmp_path / "project" / ".git" / "info" / "exclude"), "!keep.tmp\n")
+    write(str(tmp_path / "project" / ".gitignore"), "!notes/\nsecret.txt\n")
+    write(str(tmp_path / "project" / "pkg" / ".gitignore"), "/local.txt\n!secret.txt\n")
+    root = tmp_path / "project"
+    rules = IgnoreRules(str(root), str(user))
+
+    assert rules.is_ignored("scratch.tmp", False)
+    assert not rules.is_ignored("keep.tmp", False)
+    assert not rules.is_ignored("notes", True)
+    assert rules.is_ignored("secret.txt", False)
+    # Nested .gitignore files are picked up on the way down, anchored to their folder
+    assert not rules.is_ignored("pkg/secret.txt", False)
+    assert rules.is_ignored("pkg/local.txt", False)
+    assert not rules.is_ignored("local.txt", False)
+
+
+def test_walk_prunes_ignored_folders(tmp_path):
+    write(str(tmp_path / ".gitignore"), "build/\n*.log\n")
+    write(str(tmp_path / "src" / "app.py"))
+    write(str(tmp_path / "src" / "run.log"))
+    write(str(tmp_path / "src" / ".gitignore"), "fixtures/\n")
+    write(str(tmp_path / "src" / "fixtures" / "data.py"))
+    write(str(tmp_path / "build" / "out.py"))
+    write(str(tmp_path / ".git" / "HEAD"))
+
+    rules = IgnoreRules(str(tmp_path))
+    found = {os.path.relpath(os.path.join(folder, name), tmp_path)
+             for folder, _, files in rules.walk() for name in files}
+    assert found == {".gitignore", os.path.join("src", "app.py"), os.path.join("src", ".gitignore")}
+    assert rules.is_ignored(str(tmp_path / "build" / "out.py"), False)
+
+
+def test_defaults_do_not_hide_project_packages(tmp_path):
+    rules = IgnoreRules(str(tmp_path), user_excludes_path())
+    assert rules.matches("pkg/__pycache__", True)
+    assert rules.matches("module.pyc")
+    assert not rules.matches("logs", True)
+    assert not rules.matches("logs/__init__.py")
+    with open(user_excludes_path(), encoding='utf-8') as f:
+        assert f.read() == DEFAULT_USER_EXCLUDES
+
+
+def test_cache_rebuilds_when_an_ignore_file_changes(tmp_path):
+    os.makedirs(tmp_path / ".git")
+    gitignore = tmp_path / ".gitignore"
+    first = ignore_rules_cache.rules_for(str(tmp_path / "sub"))
+    assert first.root == str(tmp_path)
+    assert ignore_rules_cache.rules_for(str(tmp_path)) is first
+
+    write(str(gitignore), "*.out\n")
+    second = ignore_rules_cache.rules_for(str(tmp_path))
+    assert second is not first
+    assert second.matches("result.out")
+
+
+def test_is_ignore_file(tmp_path):
+    assert is_ignore_file(str(tmp_path / "pkg" / ".gitignore"))
+    assert is_ignore_file(str(tmp_path / ".git" / "info" / "exclude"))
+    assert is_ignore_file(user_excludes_path())
+    assert not is_ignore_file(str(tmp_path / "exclude"))
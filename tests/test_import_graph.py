@@ -0,0 +1,74 @@
+import os
+
+from src.services.import_graph import ImportGraph, changed_files, module_name, source_snapshot
+
+
+def make_project(root, files):
+    for relative, text in files.items():
+        path = os.path.join(root, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+def build(root):
+    graph = ImportGraph()
+    graph.build(source_snapshot(str(root)))
+    return graph
+
+
+def test_module_names_follow_packages(tmp_path):
+    make_project(tmp_path, {"app/__init__.py": "", "app/core/__init__.py": "", "app/core/db.py": "", "tool.py": ""})
+    assert module_name(tmp_path / "app" / "core" / "db.py") == "app.core.db"
+    assert module_name(tmp_path / "app" / "core" / "__init__.py") == "app.core"
+    assert module_name(tmp_path / "tool.py") == "tool"
+
+
+def test_dependents_follow_imports_transitively(tmp_path):
+    make_project(tmp_path, {
+        "app/__init__.py": "",
+        "app/db.py": "",
+        "app/models.py": "from . import db\n",
+        "app/views.py": "from app.models import Model\n",
+        "app/unrelated.py": "import json\n",
+        "tests/test_views.py": "import app.views\n",
+        "tests/test_other.py": "from app import unrelated\n",
+    })
+    graph = build(tmp_path)
+    db = str(tmp_path / "app" / "db.py")
+
+    dependents = graph.dependents({db})
+
+    assert {os.path.relpath(path, tmp_path) for path in dependents} == {
+        os.path.join("app", "db.py"), os.path.join("app", "models.py"),
+        os.path.join("app", "views.py"), os.path.join("tests", "test_views.py"),
+    }
+
+
+def test_package_init_changes_reach_importers_of_submodules(tmp_path):
+    make_project(tmp_path, {"pkg/__init__.py": "", "pkg/mod.py": "", "test_mod.py": "import pkg.mod\n"})
+    graph = build(tmp_path)
+    init = str(tmp_path / "pkg" / "__init__.py")
+    assert str(tmp_path / "test_mod.py") in graph.dependents({init})
+
+
+def test_import_cycles_terminate(tmp_path):
+    make_project(tmp_path, {"a.py": "import b\n", "b.py": "import a\n"})
+    graph = build(tmp_path)
+    assert graph.dependents({str(tmp_path / "a.py")}) == {str(tmp_path / "a.py"), str(tmp_path / "b.py")}
+
+
+def test_snapshot_skips_ignored_folders_and_reports_changes(tmp_path):
+    make_project(tmp_path, {
+        ".gitignore": "build/\n",
+        "keep.py": "",
+        "build/generated.py": "",
+        ".venv/lib/site.py": "",
+        "__pycache__/keep.cpython-311.py": "",
+    })
+    old = source_snapshot(str(tmp_path))
+    assert list(old) == [str(tmp_path / "keep.py")]
+
+    make_project(tmp_path, {"new.py": ""})
+    assert changed_files(old, source_snapshot(str(tmp_path))) == {str(tmp_path / "new.py")}
+    assert changed_files(old, {}) == {str(tmp_path / "keep.py")}
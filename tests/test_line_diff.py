@@ -0,0 +1,67 @@
+import random
+import time
+
+import pytest
+
+from src.utils.line_diff import diff_opcodes
+
+
+def check_opcodes(a, b):
+    """Opcodes must tile both sides and equal runs must really be equal; returns the opcodes"""
+    opcodes = diff_opcodes(a, b)
+    i = j = 0
+    rebuilt = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (i1, j1) == (i, j)
+        if tag == 'equal':
+            assert a[i1:i2] == b[j1:j2]
+        rebuilt += b[j1:j2]
+        i, j = i2, j2
+    assert (i, j) == (len(a), len(b))
+    assert rebuilt == b
+    return opcodes
+
+
+def test_identical_and_empty_inputs():
+    assert diff_opcodes([], []) == []
+    assert diff_opcodes(["a"], ["a"]) == [('equal', 0, 1, 0, 1)]
+    assert diff_opcodes([], ["a"]) == [('insert', 0, 0, 0, 1)]
+    assert diff_opcodes(["a"], []) == [('delete', 0, 1, 0, 0)]
+
+
+def test_single_change_is_isolated():
+    a = [f"line {i}" for i in range(100)]
+    b = list(a)
+    b[50] = "changed"
+    assert diff_opcodes(a, b) == [
+        ('equal', 0, 50, 0, 50), ('replace', 50, 51, 50, 51), ('equal', 51, 100, 51, 100),
+    ]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_edits_produce_valid_opcodes(seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        a = [rng.choice("abcde") for _ in range(rng.randint(0, 40))]
+        b = list(a)
+        for _ in range(rng.randint(0, 6)):
+            position = rng.randint(0, len(b))
+            roll = rng.random()
+            if roll < 0.4:
+                b.insert(position, rng.choice("abcdefg"))
+            elif b:
+                del b[min(position, len(b) - 1)]
+        check_opcodes(a, b)
+
+
+def test_repeated_lines_stay_fast():
+    # Blank lines and closing brackets repeat everywhere in real code
+    filler = ["", "    pass", "}", "    return x"]
+    a = [filler[i % 4] if i % 5 else f"def f{i}():" for i in range(15000)]
+    b = list(a)
+    for i in range(0, len(b), 500):
+        b[i] = f"changed {i}"
+    started = time.perf_counter()
+    opcodes = check_opcodes(a, b)
+    assert time.perf_counter() - started < 2.0
+    assert sum(1 for tag, *_ in opcodes if tag != 'equal') == 30
@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+
+LINE_TIMER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          "src", "utils", "line_timer.py")
+
+SCRIPT = """\
+import cProfile
+
+
+def work(n):
+    total = 0
+    for i in range(n):
+        total += i
+    return total
+
+
+profiler = cProfile.Profile()
+profiler.enable()
+work(100)
+profiler.disable()
+print("done")
+"""
+
+
+def run_timed(tmp_path, source):
+    script = tmp_path / "script.py"
+    script.write_text(source, encoding='utf-8')
+    output = tmp_path / "lines.json"
+    result = subprocess.run([sys.executable, LINE_TIMER, str(output), str(script)],
+                            capture_output=True, text=True, timeout=60)
+    return result, str(script), output
+
+
+def test_lines_of_the_script_are_counted(tmp_path):
+    result, script, output = run_timed(tmp_path, SCRIPT)
+    # The script's own cProfile must not collide with the timer's sys.monitoring tool
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "done"
+
+    data = json.loads(output.read_text(encoding='utf-8'))
+    assert data['file'] == script
+    assert data['backend'] == ("sys.monitoring" if hasattr(sys, 'monitoring') else "sys.settrace")
+    lines = {int(line): (hits, seconds) for line, (hits, seconds) in data['lines'].items()}
+    assert lines[7][0] == 100
+    assert lines[13][0] == 1
+    assert all(seconds >= 0 for _, seconds in lines.values())
+    assert sum(seconds for _, seconds in lines.values()) <= data['wall_time']
+
+
+def test_results_are_written_when_the_script_fails(tmp_path):
+    result, _, output = run_timed(tmp_path, "x = 1\nraise SystemExit(3)\n")
+    assert result.returncode == 3
+    lines = json.loads(output.read_text(encoding='utf-8'))['lines']
+    assert lines["1"][0] == 1 and lines["2"][0] == 1
@@ -0,0 +1,52 @@
+import glob
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+
+import pytest
+
+TRACER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      "src", "utils", "memory_tracer.py")
+HELD_BYTES = 7 * 1024 * 1024
+
+
+def run_traced(tmp_path, source):
+    script = tmp_path / "script.py"
+    script.write_text(source, encoding='utf-8')
+    snapshots = tmp_path / "snapshots"
+    result = subprocess.run([sys.executable, TRACER, str(snapshots), "0", str(script)],
+                            capture_output=True, text=True, timeout=60)
+    [exit_snapshot] = glob.glob(str(snapshots / "*-exit.snapshot"))
+    return result, str(script), exit_snapshot
+
+
+def traced_bytes(snapshot_path, filename):
+    snapshot = tracemalloc.Snapshot.load(snapshot_path)
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(True, filename)])
+    return sum(stat.size for stat in snapshot.statistics('filename'))
+
+
+def test_exit_snapshot_holds_module_level_allocations(tmp_path):
+    result, script, snapshot = run_traced(tmp_path, f"data = bytearray({HELD_BYTES})\n")
+    assert result.returncode == 0, result.stderr
+    assert traced_bytes(snapshot, script) >= HELD_BYTES
+
+    with open(snapshot[:-len(".snapshot")] + ".json", encoding='utf-8') as f:
+        meta = json.load(f)
+    assert meta['label'] == "exit"
+    assert meta['current'] >= HELD_BYTES
+
+
+@pytest.mark.parametrize("ending", ["raise RuntimeError('boom')", "import sys; sys.exit(3)"])
+def test_exit_snapshot_is_taken_when_the_script_fails(tmp_path, ending):
+    result, script, snapshot = run_traced(tmp_path, f"data = bytearray({HELD_BYTES})\n{ending}\n")
+    assert result.returncode != 0
+    assert traced_bytes(snapshot, script) >= HELD_BYTES
+
+
+def test_script_runs_as_main_with_its_arguments(tmp_path):
+    result, _, _ = run_traced(tmp_path, "import sys\nassert __name__ == '__main__'\nprint(sys.argv[0])\n")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith("script.py")
@@ -0,0 +1,84 @@
+import time
+
+from src.utils.patching import Hunk, apply_hunks_to_text, compute_hunks, merge_hunks
+
+
+def numbered(count):
+    return "".join(f"line {i}\n" for i in range(count))
+
+
+def test_compute_hunks_round_trips():
+    original = "a\nb\nc\nd\n"
+    suggested = "a\nB\nc\nd\ne\n"
+    hunks = compute_hunks(original, suggested)
+    assert [(h.start, h.end, h.lines) for h in hunks] == [(1, 2, ["B\n"]), (4, 4, ["e\n"])]
+    assert apply_hunks_to_text(original, hunks) == suggested
+
+
+def test_line_numbers_follow_document_blocks():
+    # A form feed or line separator inside a line does not start a new block
+    original = "import os\n\f\ndef f():\u2028    pass\nx = 1\n"
+    suggested = original.replace("x = 1", "x = 2")
+    hunks = compute_hunks(original, suggested)
+    assert [(h.start, h.end, h.lines) for h in hunks] == [(3, 4, ["x = 2\n"])]
+    assert apply_hunks_to_text(original, hunks) == suggested
+    assert [(h.start, h.end, h.lines) for h in compute_hunks("a\nb", "a\nc")] == [(1, 2, ["c"])]
+
+
+def test_merge_rebases_past_local_edits():
+    base = numbered(20)
+    current = base.replace("line 2\n", "line 2\nlocal insert\n")
+    suggested = base.replace("line 15\n", "line fifteen\n")
+
+    hunks, conflicts = merge_hunks(base, current, suggested)
+
+    assert conflicts == []
+    assert [(h.start, h.end) for h in hunks] == [(16, 17)]
+    assert apply_hunks_to_text(current, hunks) == current.replace("line 15\n", "line fifteen\n")
+
+
+def test_overlapping_edits_conflict():
+    base = numbered(10)
+    current = base.replace("line 5\n", "mine\n")
+    suggested = base.replace("line 5\n", "theirs\n").replace("line 8\n", "eight\n")
+
+    hunks, conflicts = merge_hunks(base, current, suggested)
+
+    assert [(h.start, h.end, h.lines) for h in conflicts] == [(5, 6, ["theirs\n"])]
+    assert apply_hunks_to_text(current, hunks) == current.replace("line 8\n", "eight\n")
+
+
+def test_adjacent_edits_do_not_conflict_but_insertions_at_the_same_point_do():
+    base = numbered(6)
+    current = base.replace("line 2\n", "mine\n")
+    _, conflicts = merge_hunks(base, current, base.replace("line 3\n", "theirs\n"))
+    assert conflicts == []
+
+    current = base.replace("line 3\n", "inserted\nline 3\n")
+    _, conflicts = merge_hunks(base, current, base.replace("line 3\n", "also inserted\nline 3\n"))
+    assert len(conflicts) == 1
+
+
+def test_unchanged_suggestion_has_no_hunks():
+    text = numbered(100)
+    assert compute_hunks(text, text) == []
+    assert merge_hunks(text, text + "local\n", text) == ([], [])
+
+
+def test_large_merge_stays_fast():
+    # Repeated lines made SequenceMatcher(autojunk=False) take seconds at this size
+    base = "".join(f"def f{i}():\n    return None\n\n" for i in range(5000))
+    current = base.replace("def f10():", "def f10(x):")
+    suggested = base.replace("def f4000():", "def f4000(y):")
+
+    started = time.perf_counter()
+    hunks, conflicts = merge_hunks(base, current, suggested)
+    compute_hunks(current, suggested)
+    assert time.perf_counter() - started < 1.0
+
+    assert conflicts == []
+    assert apply_hunks_to_text(current, hunks) == current.replace("def f4000():", "def f4000(y):")
+
+
+def test_hunk_delta():
+    assert Hunk(2, 5, ["x\n"]).line_delta() == -2
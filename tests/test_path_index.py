@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+
+from src.services.path_index import PathSnapshot, match_score  # noqa: E402
+
+PATHS = [
+    "src/main.py",
+    "src/ui/main_window.py",
+    "docs/domain.md",
+    "src/utils/file_utils.py",
+    "tests/test_main.py",
+    "README.md",
+    "src/models/inventory.py",
+]
+
+
+def test_empty_query_lists_shortest_paths_first():
+    snapshot = PathSnapshot(PATHS)
+    assert snapshot.search("", limit=3) == ["README.md", "src/main.py", "docs/domain.md"]
+    assert len(snapshot) == len(PATHS)
+
+
+def test_name_prefix_beats_substring_and_subsequence():
+    results = PathSnapshot(PATHS).search("main")
+    # Prefix of the name, then the name containing it, then the path containing it
+    assert results[:2] == ["src/main.py", "src/ui/main_window.py"]
+    assert results.index("tests/test_main.py") < results.index("docs/domain.md")
+
+
+def test_subsequence_and_path_queries():
+    snapshot = PathSnapshot(PATHS)
+    assert snapshot.search("fut") == ["src/utils/file_utils.py"]
+    assert snapshot.search("ui/mw") == ["src/ui/main_window.py"]
+    assert snapshot.search("src\\models") == ["src/models/inventory.py"]
+    assert snapshot.search("zzz") == []
+
+
+def test_limit_is_respected():
+    paths = [f"pkg/module_{i}.py" for i in range(500)]
+    assert len(PathSnapshot(paths).search("module", limit=7)) == 7
+
+
+def test_narrowing_queries_match_fresh_searches():
+    rng = random.Random(4)
+    words = ["core", "view", "model", "test", "util", "main", "data"]
+    paths = {"/".join(rng.choice(words) + str(rng.randrange(5)) for _ in range(rng.randrange(1, 4))) + ".py"
+             for _ in range(300)}
+    typing = PathSnapshot(paths)
+    for query in ["m", "mo", "mod", "mode", "model", "model3", "v", "vi", "view/"]:
+        assert typing.search(query) == PathSnapshot(paths).search(query)
+
+
+def test_match_score_prefers_word_starts_and_runs():
+    assert match_score("fu", "file_utils.py") > match_score("fu", "fxxxu.py")
+    assert match_score("main", "main.py") > match_score("main", "m_a_i_n.py")
+    assert match_score("xyz", "main.py") is None
@@ -0,0 +1,74 @@
+import json
+import marshal
+import pstats
+
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+
+from src.services.profiler import flame_from_stats, load_functions, load_line_timings  # noqa: E402
+
+MAIN = ("app.py", 1, "main")
+PARSE = ("app.py", 10, "parse")
+TOKENIZE = ("app.py", 20, "tokenize")
+TINY = ("app.py", 30, "tiny")
+
+
+def write_stats(path, entries):
+    """A pstats file in cProfile's format: {func: (primitive calls, calls, own, cumulative, {caller: ...})}"""
+    with open(path, 'wb') as f:
+        marshal.dump(entries, f)
+    return pstats.Stats(str(path))
+
+
+@pytest.fixture
+def stats(tmp_path):
+    return write_stats(tmp_path / "profile.stats", {
+        MAIN: (1, 1, 1.0, 10.0, {}),
+        PARSE: (1, 1, 2.0, 6.0, {MAIN: (1, 1, 2.0, 6.0)}),
+        # 1 s of tokenize comes straight from main, 3 s through parse
+        TOKENIZE: (2, 2, 4.0, 4.0, {MAIN: (1, 1, 1.0, 1.0), PARSE: (1, 1, 3.0, 3.0)}),
+        TINY: (1, 1, 0.001, 0.001, {PARSE: (1, 1, 0.001, 0.001)}),
+    })
+
+
+def test_load_functions_sorted_by_own_time(stats):
+    functions = load_functions(stats)
+    assert [function.name for function in functions] == ["tokenize", "parse", "main", "tiny"]
+    tokenize = functions[0]
+    assert (tokenize.filename, tokenize.line, tokenize.calls, tokenize.own_time, tokenize.cumulative_time) == \
+        ("app.py", 20, 2, 4.0, 4.0)
+
+
+def test_flame_follows_callers(stats):
+    root = flame_from_stats(stats)
+    assert root.value == pytest.approx(10.0)
+    [main] = root.children.values()
+    assert (main.name, main.value) == ("main", pytest.approx(10.0))
+    children = {node.name: node for node in main.children.values()}
+    assert children["parse"].value == pytest.approx(6.0)
+    assert children["tokenize"].value == pytest.approx(1.0)
+    # Under 0.1% of the total is left out
+    assert [node.name for node in children["parse"].children.values()] == ["tokenize"]
+    assert next(iter(children["parse"].children.values())).value == pytest.approx(3.0)
+    assert root.depth() == 4
+
+
+def test_flame_stops_at_recursion_and_depth_limit(tmp_path):
+    recurse = ("app.py", 5, "recurse")
+    stats = write_stats(tmp_path / "recursive.stats", {
+        MAIN: (1, 1, 0.0, 2.0, {}),
+        recurse: (1, 50, 2.0, 2.0, {MAIN: (1, 1, 0.0, 2.0), recurse: (49, 49, 1.9, 1.9)}),
+    })
+    assert flame_from_stats(stats).depth() == 3
+    assert flame_from_stats(stats, max_depth=1).depth() == 2
+
+
+def test_load_line_timings(tmp_path):
+    path = tmp_path / "lines.json"
+    path.write_text(json.dumps({'file': "app.py", 'backend': "sys.settrace", 'wall_time': 1.5,
+                                'lines': {"3": [10, 0.25], "7": [1, 1.0]}}), encoding='utf-8')
+    backend, lines = load_line_timings(str(path))
+    assert backend == "sys.settrace"
+    assert lines == {3: (10, 0.25), 7: (1, 1.0)}
+    assert sum(seconds for _, seconds in lines.values()) == pytest.approx(1.25)
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from src.services.response_parser import ResponseParser, PROSE, CODE, FILE
+
+
+def blocks(text):
+    return [event for event in ResponseParser.parse(text) if event.kind != PROSE]
+
+
+@pytest.mark.parametrize("heading", [
+    "### src/foo.py",
+    "## File: src/foo.py",
+    "**src/foo.py**",
+    "**src/foo.py:**",
+    "**File:** `src/foo.py`",
+    "1. `src/foo.py`:",
+    "- **src/foo.py**",
+    "`src/foo.py`:",
+])
+def test_heading_names_the_file(heading):
+    [event] = blocks(f"Here you go.\n\n{heading}\n```python\nx = 1\n```\n")
+    assert event.kind == FILE
+    assert event.filename == "src/foo.py"
+    assert event.content == "x = 1\n"
+
+
+@pytest.mark.parametrize("prose", [
+    "**Note:** this needs Python 3.11",
+    "1. First, let's look at main.py",
+    "# Let's change main.py",
+    "**Requires version 2.0**",
+    "Update main.py",
+    "main.py",
+    "e.g.",
+])
+def test_prose_is_not_a_file_heading(prose):
+    [event] = blocks(f"{prose}\n```python\nx = 1\n```\n")
+    assert event.kind == CODE
+    assert event.filename is None
+
+
+def test_filename_in_fence_info():
+    [event] = blocks("```python src/foo.py\nx = 1\n```\n")
+    assert (event.kind, event.filename, event.language) == (FILE, "src/foo.py", "python")
+    [event] = blocks("```config.toml\na = 1\n```\n")
+    assert (event.kind, event.filename, event.language) == (FILE, "config.toml", "toml")
+
+
+def test_version_in_fence_info_is_not_a_filename():
+    [event] = blocks("```python3.11\nx = 1\n```\n")
+    assert event.kind == CODE
+
+
+def test_streamed_chunks_match_one_shot_parse():
+    text = "Intro\n\n### a.py\n```python\nA = 1\n```\nMiddle\n```\nplain\n```\nOutro"
+    parser = ResponseParser()
+    for index in range(0, len(text), 3):
+        parser.feed(text[index:index + 3])
+    parser.close()
+    expected = ResponseParser.parse(text)
+    assert [(e.kind, e.filename, e.content) for e in parser.events] == \
+        [(e.kind, e.filename, e.content) for e in expected]
+    assert [e.kind for e in expected] == [PROSE, FILE, PROSE, CODE, PROSE]
+
+
+def test_long_line_streams_in_linear_time():
+    parser = ResponseParser()
+    started = time.perf_counter()
+    for _ in range(100000):
+        assert parser.feed("x" * 10) == []
+    parser.feed("\n")
+    parser.close()
+    assert time.perf_counter() - started < 1.0
+    [event] = parser.events
+    assert event.kind == PROSE and len(event.content) == 1000000
+
+
+def test_identical_blocks_are_reported_once():
+    text = "### a.py\n```python\nA = 1\n```\n### a.py\n```python\nA = 1\n```\n"
+    assert len(blocks(text)) == 1
+
+
+def test_unterminated_fence_is_closed():
+    [event] = blocks("```python\nx = 1\n")
+    assert event.kind == CODE and event.content == "x = 1\n"
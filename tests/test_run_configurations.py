@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+
+from src.services.run_configurations import (DEFAULT_MAX_PARALLEL, RunConfiguration,  # noqa: E402
+                                             RunConfigurationStore, format_cpu_list, parse_cpu_list)
+
+
+def test_parse_cpu_list():
+    assert parse_cpu_list("0-3,6") == [0, 1, 2, 3, 6]
+    assert parse_cpu_list(" 2 , 1,2-2,") == [1, 2]
+    assert parse_cpu_list("") == []
+    assert format_cpu_list(parse_cpu_list("4,0-1")) == "0,1,4"
+
+
+@pytest.mark.parametrize("text", ["3-1", "a", "1-", "-1", "0-2-4", "1.5"])
+def test_parse_cpu_list_rejects_malformed_input(text):
+    with pytest.raises(ValueError):
+        parse_cpu_list(text)
+
+
+def test_store_round_trip(tmp_path):
+    store = RunConfigurationStore(str(tmp_path / "runs.json"))
+    configuration = RunConfiguration("bench", "/work/bench.py", "--fast -n 3", "/work", "/usr/bin/python3",
+                                     {"SEED": "1"}, [0, 2])
+    store.save([configuration], 3)
+
+    with open(store.path, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data == {
+        'configurations': [{
+            'name': "bench", 'script': "/work/bench.py", 'args': "--fast -n 3", 'working_dir': "/work",
+            'interpreter': "/usr/bin/python3", 'env': {"SEED": "1"}, 'cpus': [0, 2],
+        }],
+        'max_parallel': 3,
+    }
+
+    [loaded], max_parallel = store.load()
+    assert loaded.to_dict() == configuration.to_dict()
+    assert max_parallel == 3
+    assert [path.name for path in tmp_path.iterdir()] == ["runs.json"]
+
+
+def test_store_fills_in_missing_fields(tmp_path):
+    path = tmp_path / "runs.json"
+    path.write_text(json.dumps({'configurations': [{'name': "old", 'script': "s.py"}]}), encoding='utf-8')
+    [loaded], max_parallel = RunConfigurationStore(str(path)).load()
+    assert (loaded.args, loaded.env, loaded.cpus) == ("", {}, [])
+    assert max_parallel == DEFAULT_MAX_PARALLEL
+
+
+@pytest.mark.parametrize("content", [None, "{not json"])
+def test_store_without_a_readable_file_is_empty(tmp_path, content):
+    path = tmp_path / "runs.json"
+    if content is not None:
+        path.write_text(content, encoding='utf-8')
+    assert RunConfigurationStore(str(path)).load() == ([], DEFAULT_MAX_PARALLEL)
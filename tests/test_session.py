@@ -0,0 +1,88 @@
+import json
+import threading
+
+import pytest
+
+from src.services.session import SESSION_VERSION, SessionStore, strip_secrets
+
+SESSION = {
+    'root': "/work/project",
+    'tabs': [{'path': "/work/project/main.py", 'cursor': 120, 'scroll': 4}],
+    'current': 0,
+    'context_files': ["/work/project/util.py"],
+}
+
+
+def test_round_trip(tmp_path):
+    store = SessionStore(str(tmp_path / "session.json"))
+    store.save(SESSION)
+    assert store.load() == dict(SESSION, version=SESSION_VERSION)
+    # Written through a temp file that is renamed over the session file
+    assert [path.name for path in tmp_path.iterdir()] == ["session.json"]
+
+
+def test_api_key_is_not_written(tmp_path):
+    settings = {'use_groq': True, 'groq_model': "model", 'groq_api_key': "gsk_secret_value"}
+    assert strip_secrets(settings) == {'use_groq': True, 'groq_model': "model"}
+    assert "groq_api_key" in settings
+
+    store = SessionStore(str(tmp_path / "session.json"))
+    store.save(dict(SESSION, model_settings=strip_secrets(settings)))
+    text = (tmp_path / "session.json").read_text(encoding='utf-8')
+    assert "gsk_secret_value" not in text and "groq_api_key" not in text
+    assert store.load()['model_settings'] == {'use_groq': True, 'groq_model': "model"}
+
+
+@pytest.mark.parametrize("content", [
+    "{\"tabs\": [",
+    "[1, 2, 3]",
+    json.dumps(dict(SESSION, version=SESSION_VERSION + 1)),
+    "",
+])
+def test_unreadable_session_is_empty(tmp_path, content):
+    path = tmp_path / "session.json"
+    path.write_text(content, encoding='utf-8')
+    assert SessionStore(str(path)).load() is None
+    assert SessionStore(str(tmp_path / "missing.json")).load() is None
+
+
+def test_async_saves_keep_the_latest(tmp_path):
+    store = SessionStore(str(tmp_path / "session.json"))
+    for index in range(50):
+        store.save_async(dict(SESSION, current=index))
+    writer = store.writer
+    if writer is not None:
+        writer.join()
+    assert store.load()['current'] == 49
+    assert store.writer is None
+
+
+def test_save_waits_for_a_running_async_write(tmp_path, monkeypatch):
+    store = SessionStore(str(tmp_path / "session.json"))
+    writing = threading.Event()
+    release = threading.Event()
+    write = store._write
+
+    def slow_write(data):
+        writing.set()
+        release.wait(5)
+        write(data)
+
+    monkeypatch.setattr(store, "_write", slow_write)
+    store.save_async(dict(SESSION, current=1))
+    assert writing.wait(5)
+    saver = threading.Thread(target=store.save, args=(dict(SESSION, current=2),))
+    saver.start()
+    release.set()
+    saver.join(5)
+    # The final synchronous save lands last, after the background write it waited for
+    assert store.load()['current'] == 2
+
+
+def test_unchanged_session_is_not_rewritten(tmp_path):
+    path = tmp_path / "session.json"
+    store = SessionStore(str(path))
+    store.save(SESSION)
+    path.write_text("edited elsewhere", encoding='utf-8')
+    store.save(SESSION)
+    assert path.read_text(encoding='utf-8') == "edited elsewhere"
@@ -0,0 +1,103 @@
+import os
+
+import pytest
+
+from src.services.telemetry import MetricsStore, RequestMetrics, _percentile, summarize
+
+
+def record(model="m", outcome='ok', **values):
+    entry = {'provider': "groq", 'model': model, 'outcome': outcome}
+    entry.update(values)
+    return entry
+
+
+def test_percentile_picks_the_nearest_rank():
+    values = [float(value) for value in range(1, 11)]
+    assert _percentile(values, 0) == 1.0
+    assert _percentile(values, 50) == 5.0
+    assert _percentile(values, 90) == 9.0
+    assert _percentile(values, 100) == 10.0
+    assert _percentile([3.0], 99) == 3.0
+    assert _percentile([], 50) is None
+
+
+def test_request_metrics_record():
+    metrics = RequestMetrics()
+    metrics.start("groq", "m")
+    metrics.prompt_chars = 400
+    metrics.client_ready = metrics.started + 0.01
+    metrics.stream_started = metrics.started + 0.02
+    metrics.chunk_received("")
+    metrics.chunk_received("x" * 40)
+    metrics.first_chunk = metrics.stream_started + 0.1
+    metrics.first_token = metrics.stream_started + 0.2
+    metrics.stream_finished = metrics.first_token + 2.0
+    metrics.finished = metrics.stream_finished + 0.01
+
+    entry = metrics.to_record()
+    assert entry['outcome'] == 'ok'
+    assert entry['connect_ms'] == pytest.approx(100.0)
+    assert entry['ttft_ms'] == pytest.approx(200.0)
+    # No usage data: tokens are estimated from characters
+    assert (entry['prompt_tokens'], entry['completion_tokens'], entry['tokens_estimated']) == (100, 10, True)
+    assert entry['tokens_per_second'] == 5.0
+
+    metrics.chunk_received("", {'input_tokens': 120, 'output_tokens': 30})
+    entry = metrics.to_record()
+    assert (entry['prompt_tokens'], entry['completion_tokens'], entry['tokens_estimated']) == (120, 30, False)
+
+
+def test_failed_request_is_an_error():
+    metrics = RequestMetrics()
+    metrics.start("ollama", "m")
+    entry = metrics.to_record()
+    assert entry['outcome'] == 'error'
+    assert entry['ttft_ms'] is None and entry['tokens_per_second'] is None
+
+
+def test_summary_per_model():
+    records = [record(ttft_ms=float(ms), total_ms=float(ms * 10), prompt_tokens=10, completion_tokens=ms)
+               for ms in range(1, 11)]
+    records += [record(outcome='error'), record(model="other", ttft_ms=5.0, prompt_tokens=1, completion_tokens=2)]
+
+    summary = summarize(records)
+    assert set(summary) == {"m (groq)", "other (groq)"}
+    entry = summary["m (groq)"]
+    assert (entry['requests'], entry['errors']) == (11, 1)
+    assert (entry['ttft_p50'], entry['ttft_p90'], entry['ttft_p99']) == (5.0, 9.0, 10.0)
+    assert (entry['total_p50'], entry['total_p90']) == (50.0, 90.0)
+    assert entry['prompt_tokens_avg'] == 10
+    assert entry['completion_tokens_avg'] == 5.5
+    assert entry['tokens_per_second_p50'] is None
+
+
+def test_summary_of_only_errors():
+    entry = summarize([record(outcome='error')])["m (groq)"]
+    assert (entry['requests'], entry['errors'], entry['ttft_p50'], entry['prompt_tokens_avg']) == (1, 1, None, None)
+
+
+def test_store_rotates_and_reads_back_oldest_first(tmp_path):
+    path = str(tmp_path / "metrics.jsonl")
+    store = MetricsStore(path, max_bytes=60, backups=2)
+    for index in range(8):
+        store.append({'index': index, 'padding': "x" * 10})
+
+    assert os.path.exists(path + ".1") and os.path.exists(path + ".2")
+    assert not os.path.exists(path + ".3")
+    for name in (path, path + ".1", path + ".2"):
+        assert os.path.getsize(name) <= 60
+    indices = [entry['index'] for entry in store.load()]
+    # The oldest records rotated out; the rest come back in order
+    assert indices == list(range(8 - len(indices), 8))
+    assert len(indices) < 8
+
+
+def test_store_skips_corrupt_lines(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    store = MetricsStore(str(path))
+    store.append({'index': 1})
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write("{truncated\n")
+    store.append({'index': 2})
+    assert [entry['index'] for entry in store.load()] == [1, 2]
+    assert MetricsStore(str(tmp_path / "missing.jsonl")).load() == []
@@ -0,0 +1,26 @@
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+
+from src.services.test_runner import shard_tests  # noqa: E402
+
+
+def test_shards_balance_recorded_durations():
+    durations = {"a": 8.0, "b": 5.0, "c": 4.0, "d": 3.0, "e": 1.0}
+    shards = shard_tests(list(durations), durations, 2)
+    loads = sorted(sum(durations[test] for test in shard) for shard in shards)
+    assert loads == [10.0, 11.0]
+    assert sorted(test for shard in shards for test in shard) == sorted(durations)
+
+
+def test_unknown_tests_count_as_the_median():
+    durations = {"a": 1.0, "b": 2.0, "c": 9.0}
+    shards = shard_tests(["a", "b", "c", "x", "y"], durations, 2)
+    assert sorted(len(shard) for shard in shards) == [1, 4]
+    assert ["c"] in shards
+
+
+def test_never_more_shards_than_tests():
+    assert shard_tests(["a", "b"], {}, 8) == [["a"], ["b"]]
+    assert shard_tests([], {}, 4) == []
+    assert shard_tests(["a", "b", "c"], {}, 0) == [["a", "b", "c"]]